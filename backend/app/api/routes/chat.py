@@ -115,6 +115,7 @@ async def process_chat_message(user_id: str, conversation_id: str, message: str)
     
     This runs in the background after the REST endpoint returns.
     """
+    agent_service = None
     try:
         from app.services.agent_service import AgentService
         
@@ -165,6 +166,9 @@ async def process_chat_message(user_id: str, conversation_id: str, message: str)
             "error": str(e),
             "completed_at": datetime.now().isoformat(),
         }
+    finally:
+        if agent_service is not None:
+            await agent_service.close()
 
 
 @router.get("/{conversation_id}", response_model=ConversationHistory)
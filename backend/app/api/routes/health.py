@@ -2,7 +2,7 @@
 Health check endpoints for container orchestration.
 """
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, Depends
 import httpx
 
@@ -10,6 +10,33 @@ from app.core.config import Settings, get_settings
 
 router = APIRouter()
 
+# Shared client for readiness probes: orchestrators poll every few seconds,
+# so the connection to Ollama is kept alive instead of reopened per probe
+_probe_client: Optional[httpx.AsyncClient] = None
+
+# Fail fast on an unreachable host but allow a busy server time to answer;
+# shared so every probe uses the same bounds
+_PROBE_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+
+
+def _get_probe_client() -> httpx.AsyncClient:
+    """Return the shared probe client, creating it on first use."""
+    global _probe_client
+    if _probe_client is None or _probe_client.is_closed:
+        _probe_client = httpx.AsyncClient(
+            timeout=_PROBE_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=2, keepalive_expiry=75),
+        )
+    return _probe_client
+
+
+async def close_probe_client() -> None:
+    """Close the shared probe client (called on application shutdown)."""
+    global _probe_client
+    if _probe_client is not None:
+        await _probe_client.aclose()
+        _probe_client = None
+
 
 @router.get("/health")
 async def health_check() -> Dict[str, Any]:
@@ -41,12 +68,8 @@ async def readiness_check(settings: Settings = Depends(get_settings)) -> Dict[st
     # Check LLM availability based on provider
     if settings.llm_provider == "ollama":
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(
-                    f"{settings.ollama_base_url}/api/tags",
-                    timeout=5.0
-                )
-                checks["ollama"] = resp.status_code == 200
+            resp = await _get_probe_client().get(f"{settings.ollama_base_url}/api/tags")
+            checks["ollama"] = resp.status_code == 200
         except Exception as e:
             checks["ollama"] = False
             checks["ollama_error"] = str(e)
@@ -75,6 +75,12 @@ MODEL_API_VERSIONS: Dict[str, str] = {
 # Default API version for unknown models (use GA with structured outputs support)
 DEFAULT_API_VERSION = "2024-10-21"
 
+# Longest prefix first, so e.g. "gpt-4.1-mini-2025" resolves to "gpt-4.1-mini"
+# rather than whichever shorter family happens to come first in the dict
+_MODEL_PREFIXES = tuple(
+    sorted(MODEL_API_VERSIONS.items(), key=lambda item: len(item[0]), reverse=True)
+)
+
 
 def get_recommended_api_version(model: Optional[str]) -> str:
     """
@@ -97,7 +103,7 @@ def get_recommended_api_version(model: Optional[str]) -> str:
         return MODEL_API_VERSIONS[model_lower]
     
     # Check for partial matches (e.g., "gpt-4o-2024-08-06" -> "gpt-4o")
-    for model_prefix, api_version in MODEL_API_VERSIONS.items():
+    for model_prefix, api_version in _MODEL_PREFIXES:
         if model_lower.startswith(model_prefix):
             return api_version
     
@@ -19,6 +19,8 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from starlette.websockets import WebSocketState
 
 from app.services.agent_service import AgentService
+# src/ is on sys.path once agent_service is imported
+import fast_json
 from app.core.auth import decode_access_token
 from app.core.database import get_session_factory
 from app.core.repositories import UserRepository
@@ -93,13 +95,30 @@ class ConnectionManager:
     
     async def send_event(self, client_id: str, event: dict) -> bool:
         """Send an event to a specific client. Returns False if failed."""
+        # orjson instead of send_json's stdlib json.dumps; final results and
+        # tool payloads can be tens of KB per event
+        text = self._serialize(event)
+        if text is None:
+            return False
+        return await self._send_text(client_id, text)
+    
+    @staticmethod
+    def _serialize(event: dict) -> Optional[str]:
+        """Encode an event as JSON, or None (logged) if it is not serialisable."""
+        try:
+            return fast_json.dumps(event)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Dropping unserialisable {event.get('type', 'unknown')} event: {e}")
+            return None
+    
+    async def _send_text(self, client_id: str, text: str) -> bool:
         websocket = self.active_connections.get(client_id)
         if not websocket:
             return False
         
         try:
             if websocket.client_state == WebSocketState.CONNECTED:
-                await websocket.send_json(event)
+                await websocket.send_text(text)
                 return True
         except Exception as e:
             logger.warning(f"Error sending to {client_id[:8]}...: {e}")
@@ -109,9 +128,13 @@ class ConnectionManager:
     async def broadcast(self, event: dict, exclude: Optional[Set[str]] = None) -> None:
         """Broadcast an event to all connected clients."""
         exclude = exclude or set()
+        # Serialised once, not per client
+        text = self._serialize(event)
+        if text is None:
+            return
         for client_id in list(self.active_connections.keys()):
             if client_id not in exclude:
-                await self.send_event(client_id, event)
+                await self._send_text(client_id, text)
     
     def register_task(self, client_id: str, task: asyncio.Task) -> None:
         """Register a running task for a client."""
@@ -379,6 +402,7 @@ async def websocket_endpoint(
         logger.exception(f"WebSocket error for {client_id[:8]}...: {e}")
     finally:
         conn_manager.cleanup_agent_service(client_id)
+        await agent_service.close()
         await conn_manager.disconnect(client_id)
 
 
@@ -57,6 +57,7 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    await health.close_probe_client()
     await close_db()
     print("👋 Shutting down AITradingAdvisory API")
 
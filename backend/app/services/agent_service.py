@@ -9,10 +9,13 @@ directly to tools without orchestrating the full multi-agent team.
 """
 import asyncio
 import sys
+from collections import deque
+from itertools import islice
 import json
 import re
 from datetime import datetime
-from typing import AsyncIterator, Optional, List, Dict, Any, Union
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Deque, Iterable, Optional, List, Dict, Any, Union
 from pathlib import Path
 import logging
 
@@ -22,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
 from autogen_agentchat.agents import AssistantAgent, CodeExecutorAgent
 from autogen_agentchat.teams import MagenticOneGroupChat
 from autogen_agentchat.base import TaskResult
+from autogen_core.tools import FunctionTool
 from autogen_agentchat.messages import (
     TextMessage,
     ThoughtEvent,
@@ -30,7 +34,6 @@ from autogen_agentchat.messages import (
     StopMessage,
     ToolCallSummaryMessage,
 )
-from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
 
 from app.core.config import get_settings
 from app.models.events import (
@@ -53,6 +56,9 @@ from intent_router import (
     StrategyType, STRATEGY_TYPE_MAP,
 )
 
+# Warm Python worker for the Executor agent
+from persistent_executor import PersistentLocalCodeExecutor
+
 # Import Phase 8: Market Phase Detection and Agent Teams
 try:
     from app.agents.market_phase_detector import (
@@ -70,6 +76,67 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Prefix of the orchestrator's closing message; never shown as the answer
+TERMINATE_SENTINEL = "TERMINATE"
+
+# Message types whose content can be the final answer
+ANSWER_MESSAGE_TYPES = (TextMessage, StopMessage)
+
+# The final answer is always at the tail of TaskResult.messages; only this
+# many trailing messages are inspected
+FINAL_ANSWER_SCAN_DEPTH = 8
+
+# Conversation entries kept per service (10 user/assistant exchanges) and
+# how many of the latest ones are prepended to a new query
+HISTORY_MAX_ENTRIES = 20
+HISTORY_PROMPT_ENTRIES = 8
+
+# Azure OpenAI API version per model family (see _get_recommended_api_version)
+MODEL_API_VERSION_MAP = {
+    "gpt-4o": "2024-08-01-preview",
+    "gpt-4o-mini": "2024-08-01-preview",
+    "gpt-4": "2024-02-15-preview",
+    "gpt-4-turbo": "2024-02-15-preview",
+    "gpt-35-turbo": "2024-02-15-preview",
+    "gpt-3.5-turbo": "2024-02-15-preview",
+    "o1": "2024-12-01-preview",
+    "o1-preview": "2024-12-01-preview",
+    "o1-mini": "2024-12-01-preview",
+    "o3-mini": "2024-12-01-preview",
+}
+DEFAULT_API_VERSION = "2024-08-01-preview"  # Safe default for most modern models
+
+# Capabilities declared for Azure deployments (shared, never mutated)
+AZURE_MODEL_INFO = {
+    "vision": True,
+    "function_calling": True,
+    "json_output": True,
+    "structured_output": True,
+    "family": "gpt-4",
+}
+
+# Longest prefix first, so dated deployments match their most specific family
+_MODEL_API_VERSION_PREFIXES = tuple(
+    sorted(MODEL_API_VERSION_MAP.items(), key=lambda item: len(item[0]), reverse=True)
+)
+
+
+@lru_cache(maxsize=None)
+def _function_tool(func: Callable) -> FunctionTool:
+    """
+    Wrap a tool function the way AssistantAgent would, once per process.
+    
+    Building a FunctionTool inspects the signature and generates a pydantic
+    schema; teams are created per request and share most tools between
+    agents, so the wrappers are cached by function identity.
+    """
+    return FunctionTool(func, description=func.__doc__ or "")
+
+
+def _function_tools(funcs: Iterable[Callable]) -> List[FunctionTool]:
+    """Cached FunctionTool wrappers for a list of tool functions."""
+    return [_function_tool(func) for func in funcs]
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SHARED AGENT GUIDELINES - Applied to ALL agents for maximum trading success
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -109,10 +176,266 @@ RICHTIG ✅: Sofort get_ohlcv_data("XRPUSDT", "1H", 200) aufrufen!
 6. ChartingAgent für Visualisierung
 ```
 
+⚡ **PARALLELE TOOL-AUFRUFE:**
+Unabhängige Abfragen IMMER gemeinsam in EINER Antwort aufrufen - sie laufen gleichzeitig:
+- Mehrere Symbole: get_realtime_price("BTCUSDT") + get_realtime_price("ETHUSDT") zusammen
+- Mehrere Zeitrahmen: get_ohlcv_data(..., "1H") + get_ohlcv_data(..., "4H") zusammen
+- Preis + Orderbuch + Kerzen desselben Symbols zusammen
+Nur nacheinander aufrufen, wenn ein Aufruf das Ergebnis eines anderen braucht.
+
 DU BIST AUTONOM! KEINE AUSREDEN! HOLE DIE DATEN SELBST!
 ═══════════════════════════════════════════════════════════════════════════════
 """
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# AGENT SYSTEM PROMPTS - Fixed text, built once at import
+# ═══════════════════════════════════════════════════════════════════════════════
+
+MARKET_ANALYST_PROMPT = """You are a cryptocurrency market analyst with DIRECT ACCESS to live market data.
+
+═══════════════════════════════════════════════════════════════════════════════
+🚨 CRITICAL: DU HAST DIREKTEN ZUGRIFF AUF LIVE-DATEN! 🚨
+═══════════════════════════════════════════════════════════════════════════════
+
+DU HAST DIESE TOOLS - BENUTZE SIE SOFORT:
+• get_realtime_price("XRPUSDT") → Aktueller Preis von Bitget
+• get_ohlcv_data("XRPUSDT", "1H", 200) → 200 Stunden-Kerzen
+• get_ohlcv_data("XRPUSDT", "5m", 100) → 100 5-Minuten-Kerzen
+• get_orderbook_depth("XRPUSDT") → Orderbuch
+• get_futures_data("XRPUSDT") → Funding Rate, Open Interest
+
+⛔ ABSOLUT VERBOTEN:
+- "Ich kann keine Daten holen" → FALSCH! Du HAST die Tools!
+- "Ich brauche Daten von dir" → FALSCH! Hole sie SELBST mit get_ohlcv_data!
+- "Welche Börse benutzt du?" → IRRELEVANT! Du hast Bitget-Zugang!
+- Den Benutzer nach Daten fragen → NIEMALS! Du holst sie selbst!
+
+✅ KORREKTES VERHALTEN bei jeder Anfrage:
+1. SOFORT get_realtime_price() und get_ohlcv_data() aufrufen
+2. Mit den ECHTEN Daten analysieren
+3. Entry/SL/TP aus den echten Kerzen berechnen
+4. Chart anfordern
+
+BEISPIEL - Benutzer fragt "Analyse XRP für Long":
+→ FALSCH: "Ich brauche erst Daten von dir..."
+→ RICHTIG: Sofort get_ohlcv_data("XRPUSDT", "1H", 200) aufrufen und analysieren!
+
+DU BIST AUTONOM! DU HOLST DIE DATEN SELBST! KEINE AUSREDEN!
+═══════════════════════════════════════════════════════════════════════════════
+
+Symbol-Format für Tools: 'BTCUSDT', 'ETHUSDT', 'XRPUSDT', 'SOLUSDT'
+Timeframes: '1m', '5m', '15m', '1H', '4H', '1D'
+
+Bei JEDER Analyse-Anfrage:
+1. get_realtime_price(symbol) für aktuellen Preis
+2. get_ohlcv_data(symbol, "1H", 200) für Stunden-Daten
+3. get_ohlcv_data(symbol, "5m", 100) für kurzfristige Daten (wenn LTF gewünscht)
+4. Dann analysieren und ChartingAgent für Visualisierung aufrufen
+"""
+
+TECHNICAL_ANALYST_PROMPT = """You are a cryptocurrency technical analyst with DIRECT ACCESS to live market data.
+
+═══════════════════════════════════════════════════════════════════════════════
+🚨 CRITICAL: DU HAST DIREKTEN ZUGRIFF AUF LIVE-DATEN! 🚨
+═══════════════════════════════════════════════════════════════════════════════
+
+DU HAST DIESE TOOLS - BENUTZE SIE SOFORT:
+• get_ohlcv_data("XRPUSDT", "1H", 200) → 200 Stunden-Kerzen für Analyse
+• get_ohlcv_data("XRPUSDT", "5m", 100) → 100 5-Min-Kerzen für LTF
+• get_ohlcv_data("XRPUSDT", "4H", 100) → 100 4H-Kerzen für HTF
+• get_realtime_price("XRPUSDT") → Aktueller Preis
+• get_futures_data("XRPUSDT") → Funding Rate, Open Interest
+
+⛔ ABSOLUT VERBOTEN:
+- "Ich brauche Daten von dir" → FALSCH! Hole sie SELBST!
+- "Welche Börse benutzt du?" → IRRELEVANT! Du hast Bitget!
+- "Bitte schicke mir die Daten" → NIEMALS! Du holst sie selbst!
+- Auf Daten vom Benutzer warten → NIEMALS!
+
+✅ KORREKTES VERHALTEN:
+Bei JEDER Anfrage SOFORT diese Schritte ausführen:
+1. get_ohlcv_data("SYMBOL", "1H", 200) aufrufen
+2. RSI, MACD, Bollinger aus den echten Daten berechnen
+3. S/R Levels aus echten Highs/Lows identifizieren
+4. Entry/SL/TP aus echten Daten bestimmen
+5. ChartingAgent für Visualisierung aufrufen
+
+Symbol-Format: 'BTCUSDT', 'ETHUSDT', 'XRPUSDT', 'SOLUSDT'
+═══════════════════════════════════════════════════════════════════════════════
+
+Technical Analysis Guidelines:
+- RSI < 30 = Oversold (potential buy)
+- RSI > 70 = Overbought (potential sell)
+- MACD crossover = Trend change signal
+
+Entry Point Format für ChartingAgent:
+{"type": "long", "price": X, "stop_loss": Y, "take_profit": [Z1, Z2], "reason": "...", "confidence": "high/medium/low"}
+
+NACH der Analyse IMMER ChartingAgent aufrufen mit:
+- indicators: 'rsi,macd,sma,ema,bollinger'
+- support_levels: [aus echten Daten berechnete Levels]
+- resistance_levels: [aus echten Daten berechnete Levels]
+- entry_points: [berechnete Entry-Punkte]
+"""
+
+CHARTING_AGENT_PROMPT = """You are a professional charting specialist with DIRECT ACCESS to live market data.
+
+═══════════════════════════════════════════════════════════════════════════════
+🚨 DU HAST DIREKTEN ZUGRIFF AUF LIVE-DATEN! 🚨
+═══════════════════════════════════════════════════════════════════════════════
+
+DU HAST DIESE TOOLS:
+• get_ohlcv_data("XRPUSDT", "1H", 200) → Echte Kerzen für Charts
+• generate_strategy_visualization(...) → ⭐ HAUPT-TOOL für finale Strategie-Charts
+• generate_entry_analysis_chart(...) → Chart mit Entry/SL/TP erstellen
+• generate_tradingview_chart(...) → Standard TradingView Chart
+• generate_multi_timeframe_dashboard(...) → Multi-TF Dashboard
+
+═══════════════════════════════════════════════════════════════════════════════
+⭐ WICHTIG: AM ENDE JEDER ANALYSE - STRATEGIE-CHART ERSTELLEN! ⭐
+═══════════════════════════════════════════════════════════════════════════════
+
+Nach jeder vollständigen Analyse MUSST du generate_strategy_visualization() aufrufen!
+Dieses Tool erstellt ein professionelles Chart mit ALLEN Erkenntnissen:
+
+generate_strategy_visualization(
+    symbol="XRPUSDT",
+    strategy_summary='{"name": "RSI+MACD Confluence", "bias": "bullish", "confidence": "high", "timeframe": "1H", "description": "...", "key_observations": ["obs1", "obs2"], "risk_management": "..."}',
+    entry_setups='[{"type": "long", "trigger_price": 2.45, "stop_loss": 2.35, "take_profit": [2.60, 2.75], "position_size": "2%", "trigger_condition": "Breakout über 2.45", "invalidation": "Close unter 2.35", "confidence": "high"}]',
+    technical_levels='{"support": [2.35, 2.20], "resistance": [2.55, 2.70]}',
+    indicators_used="rsi,macd,volume,sma",
+    indicator_signals='{"rsi": {"value": 55, "signal": "neutral"}, "macd": {"signal": "bullish"}}',
+    market_context='{"market_sentiment": "neutral", "volatility": "medium"}',
+    interval="1H"
+)
+
+⛔ VERBOTEN:
+- Analyse abschließen OHNE generate_strategy_visualization() aufzurufen
+- Charts ohne echte Daten erstellen
+- Auf Daten vom Benutzer warten
+
+✅ WORKFLOW bei JEDER Analyse:
+1. get_ohlcv_data() aufrufen für echte Kerzen
+2. Andere Agents analysieren (Market, Technical)
+3. ⭐ AM ENDE: generate_strategy_visualization() mit ALLEN Ergebnissen aufrufen!
+═══════════════════════════════════════════════════════════════════════════════
+
+Symbol-Format: 'BTCUSDT', 'ETHUSDT', 'XRPUSDT'
+Intervals: '1m', '5m', '15m', '1H', '4H', '1D'
+"""
+
+CODER_PROMPT = """You are a Python developer for crypto analysis and custom indicators.
+
+═══════════════════════════════════════════════════════════════════════════════
+⛔ CRITICAL RULES - NO SYNTHETIC DATA IN CODE!
+═══════════════════════════════════════════════════════════════════════════════
+
+🚫 **ABSOLUTELY FORBIDDEN:**
+- Using placeholder or mock data
+- Hardcoding values instead of calculating from real data
+- Inventing backtest results
+- Claiming performance without actual testing on real data
+- Creating "example" outputs with fake numbers
+
+✅ **MANDATORY WORKFLOW:**
+1. FIRST: Fetch real data using exchange_tools (get_ohlcv_data, etc.)
+2. THEN: Calculate indicators from the real data
+3. VALIDATE: Check data quality before processing
+4. DOCUMENT: Every calculation must show its data source
+
+📋 **CODE DOCUMENTATION FORMAT:**
+```python
+# STEP 1: Fetch real data
+ohlcv = get_ohlcv_data("BTCUSDT", "1H", 200)
+# VALIDATION: Received 200 candles from Bitget
+
+# STEP 2: Calculate from real data
+rsi = calculate_rsi(df['close'], period=14)
+# RESULT: RSI current = X.X (calculated from real closes)
+```
+═══════════════════════════════════════════════════════════════════════════════
+
+Your role:
+1. Write Python scripts for advanced analysis using REAL DATA
+2. Implement custom indicators designed by TechnicalAnalyst
+3. Backtest and evaluate indicator performance on REAL HISTORICAL DATA
+4. Save indicators to the registry for reuse
+
+Always check for existing indicators before creating new ones.
+Save working indicators so they can be reused in future sessions."""
+
+REPORT_WRITER_PROMPT = """You are a professional cryptocurrency report writer.
+
+═══════════════════════════════════════════════════════════════════════════════
+⛔ CRITICAL RULES - REPORTS MUST ONLY CONTAIN REAL DATA!
+═══════════════════════════════════════════════════════════════════════════════
+
+🚫 **ABSOLUTELY FORBIDDEN:**
+- Including data you didn't receive from other agents' tool calls
+- Adding hypothetical scenarios or speculation
+- Inventing statistics or performance metrics
+- Writing predictions without data backing
+- Adding recommendations without real data support
+
+✅ **MANDATORY BEHAVIOR:**
+- ONLY include facts provided by other agents FROM THEIR TOOL CALLS
+- Every number must have a documented source (Bitget, CoinGecko, timestamp)
+- Clearly separate FACTS (from data) from INTERPRETATION
+- Add "Data Source: [Agent, Tool, Timestamp]" to each section
+
+═══════════════════════════════════════════════════════════════════════════════
+⭐ WICHTIG: Nach deinem Report muss ChartingAgent das finale Chart erstellen!
+═══════════════════════════════════════════════════════════════════════════════
+
+Beende deinen Report mit einem klaren Aufruf an ChartingAgent:
+
+"@ChartingAgent: Bitte erstelle das finale Strategie-Chart mit generate_strategy_visualization():
+- Symbol: [SYMBOL]
+- Bias: [bullish/bearish/neutral]
+- Entry: [Preis] mit SL: [Preis] und TP: [Preise]
+- Support: [Levels]
+- Resistance: [Levels]
+- Indikatoren: [Liste]"
+
+📋 **REPORT STRUCTURE:**
+```markdown
+# [Symbol] Analysis Report
+**Generated:** [Date/Time]
+**Data Sources:** [Bitget/CoinGecko, Timestamps]
+
+## Data Retrieved
+| Metric | Value | Source | Timestamp |
+|--------|-------|--------|-----------|
+| Price  | $X.XX | Bitget | 12:34:56  |
+
+## Analysis (Based on Real Data Only)
+[Only include what was actually calculated from fetched data]
+
+## Handlungsempfehlung
+[Klare Entry/SL/TP mit Begründung]
+
+---
+@ChartingAgent: Erstelle finales Chart...
+```
+═══════════════════════════════════════════════════════════════════════════════
+
+Report types:
+- Analysis Reports: Full analysis of a single cryptocurrency
+- Comparison Reports: Side-by-side comparison of multiple coins
+- Custom Indicator Reports: Document new indicator designs
+
+Use proper Markdown formatting with headers, bold text, tables, and bullet points."""
+
+# Every prompt starts with the same shared rules so the long common prefix
+# is served from Azure OpenAI's prompt cache across agents and turns
+SYSTEM_PROMPTS = {
+    "CryptoMarketAnalyst": SHARED_AGENT_RULES + MARKET_ANALYST_PROMPT,
+    "TechnicalAnalyst": SHARED_AGENT_RULES + TECHNICAL_ANALYST_PROMPT,
+    "ChartingAgent": SHARED_AGENT_RULES + CHARTING_AGENT_PROMPT,
+    "CryptoAnalysisCoder": SHARED_AGENT_RULES + CODER_PROMPT,
+    "ReportWriter": SHARED_AGENT_RULES + REPORT_WRITER_PROMPT,
+}
+
 # Agent emojis for UI display
 AGENT_EMOJIS = {
     'CryptoMarketAnalyst': '📊',
@@ -310,7 +633,7 @@ class AgentService:
         self.settings = get_settings()
         self.user_id = user_id  # User ID for user-scoped secrets
         self._model_client = None  # Lazy initialization
-        self.conversation_history: List[Dict[str, str]] = []
+        self.conversation_history: Deque[Dict[str, str]] = deque(maxlen=HISTORY_MAX_ENTRIES)
         self._cancelled = False
         self._cancel_event = asyncio.Event()
         
@@ -318,6 +641,11 @@ class AgentService:
         self._intent_router = IntentRouter()
         self._tools: Dict[str, Any] = {}  # Lazy initialization
         self._tools_initialized = False
+        self._code_executor: Optional[PersistentLocalCodeExecutor] = None  # Created with the first team
+        # Full team reused across requests of this service, reset per run;
+        # rebuilt when the TechnicalAnalyst feedback context changes
+        self._team: Optional[MagenticOneGroupChat] = None
+        self._team_feedback: Optional[str] = None
         
         # Current strategy type for feedback context
         self._current_strategy: Optional[StrategyType] = None
@@ -340,31 +668,18 @@ class AgentService:
         - o1 and o3 reasoning models require 2024-12-01-preview
         - Older models work with 2024-02-15-preview
         """
-        MODEL_API_VERSION_MAP = {
-            "gpt-4o": "2024-08-01-preview",
-            "gpt-4o-mini": "2024-08-01-preview",
-            "gpt-4": "2024-02-15-preview",
-            "gpt-4-turbo": "2024-02-15-preview",
-            "gpt-35-turbo": "2024-02-15-preview",
-            "gpt-3.5-turbo": "2024-02-15-preview",
-            "o1": "2024-12-01-preview",
-            "o1-preview": "2024-12-01-preview",
-            "o1-mini": "2024-12-01-preview",
-            "o3-mini": "2024-12-01-preview",
-        }
-        DEFAULT_API_VERSION = "2024-08-01-preview"  # Safe default for most modern models
-        
         if not model:
             return DEFAULT_API_VERSION
             
         model_lower = model.lower()
         
         # Check for exact match first
-        if model_lower in MODEL_API_VERSION_MAP:
-            return MODEL_API_VERSION_MAP[model_lower]
+        version = MODEL_API_VERSION_MAP.get(model_lower)
+        if version is not None:
+            return version
         
         # Check for partial match (e.g., "gpt-4o-2024-08-06" matches "gpt-4o")
-        for key, version in MODEL_API_VERSION_MAP.items():
+        for key, version in _MODEL_API_VERSION_PREFIXES:
             if model_lower.startswith(key):
                 return version
         
@@ -436,6 +751,7 @@ class AgentService:
     def reset_model_client(self) -> None:
         """Reset the model client to reload with new credentials."""
         self._model_client = None
+        self._team = None  # Its agents hold the old client
         logger.info("Model client reset - will reload on next request")
     
     @property
@@ -713,14 +1029,6 @@ class AgentService:
         if self.settings.llm_provider == "azure":
             from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
             
-            model_info = {
-                "vision": True,
-                "function_calling": True,
-                "json_output": True,
-                "structured_output": True,
-                "family": "gpt-4",
-            }
-            
             logger.info(f"Creating Azure OpenAI client with endpoint: {credentials['endpoint'][:30]}...")
             
             return AzureOpenAIChatCompletionClient(
@@ -729,7 +1037,7 @@ class AgentService:
                 azure_endpoint=credentials["endpoint"],
                 api_key=credentials["api_key"],
                 model=credentials["deployment"],
-                model_info=model_info,
+                model_info=AZURE_MODEL_INFO,
             )
         else:
             # Ollama fallback - for now, log a warning and use Azure if available
@@ -779,8 +1087,8 @@ class AgentService:
                 user_id=self.user_id,
             )
             
-            # Get tools from team
-            tools = team_instance.get_tools()
+            # Get tools from team (wrapped once, shared by all its agents)
+            tools = _function_tools(team_instance.get_tools())
             
             # Get agent prompts from team
             agent_prompts = team_instance.get_agent_prompts()
@@ -795,7 +1103,7 @@ class AgentService:
                     name=agent_name,
                     model_client=self.model_client,
                     tools=tools,
-                    system_message=full_prompt + SHARED_AGENT_RULES,
+                    system_message=SHARED_AGENT_RULES + full_prompt,
                     description=f"{agent_name} - {team_instance.config.focus_area}",
                 )
                 agents.append(agent)
@@ -815,6 +1123,28 @@ class AgentService:
             logger.warning(f"Failed to create specialized team: {e}, falling back to full team")
             return None
 
+    async def _get_team(self, feedback_context: str = "") -> MagenticOneGroupChat:
+        """
+        Return the full team, building it only on first use or when the
+        feedback context differs from the one its prompts were built with.
+        
+        A reused team is reset so each run starts from a clean conversation,
+        and a code worker that ran blocks is replaced so no interpreter state
+        carries over from the previous request.
+        """
+        if self._code_executor is not None:
+            await self._code_executor.restart()
+        if self._team is not None and feedback_context == self._team_feedback:
+            try:
+                await self._team.reset()
+                return self._team
+            except RuntimeError:
+                # Still marked as running (an abandoned stream); build anew
+                logger.info("Cached team busy, creating a new one")
+        self._team = await self._create_team(feedback_context=feedback_context)
+        self._team_feedback = feedback_context
+        return self._team
+    
     async def _create_team(self, feedback_context: str = "") -> MagenticOneGroupChat:
         """
         Create the AITradingAdvisory team with all specialized crypto agents.
@@ -850,6 +1180,7 @@ class AgentService:
         )
         from smart_alerts import (
             generate_smart_alerts_dashboard, create_trade_idea_alert,
+            create_trade_idea_alerts_batch,
         )
         
         # Define tool sets
@@ -874,282 +1205,60 @@ class AgentService:
             generate_entry_analysis_chart,  # Entry points with SL/TP visualization
             generate_strategy_visualization,  # FINAL strategy chart with all findings
             generate_smart_alerts_dashboard, create_trade_idea_alert,
+            create_trade_idea_alerts_batch,
         ]
         
         all_crypto_tools = coingecko_tools + exchange_tools_list
         
-        # Create agents with system messages (abbreviated for clarity)
+        # Create agents (system prompts are module-level constants)
         market_analyst = AssistantAgent(
             "CryptoMarketAnalyst",
             model_client=self.model_client,
-            tools=all_crypto_tools,
-            system_message="""You are a cryptocurrency market analyst with DIRECT ACCESS to live market data.
-
-═══════════════════════════════════════════════════════════════════════════════
-🚨 CRITICAL: DU HAST DIREKTEN ZUGRIFF AUF LIVE-DATEN! 🚨
-═══════════════════════════════════════════════════════════════════════════════
-
-DU HAST DIESE TOOLS - BENUTZE SIE SOFORT:
-• get_realtime_price("XRPUSDT") → Aktueller Preis von Bitget
-• get_ohlcv_data("XRPUSDT", "1H", 200) → 200 Stunden-Kerzen
-• get_ohlcv_data("XRPUSDT", "5m", 100) → 100 5-Minuten-Kerzen
-• get_orderbook_depth("XRPUSDT") → Orderbuch
-• get_futures_data("XRPUSDT") → Funding Rate, Open Interest
-
-⛔ ABSOLUT VERBOTEN:
-- "Ich kann keine Daten holen" → FALSCH! Du HAST die Tools!
-- "Ich brauche Daten von dir" → FALSCH! Hole sie SELBST mit get_ohlcv_data!
-- "Welche Börse benutzt du?" → IRRELEVANT! Du hast Bitget-Zugang!
-- Den Benutzer nach Daten fragen → NIEMALS! Du holst sie selbst!
-
-✅ KORREKTES VERHALTEN bei jeder Anfrage:
-1. SOFORT get_realtime_price() und get_ohlcv_data() aufrufen
-2. Mit den ECHTEN Daten analysieren
-3. Entry/SL/TP aus den echten Kerzen berechnen
-4. Chart anfordern
-
-BEISPIEL - Benutzer fragt "Analyse XRP für Long":
-→ FALSCH: "Ich brauche erst Daten von dir..."
-→ RICHTIG: Sofort get_ohlcv_data("XRPUSDT", "1H", 200) aufrufen und analysieren!
-
-DU BIST AUTONOM! DU HOLST DIE DATEN SELBST! KEINE AUSREDEN!
-═══════════════════════════════════════════════════════════════════════════════
-
-Symbol-Format für Tools: 'BTCUSDT', 'ETHUSDT', 'XRPUSDT', 'SOLUSDT'
-Timeframes: '1m', '5m', '15m', '1H', '4H', '1D'
-
-Bei JEDER Analyse-Anfrage:
-1. get_realtime_price(symbol) für aktuellen Preis
-2. get_ohlcv_data(symbol, "1H", 200) für Stunden-Daten
-3. get_ohlcv_data(symbol, "5m", 100) für kurzfristige Daten (wenn LTF gewünscht)
-4. Dann analysieren und ChartingAgent für Visualisierung aufrufen
-""" + SHARED_AGENT_RULES,
+            tools=_function_tools(all_crypto_tools),
+            system_message=SYSTEM_PROMPTS["CryptoMarketAnalyst"],
             description="Expert in crypto markets with DIRECT ACCESS to live Bitget data",
         )
         
         technical_analyst = AssistantAgent(
             "TechnicalAnalyst",
             model_client=self.model_client,
-            tools=all_crypto_tools + indicator_tools_list,
-            system_message="""You are a cryptocurrency technical analyst with DIRECT ACCESS to live market data.
-
-═══════════════════════════════════════════════════════════════════════════════
-🚨 CRITICAL: DU HAST DIREKTEN ZUGRIFF AUF LIVE-DATEN! 🚨
-═══════════════════════════════════════════════════════════════════════════════
-
-DU HAST DIESE TOOLS - BENUTZE SIE SOFORT:
-• get_ohlcv_data("XRPUSDT", "1H", 200) → 200 Stunden-Kerzen für Analyse
-• get_ohlcv_data("XRPUSDT", "5m", 100) → 100 5-Min-Kerzen für LTF
-• get_ohlcv_data("XRPUSDT", "4H", 100) → 100 4H-Kerzen für HTF
-• get_realtime_price("XRPUSDT") → Aktueller Preis
-• get_futures_data("XRPUSDT") → Funding Rate, Open Interest
-
-⛔ ABSOLUT VERBOTEN:
-- "Ich brauche Daten von dir" → FALSCH! Hole sie SELBST!
-- "Welche Börse benutzt du?" → IRRELEVANT! Du hast Bitget!
-- "Bitte schicke mir die Daten" → NIEMALS! Du holst sie selbst!
-- Auf Daten vom Benutzer warten → NIEMALS!
-
-✅ KORREKTES VERHALTEN:
-Bei JEDER Anfrage SOFORT diese Schritte ausführen:
-1. get_ohlcv_data("SYMBOL", "1H", 200) aufrufen
-2. RSI, MACD, Bollinger aus den echten Daten berechnen
-3. S/R Levels aus echten Highs/Lows identifizieren
-4. Entry/SL/TP aus echten Daten bestimmen
-5. ChartingAgent für Visualisierung aufrufen
-
-Symbol-Format: 'BTCUSDT', 'ETHUSDT', 'XRPUSDT', 'SOLUSDT'
-═══════════════════════════════════════════════════════════════════════════════
-
-Technical Analysis Guidelines:
-- RSI < 30 = Oversold (potential buy)
-- RSI > 70 = Overbought (potential sell)
-- MACD crossover = Trend change signal
-
-Entry Point Format für ChartingAgent:
-{"type": "long", "price": X, "stop_loss": Y, "take_profit": [Z1, Z2], "reason": "...", "confidence": "high/medium/low"}
-
-NACH der Analyse IMMER ChartingAgent aufrufen mit:
-- indicators: 'rsi,macd,sma,ema,bollinger'
-- support_levels: [aus echten Daten berechnete Levels]
-- resistance_levels: [aus echten Daten berechnete Levels]
-- entry_points: [berechnete Entry-Punkte]
-""" + SHARED_AGENT_RULES + (f"\n{feedback_context}" if feedback_context else ""),
+            tools=_function_tools(all_crypto_tools + indicator_tools_list),
+            system_message=SYSTEM_PROMPTS["TechnicalAnalyst"] + (f"\n{feedback_context}" if feedback_context else ""),
             description="Expert in technical analysis with DIRECT ACCESS to live Bitget data",
         )
         
         charting_agent = AssistantAgent(
             "ChartingAgent",
             model_client=self.model_client,
-            tools=tradingview_tools_list + exchange_tools_list,
-            system_message="""You are a professional charting specialist with DIRECT ACCESS to live market data.
-
-═══════════════════════════════════════════════════════════════════════════════
-🚨 DU HAST DIREKTEN ZUGRIFF AUF LIVE-DATEN! 🚨
-═══════════════════════════════════════════════════════════════════════════════
-
-DU HAST DIESE TOOLS:
-• get_ohlcv_data("XRPUSDT", "1H", 200) → Echte Kerzen für Charts
-• generate_strategy_visualization(...) → ⭐ HAUPT-TOOL für finale Strategie-Charts
-• generate_entry_analysis_chart(...) → Chart mit Entry/SL/TP erstellen
-• generate_tradingview_chart(...) → Standard TradingView Chart
-• generate_multi_timeframe_dashboard(...) → Multi-TF Dashboard
-
-═══════════════════════════════════════════════════════════════════════════════
-⭐ WICHTIG: AM ENDE JEDER ANALYSE - STRATEGIE-CHART ERSTELLEN! ⭐
-═══════════════════════════════════════════════════════════════════════════════
-
-Nach jeder vollständigen Analyse MUSST du generate_strategy_visualization() aufrufen!
-Dieses Tool erstellt ein professionelles Chart mit ALLEN Erkenntnissen:
-
-generate_strategy_visualization(
-    symbol="XRPUSDT",
-    strategy_summary='{"name": "RSI+MACD Confluence", "bias": "bullish", "confidence": "high", "timeframe": "1H", "description": "...", "key_observations": ["obs1", "obs2"], "risk_management": "..."}',
-    entry_setups='[{"type": "long", "trigger_price": 2.45, "stop_loss": 2.35, "take_profit": [2.60, 2.75], "position_size": "2%", "trigger_condition": "Breakout über 2.45", "invalidation": "Close unter 2.35", "confidence": "high"}]',
-    technical_levels='{"support": [2.35, 2.20], "resistance": [2.55, 2.70]}',
-    indicators_used="rsi,macd,volume,sma",
-    indicator_signals='{"rsi": {"value": 55, "signal": "neutral"}, "macd": {"signal": "bullish"}}',
-    market_context='{"market_sentiment": "neutral", "volatility": "medium"}',
-    interval="1H"
-)
-
-⛔ VERBOTEN:
-- Analyse abschließen OHNE generate_strategy_visualization() aufzurufen
-- Charts ohne echte Daten erstellen
-- Auf Daten vom Benutzer warten
-
-✅ WORKFLOW bei JEDER Analyse:
-1. get_ohlcv_data() aufrufen für echte Kerzen
-2. Andere Agents analysieren (Market, Technical)
-3. ⭐ AM ENDE: generate_strategy_visualization() mit ALLEN Ergebnissen aufrufen!
-═══════════════════════════════════════════════════════════════════════════════
-
-Symbol-Format: 'BTCUSDT', 'ETHUSDT', 'XRPUSDT'
-Intervals: '1m', '5m', '15m', '1H', '4H', '1D'
-""" + SHARED_AGENT_RULES,
+            tools=_function_tools(tradingview_tools_list + exchange_tools_list),
+            system_message=SYSTEM_PROMPTS["ChartingAgent"],
             description="TradingView charting specialist - MUST create final strategy chart",
         )
         
         coder = AssistantAgent(
             "CryptoAnalysisCoder",
             model_client=self.model_client,
-            tools=indicator_tools_list,
-            system_message="""You are a Python developer for crypto analysis and custom indicators.
-
-═══════════════════════════════════════════════════════════════════════════════
-⛔ CRITICAL RULES - NO SYNTHETIC DATA IN CODE!
-═══════════════════════════════════════════════════════════════════════════════
-
-🚫 **ABSOLUTELY FORBIDDEN:**
-- Using placeholder or mock data
-- Hardcoding values instead of calculating from real data
-- Inventing backtest results
-- Claiming performance without actual testing on real data
-- Creating "example" outputs with fake numbers
-
-✅ **MANDATORY WORKFLOW:**
-1. FIRST: Fetch real data using exchange_tools (get_ohlcv_data, etc.)
-2. THEN: Calculate indicators from the real data
-3. VALIDATE: Check data quality before processing
-4. DOCUMENT: Every calculation must show its data source
-
-📋 **CODE DOCUMENTATION FORMAT:**
-```python
-# STEP 1: Fetch real data
-ohlcv = get_ohlcv_data("BTCUSDT", "1H", 200)
-# VALIDATION: Received 200 candles from Bitget
-
-# STEP 2: Calculate from real data
-rsi = calculate_rsi(df['close'], period=14)
-# RESULT: RSI current = X.X (calculated from real closes)
-```
-═══════════════════════════════════════════════════════════════════════════════
-
-Your role:
-1. Write Python scripts for advanced analysis using REAL DATA
-2. Implement custom indicators designed by TechnicalAnalyst
-3. Backtest and evaluate indicator performance on REAL HISTORICAL DATA
-4. Save indicators to the registry for reuse
-
-Always check for existing indicators before creating new ones.
-Save working indicators so they can be reused in future sessions.""" + SHARED_AGENT_RULES,
+            tools=_function_tools(indicator_tools_list),
+            system_message=SYSTEM_PROMPTS["CryptoAnalysisCoder"],
             description="Python developer for analysis and custom indicators",
         )
         
         report_writer = AssistantAgent(
             "ReportWriter",
             model_client=self.model_client,
-            tools=report_tools_list,
-            system_message="""You are a professional cryptocurrency report writer.
-
-═══════════════════════════════════════════════════════════════════════════════
-⛔ CRITICAL RULES - REPORTS MUST ONLY CONTAIN REAL DATA!
-═══════════════════════════════════════════════════════════════════════════════
-
-🚫 **ABSOLUTELY FORBIDDEN:**
-- Including data you didn't receive from other agents' tool calls
-- Adding hypothetical scenarios or speculation
-- Inventing statistics or performance metrics
-- Writing predictions without data backing
-- Adding recommendations without real data support
-
-✅ **MANDATORY BEHAVIOR:**
-- ONLY include facts provided by other agents FROM THEIR TOOL CALLS
-- Every number must have a documented source (Bitget, CoinGecko, timestamp)
-- Clearly separate FACTS (from data) from INTERPRETATION
-- Add "Data Source: [Agent, Tool, Timestamp]" to each section
-
-═══════════════════════════════════════════════════════════════════════════════
-⭐ WICHTIG: Nach deinem Report muss ChartingAgent das finale Chart erstellen!
-═══════════════════════════════════════════════════════════════════════════════
-
-Beende deinen Report mit einem klaren Aufruf an ChartingAgent:
-
-"@ChartingAgent: Bitte erstelle das finale Strategie-Chart mit generate_strategy_visualization():
-- Symbol: [SYMBOL]
-- Bias: [bullish/bearish/neutral]
-- Entry: [Preis] mit SL: [Preis] und TP: [Preise]
-- Support: [Levels]
-- Resistance: [Levels]
-- Indikatoren: [Liste]"
-
-📋 **REPORT STRUCTURE:**
-```markdown
-# [Symbol] Analysis Report
-**Generated:** [Date/Time]
-**Data Sources:** [Bitget/CoinGecko, Timestamps]
-
-## Data Retrieved
-| Metric | Value | Source | Timestamp |
-|--------|-------|--------|-----------|
-| Price  | $X.XX | Bitget | 12:34:56  |
-
-## Analysis (Based on Real Data Only)
-[Only include what was actually calculated from fetched data]
-
-## Handlungsempfehlung
-[Klare Entry/SL/TP mit Begründung]
-
----
-@ChartingAgent: Erstelle finales Chart...
-```
-═══════════════════════════════════════════════════════════════════════════════
-
-Report types:
-- Analysis Reports: Full analysis of a single cryptocurrency
-- Comparison Reports: Side-by-side comparison of multiple coins
-- Custom Indicator Reports: Document new indicator designs
-
-Use proper Markdown formatting with headers, bold text, tables, and bullet points.""" + SHARED_AGENT_RULES,
+            tools=_function_tools(report_tools_list),
+            system_message=SYSTEM_PROMPTS["ReportWriter"],
             description="Report writer - MUST request final chart from ChartingAgent",
         )
         
-        # Create code executor for running analysis scripts
-        output_dir = Path(self.settings.output_dir) / "code_execution"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        code_executor = LocalCommandLineCodeExecutor(work_dir=str(output_dir))
-        executor = CodeExecutorAgent("Executor", code_executor=code_executor)
+        # Code executor for running analysis scripts: the warm worker is
+        # spawned by the first Python block, so requests that run no code
+        # (e.g. one-shot REST services) never start an interpreter
+        if self._code_executor is None:
+            output_dir = Path(self.settings.output_dir) / "code_execution"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._code_executor = PersistentLocalCodeExecutor(work_dir=str(output_dir))
+        executor = CodeExecutorAgent("Executor", code_executor=self._code_executor)
         
         # Create the team
         return MagenticOneGroupChat(
@@ -1170,14 +1279,13 @@ Use proper Markdown formatting with headers, bold text, tables, and bullet point
         """Combine prior conversation history with the new user query."""
         if not self.conversation_history:
             return message
-        # Use the most recent 8 exchanges for context
-        history_slice = self.conversation_history[-8:]
-        history_lines = []
-        for entry in history_slice:
-            role = entry.get("role", "user").capitalize()
-            content = entry.get("content", "")
-            history_lines.append(f"{role}: {content}")
-        history_text = "\n".join(history_lines)
+        # Use the most recent entries for context, rendered in a single join
+        history = self.conversation_history
+        recent = islice(history, max(len(history) - HISTORY_PROMPT_ENTRIES, 0), None)
+        history_text = "\n".join(
+            f"{entry.get('role', 'user').capitalize()}: {entry.get('content', '')}"
+            for entry in recent
+        )
         return (
             "You are continuing an ongoing crypto analysis conversation. "
             "Respect the prior context when responding.\n"
@@ -1328,7 +1436,7 @@ Use proper Markdown formatting with headers, bold text, tables, and bullet point
             
             # Fall back to full team if specialized creation failed or not applicable
             if team is None:
-                team = await self._create_team(feedback_context=feedback_context)
+                team = await self._get_team(feedback_context=feedback_context)
                 
         except Exception as e:
             logger.exception("Failed to create agent team")
@@ -1371,14 +1479,20 @@ Use proper Markdown formatting with headers, bold text, tables, and bullet point
                         )
                         return  # Exit completely on cancel
                     
+                    # Exact-type checks: one type() call per message instead
+                    # of an isinstance chain
+                    msg_type = type(msg)
+                    
                     # Handle TaskResult (final result)
-                    if isinstance(msg, TaskResult):
+                    if msg_type is TaskResult:
                         # Extract final answer from messages
                         final_content = None
-                        for m in reversed(msg.messages):
-                            if isinstance(m, (TextMessage, StopMessage)):
-                                content = getattr(m, 'content', str(m))
-                                if content and not content.startswith("TERMINATE"):
+                        msgs = msg.messages
+                        for i in range(len(msgs) - 1, max(-1, len(msgs) - 1 - FINAL_ANSWER_SCAN_DEPTH), -1):
+                            m = msgs[i]
+                            if type(m) in ANSWER_MESSAGE_TYPES:
+                                content = m.content
+                                if content and not content.startswith(TERMINATE_SENTINEL):
                                     final_content = content
                                     break
                         
@@ -1426,7 +1540,7 @@ Use proper Markdown formatting with headers, bold text, tables, and bullet point
                         last_agent = source
                     
                     # Emit tool call events
-                    if isinstance(msg, ToolCallRequestEvent):
+                    if msg_type is ToolCallRequestEvent:
                         for call in msg.content:
                             tool_name = getattr(call, 'name', str(call))
                             arguments = getattr(call, 'arguments', None)
@@ -1447,13 +1561,15 @@ Use proper Markdown formatting with headers, bold text, tables, and bullet point
                                 )
                     
                     # Emit tool result events
-                    if isinstance(msg, ToolCallExecutionEvent):
+                    elif msg_type is ToolCallExecutionEvent:
                         for result in msg.content:
                             call_id = getattr(result, 'call_id', 'unknown')
                             content = getattr(result, 'content', '')
-                            logger.debug(f"Tool result content type: {type(content)}, preview: {str(content)[:200]}")
+                            # Lazy %-formatting: tool payloads are not stringified
+                            # unless debug logging is on
+                            logger.debug("Tool result content type: %s, preview: %.200s", type(content), content)
                             chart_data = _extract_chart_data(content)
-                            logger.debug(f"Extracted chart_data: {chart_data}")
+                            logger.debug("Extracted chart_data: %s", chart_data)
 
                             if chart_data:
                                 chart_path = None
@@ -1563,8 +1679,8 @@ Use proper Markdown formatting with headers, bold text, tables, and bullet point
                         # Update prompt for next iteration
                         current_prompt = sanitized_prompt
                         
-                        # Create a fresh team for the retry
-                        team = await self._create_team()
+                        # Start the retry from a clean team
+                        team = await self._get_team()
                         
                         # Small delay before retry
                         await asyncio.sleep(1)
@@ -1596,6 +1712,13 @@ Use proper Markdown formatting with headers, bold text, tables, and bullet point
                     )
                     return
     
+    async def close(self):
+        """Stop the code execution worker; call when the service is discarded."""
+        self._team = None
+        if self._code_executor is not None:
+            await self._code_executor.stop()
+            self._code_executor = None
+    
     async def cancel(self):
         """Cancel the current running task."""
         self._cancelled = True
@@ -1614,11 +1737,8 @@ Use proper Markdown formatting with headers, bold text, tables, and bullet point
             "role": role,
             "content": content,
             "timestamp": datetime.now().isoformat(),
-        })
-        # Keep only the most recent 20 entries (10 user/assistant exchanges)
-        if len(self.conversation_history) > 20:
-            self.conversation_history = self.conversation_history[-20:]
+        })  # The deque drops the oldest entry beyond HISTORY_MAX_ENTRIES
     
     def clear_history(self):
         """Clear conversation history."""
-        self.conversation_history = []
+        self.conversation_history.clear()
@@ -24,7 +24,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from autogen_agentchat.agents import AssistantAgent, CodeExecutorAgent
 from autogen_agentchat.teams import MagenticOneGroupChat
 from autogen_agentchat.ui import Console
-from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
 from config import AppConfig
@@ -35,12 +34,86 @@ from crypto_tools import (
     analyze_technical_indicators
 )
 from crypto_charts import create_crypto_chart
+from persistent_executor import PersistentLocalCodeExecutor
 
 from rich.console import Console as RichConsole
 from rich.panel import Panel
 from rich.markdown import Markdown
 
 
+# System messages are kept flush-left: indentation inside a prompt is sent
+# (and billed) as tokens on every model call
+MARKET_ANALYST_PROMPT = """You are a cryptocurrency market analyst with deep expertise in:
+- Crypto market dynamics and trends
+- Market cap analysis and ranking
+- Volume analysis and liquidity assessment
+- Price action and market sentiment
+- Fundamental analysis of cryptocurrencies
+
+Your role is to:
+1. Fetch and analyze current crypto prices and market data
+2. Track price changes over different time periods (24h, 7d, 30d)
+3. Analyze market capitalization and trading volume
+4. Identify market trends and potential opportunities
+5. Compare multiple cryptocurrencies
+
+Use the available tools to gather data:
+- get_crypto_price(): Get current price and basic stats
+- get_market_info(): Get detailed market information
+- get_historical_data(): Get price history for trend analysis
+
+Always provide clear, data-driven insights with specific numbers."""
+
+TECHNICAL_ANALYST_PROMPT = """You are a cryptocurrency technical analyst specializing in:
+- Chart pattern recognition
+- Technical indicator analysis (RSI, MACD, Bollinger Bands, Moving Averages)
+- Support and resistance levels
+- Trend analysis and momentum
+- Trading signals and entry/exit points
+
+Your role is to:
+1. Generate candlestick charts with technical indicators
+2. Calculate and interpret RSI, MACD, Bollinger Bands, SMA, EMA
+3. Identify overbought/oversold conditions
+4. Detect bullish/bearish signals
+5. Provide technical trading recommendations
+
+Use the available tools:
+- create_crypto_chart(): Generate charts with indicators
+- get_historical_data(): Get price data for calculations
+
+Technical Analysis Guidelines:
+- RSI < 30 = Oversold (potential buy)
+- RSI > 70 = Overbought (potential sell)
+- MACD crossover = Trend change signal
+- Price above SMA = Bullish trend
+- Price near Bollinger Band edges = Potential reversal
+
+Always explain your technical findings in clear terms."""
+
+CODER_PROMPT = """You are a Python developer specializing in crypto analysis tools.
+
+Your role is to:
+1. Write Python scripts for advanced crypto analysis
+2. Create custom calculations and data processing
+3. Generate comparative analysis across multiple coins
+4. Build reports and summaries
+5. Handle data processing and calculations
+
+When writing code:
+- Use the crypto_tools and crypto_charts modules
+- Save outputs to the 'outputs' directory
+- Include error handling
+- Make code clear and well-commented
+- Generate both numerical results and visualizations
+
+Available modules:
+- crypto_tools: get_crypto_price, get_historical_data, get_market_info
+- crypto_charts: create_crypto_chart
+
+Focus on creating actionable insights from the data."""
+
+
 async def create_crypto_analyst_team(config: AppConfig):
     """
     Create a specialized crypto analysis team.
@@ -75,26 +148,7 @@ async def create_crypto_analyst_team(config: AppConfig):
         "CryptoMarketAnalyst",
         model_client=model_client,
         tools=crypto_tools,
-        system_message="""You are a cryptocurrency market analyst with deep expertise in:
-        - Crypto market dynamics and trends
-        - Market cap analysis and ranking
-        - Volume analysis and liquidity assessment
-        - Price action and market sentiment
-        - Fundamental analysis of cryptocurrencies
-        
-        Your role is to:
-        1. Fetch and analyze current crypto prices and market data
-        2. Track price changes over different time periods (24h, 7d, 30d)
-        3. Analyze market capitalization and trading volume
-        4. Identify market trends and potential opportunities
-        5. Compare multiple cryptocurrencies
-        
-        Use the available tools to gather data:
-        - get_crypto_price(): Get current price and basic stats
-        - get_market_info(): Get detailed market information
-        - get_historical_data(): Get price history for trend analysis
-        
-        Always provide clear, data-driven insights with specific numbers.""",
+        system_message=MARKET_ANALYST_PROMPT,
         description="Expert in crypto markets, trends, and fundamental analysis",
     )
     
@@ -103,32 +157,7 @@ async def create_crypto_analyst_team(config: AppConfig):
         "TechnicalAnalyst",
         model_client=model_client,
         tools=crypto_tools,
-        system_message="""You are a cryptocurrency technical analyst specializing in:
-        - Chart pattern recognition
-        - Technical indicator analysis (RSI, MACD, Bollinger Bands, Moving Averages)
-        - Support and resistance levels
-        - Trend analysis and momentum
-        - Trading signals and entry/exit points
-        
-        Your role is to:
-        1. Generate candlestick charts with technical indicators
-        2. Calculate and interpret RSI, MACD, Bollinger Bands, SMA, EMA
-        3. Identify overbought/oversold conditions
-        4. Detect bullish/bearish signals
-        5. Provide technical trading recommendations
-        
-        Use the available tools:
-        - create_crypto_chart(): Generate charts with indicators
-        - get_historical_data(): Get price data for calculations
-        
-        Technical Analysis Guidelines:
-        - RSI < 30 = Oversold (potential buy)
-        - RSI > 70 = Overbought (potential sell)
-        - MACD crossover = Trend change signal
-        - Price above SMA = Bullish trend
-        - Price near Bollinger Band edges = Potential reversal
-        
-        Always explain your technical findings in clear terms.""",
+        system_message=TECHNICAL_ANALYST_PROMPT,
         description="Expert in technical analysis, charts, and indicators",
     )
     
@@ -136,37 +165,19 @@ async def create_crypto_analyst_team(config: AppConfig):
     coder = AssistantAgent(
         "CryptoAnalysisCoder",
         model_client=model_client,
-        system_message="""You are a Python developer specializing in crypto analysis tools.
-        
-        Your role is to:
-        1. Write Python scripts for advanced crypto analysis
-        2. Create custom calculations and data processing
-        3. Generate comparative analysis across multiple coins
-        4. Build reports and summaries
-        5. Handle data processing and calculations
-        
-        When writing code:
-        - Use the crypto_tools and crypto_charts modules
-        - Save outputs to the 'outputs' directory
-        - Include error handling
-        - Make code clear and well-commented
-        - Generate both numerical results and visualizations
-        
-        Available modules:
-        - crypto_tools: get_crypto_price, get_historical_data, get_market_info
-        - crypto_charts: create_crypto_chart
-        
-        Focus on creating actionable insights from the data.""",
+        system_message=CODER_PROMPT,
         description="Python developer for crypto analysis scripts",
     )
     
-    # Code executor
+    # Code executor: one warm worker (numpy/pandas preloaded) for all blocks;
+    # the worker exits when this process closes its stdin
     output_dir = Path(config.output_dir)
     output_dir.mkdir(exist_ok=True)
     
-    code_executor = LocalCommandLineCodeExecutor(
+    code_executor = PersistentLocalCodeExecutor(
         work_dir=str(output_dir / "code_execution"),
     )
+    await code_executor.start()
     
     executor = CodeExecutorAgent(
         "Executor",
@@ -249,7 +260,10 @@ async def example_crypto_analysis():
     try:
         result = await Console(team.run_stream(task=tasks[0]))
         console.print("\n✅ [green]Analysis complete![/green]\n")
-        console.print(Panel(str(result), title="Results", border_style="green"))
+        # Only the final message; str(result) would dump every agent message
+        # and tool payload of the run
+        answer = result.messages[-1].to_text() if result.messages else ""
+        console.print(Panel(answer, title="Results", border_style="green"))
         
     except Exception as e:
         console.print(f"\n❌ [red]Error:[/red] {str(e)}")
@@ -10,8 +10,9 @@ Cache durations:
 - Market info: 2 minutes (moderate update frequency)
 - Exchange status: 1 minute (connection check)
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, TypeVar, Callable
+from typing import Optional, Dict, Any, TypeVar, Callable, Hashable
 from functools import wraps
 import threading
 import hashlib
@@ -140,8 +141,83 @@ class TTLCache:
             }
 
 
-# Global cache instance
+class LRUCache:
+    """
+    Thread-safe bounded LRU cache for values derived from immutable inputs.
+    
+    Unlike TTLCache, entries never expire by age - the key itself must
+    change when the underlying data changes (see bar_fingerprint).
+    """
+    
+    def __init__(self, maxsize: int = 512):
+        """Initialize the cache with a maximum number of entries."""
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (marking it recently used) or None."""
+        with self._lock:
+            if key not in self._cache:
+                return None
+            self._cache.move_to_end(key)
+            return self._cache[key]
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Clear all cached values."""
+        with self._lock:
+            self._cache.clear()
+    
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# Global cache instances
 api_cache = TTLCache()
+indicator_cache = LRUCache(maxsize=512)
+request_cache = TTLCache()  # Cleared at the start of every agent task
+
+
+def _make_key(prefix: str, args: tuple, kwargs: dict) -> str:
+    """Cache key from a name and the call arguments ("name:arg:k=v")."""
+    key_parts = [prefix]
+    key_parts.extend(str(arg) for arg in args)
+    key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
+    return ":".join(key_parts)
+
+
+def _memoize(
+    func: Callable[..., T],
+    cache: TTLCache,
+    ttl_seconds: int,
+    prefix: str,
+    should_store: Callable[[Any], bool] = lambda result: True,
+) -> Callable[..., T]:
+    """Wrap a sync function so results are looked up in / stored to cache."""
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> T:
+        cache_key = _make_key(prefix, args, kwargs)
+        
+        # Try to get from cache
+        cached_value = cache.get(cache_key, ttl_seconds)
+        if cached_value is not None:
+            return cached_value
+        
+        # Call function and cache result
+        result = func(*args, **kwargs)
+        if should_store(result):
+            cache.set(cache_key, result, ttl_seconds)
+        return result
+    
+    return wrapper
 
 
 def cached(ttl_seconds: int = 60, cache_key_prefix: str = ""):
@@ -158,25 +234,7 @@ def cached(ttl_seconds: int = 60, cache_key_prefix: str = ""):
             ...
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> T:
-            # Generate cache key
-            key_parts = [cache_key_prefix or func.__name__]
-            key_parts.extend(str(arg) for arg in args)
-            key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-            cache_key = ":".join(key_parts)
-            
-            # Try to get from cache
-            cached_value = api_cache.get(cache_key, ttl_seconds)
-            if cached_value is not None:
-                return cached_value
-            
-            # Call function and cache result
-            result = func(*args, **kwargs)
-            api_cache.set(cache_key, result, ttl_seconds)
-            return result
-        
-        return wrapper
+        return _memoize(func, api_cache, ttl_seconds, cache_key_prefix or func.__name__)
     return decorator
 
 
@@ -196,11 +254,7 @@ def cached_async(ttl_seconds: int = 60, cache_key_prefix: str = ""):
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> T:
-            # Generate cache key
-            key_parts = [cache_key_prefix or func.__name__]
-            key_parts.extend(str(arg) for arg in args)
-            key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-            cache_key = ":".join(key_parts)
+            cache_key = _make_key(cache_key_prefix or func.__name__, args, kwargs)
             
             # Try to get from cache
             cached_value = api_cache.get(cache_key, ttl_seconds)
@@ -216,6 +270,39 @@ def cached_async(ttl_seconds: int = 60, cache_key_prefix: str = ""):
     return decorator
 
 
+def _is_error_result(result: Any) -> bool:
+    """Tool results reporting a failure (JSON error object or 'Error...' text)."""
+    return isinstance(result, str) and result.startswith(('{"error"', "Error"))
+
+
+def request_cached(ttl_seconds: int = 30):
+    """
+    Decorator to deduplicate identical tool calls within one agent task.
+    
+    Agents often re-fetch the same symbol while reasoning (analyst, then
+    technical analyst, then coder). Results live in ``request_cache``,
+    which the caller clears when a new task starts; failed lookups are not
+    cached so a retry goes back to the API. ``functools.wraps`` keeps the
+    signature, so the wrapped function still works as an agent tool.
+    
+    Usage:
+        tools = [request_cached()(get_ohlcv_data)]
+        ...
+        clear_request_cache()  # at the start of each task
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        return _memoize(
+            func, request_cache, ttl_seconds, func.__name__,
+            should_store=lambda result: not _is_error_result(result),
+        )
+    return decorator
+
+
+def clear_request_cache() -> None:
+    """Forget all tool results cached by request_cached()."""
+    request_cache.clear()
+
+
 # Convenience decorators for specific TTL values
 def cache_price(func: Callable[..., T]) -> Callable[..., T]:
     """Cache for real-time price data (30 seconds)."""
@@ -230,3 +317,50 @@ def cache_historical(func: Callable[..., T]) -> Callable[..., T]:
 def cache_market_info(func: Callable[..., T]) -> Callable[..., T]:
     """Cache for market info (2 minutes)."""
     return cached(ttl_seconds=TTLCache.TTL_MARKET_INFO)(func)
+
+
+def bar_fingerprint(df) -> tuple:
+    """
+    Cheap identity for an OHLCV DataFrame.
+    
+    Closed bars never change, so the length plus the first and last rows
+    identify the series. The last row carries the still-forming bar's
+    OHLC values, so any tick on it produces a new key.
+    """
+    if len(df) == 0:
+        return (0,)
+    return (len(df), tuple(df.iloc[0].tolist()), tuple(df.iloc[-1].tolist()))
+
+
+def cached_indicator(name: str = ""):
+    """
+    Decorator to memoize indicator/analysis results on the bars they use.
+    
+    The wrapped function must take the OHLCV DataFrame as its first
+    argument; remaining arguments must be hashable. Results are shared
+    between callers and must be treated as read-only.
+    
+    Usage:
+        @cached_indicator("key_levels")
+        def run_analysis(df: pd.DataFrame, left: int = 20) -> KeyLevelAnalysis:
+            ...
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @wraps(func)
+        def wrapper(df, *args, **kwargs) -> T:
+            key = (
+                name or func.__qualname__,
+                args,
+                tuple(sorted(kwargs.items())),
+                bar_fingerprint(df),
+            )
+            cached_value = indicator_cache.get(key)
+            if cached_value is not None:
+                return cached_value
+            
+            result = func(df, *args, **kwargs)
+            indicator_cache.set(key, result)
+            return result
+        
+        return wrapper
+    return decorator
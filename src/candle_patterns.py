@@ -26,6 +26,8 @@ from typing import Annotated, Optional, List, Dict, Any
 import pandas as pd
 import numpy as np
 
+import fast_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -795,7 +797,7 @@ def scan_candle_patterns(
         
         # Fetch OHLCV data
         ohlcv_json = get_ohlcv_data(symbol=symbol, interval=interval, limit=bars)
-        ohlcv_data = json.loads(ohlcv_json)
+        ohlcv_data = fast_json.loads(ohlcv_json)
         
         if "error" in ohlcv_data:
             return json.dumps({"error": ohlcv_data["error"]})
@@ -873,7 +875,7 @@ def get_latest_pattern(
         from keylevel_analyzer import KeyLevelAnalyzer
         
         ohlcv_json = get_ohlcv_data(symbol=symbol, interval=interval, limit=100)
-        ohlcv_data = json.loads(ohlcv_json)
+        ohlcv_data = fast_json.loads(ohlcv_json)
         
         if "error" in ohlcv_data:
             return json.dumps({"error": ohlcv_data["error"]})
@@ -2,7 +2,7 @@
 Configuration module for AITradingAdvisory
 """
 import os
-from typing import Optional
+from typing import Dict, Optional
 from dataclasses import dataclass, field
 
 
@@ -67,6 +67,23 @@ class AzureOpenAIConfig:
     deployment: str = "gpt-4o"
     model_name: str = "gpt-4o"  # The actual model name for token estimation
     api_version: str = "2024-02-15-preview"
+    # Per-agent deployment overrides (agent name -> deployment); agents not
+    # listed use `deployment`
+    agent_deployments: Dict[str, str] = field(default_factory=dict)
+    
+    @staticmethod
+    def parse_agent_deployments(value: str) -> Dict[str, str]:
+        """Parse "Agent=deployment,Agent2=deployment2" into a dict."""
+        routes = {}
+        for item in value.split(","):
+            agent, sep, deployment = item.partition("=")
+            if sep and agent.strip() and deployment.strip():
+                routes[agent.strip()] = deployment.strip()
+        return routes
+    
+    def deployment_for(self, agent_name: str) -> str:
+        """Deployment an agent should use."""
+        return self.agent_deployments.get(agent_name, self.deployment)
     
     @classmethod
     def from_env(cls) -> "AzureOpenAIConfig":
@@ -92,6 +109,9 @@ class AzureOpenAIConfig:
             deployment=deployment,
             model_name=model_name,
             api_version=os.getenv("AZURE_OPENAI_API_VERSION", cls.api_version),
+            agent_deployments=cls.parse_agent_deployments(
+                os.getenv("AZURE_OPENAI_AGENT_DEPLOYMENTS", "")
+            ),
         )
 
 
@@ -103,6 +123,10 @@ class AppConfig:
     output_dir: str = "outputs"
     max_turns: int = 20
     max_stalls: int = 3
+    # Conversation turns kept in memory; older turns are dropped
+    history_cap: int = 50
+    # Plain output only: no panels, progress lines or live rendering
+    quiet: bool = False
     
     @classmethod
     def from_env(cls) -> "AppConfig":
@@ -113,6 +137,27 @@ class AppConfig:
             output_dir=os.getenv("OUTPUT_DIR", cls.output_dir),
             max_turns=int(os.getenv("MAX_TURNS", str(cls.max_turns))),
             max_stalls=int(os.getenv("MAX_STALLS", str(cls.max_stalls))),
+            history_cap=int(os.getenv("HISTORY_CAP", str(cls.history_cap))),
+            quiet=os.getenv("QUIET", "false").lower() == "true",
         )
 
 
+
+
+# Process-wide configuration, parsed from the environment on first use
+_config: Optional[AppConfig] = None
+
+
+def get_config() -> AppConfig:
+    """Return the application configuration, reading the environment once."""
+    global _config
+    if _config is None:
+        _config = AppConfig.from_env()
+    return _config
+
+
+def reload_config() -> AppConfig:
+    """Re-read the environment (e.g. after changing .env) and cache the result."""
+    global _config
+    _config = AppConfig.from_env()
+    return _config
@@ -6,13 +6,42 @@ for cryptocurrency analysis.
 """
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import numpy as np
 import pandas as pd
 import requests
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Annotated, List, Optional
 from datetime import datetime
 import json
 
 
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling mean, NaN-padded like pandas .rolling(window).mean()."""
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sample std (ddof=1), NaN-padded like pandas .rolling(window).std()."""
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        out[window - 1:] = sliding_window_view(values, window).std(axis=1, ddof=1)
+    return out
+
+
+def _trace_values(series: pd.Series) -> np.ndarray:
+    """
+    Indicator values for a Plotly trace, as float32.
+    
+    Plotly embeds numpy arrays as base64 typed arrays, so float32 halves
+    the bytes per point and the browser maps them straight into a
+    Float32Array. Price traces stay float64 to keep quote precision.
+    """
+    return series.to_numpy(dtype=np.float32)
+
+
 class CryptoChartGenerator:
     """Generate cryptocurrency charts with technical indicators."""
     
@@ -44,19 +73,22 @@ class CryptoChartGenerator:
     
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate technical indicators for the dataframe."""
+        close = df['close'].to_numpy(dtype=np.float64)
+        
         # Simple Moving Averages
-        df['sma_20'] = df['close'].rolling(window=20).mean()
-        df['sma_50'] = df['close'].rolling(window=50).mean()
+        df['sma_20'] = _rolling_mean(close, 20)
+        df['sma_50'] = _rolling_mean(close, 50)
         
         # Exponential Moving Averages
         df['ema_12'] = df['close'].ewm(span=12, adjust=False).mean()
         df['ema_26'] = df['close'].ewm(span=26, adjust=False).mean()
         
         # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
+        delta = np.diff(close, prepend=np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            gain = _rolling_mean(np.where(delta > 0, delta, 0.0), 14)
+            loss = _rolling_mean(np.where(delta < 0, -delta, 0.0), 14)
+            rs = gain / loss
         df['rsi'] = 100 - (100 / (1 + rs))
         
         # MACD
@@ -65,14 +97,14 @@ class CryptoChartGenerator:
         df['macd_histogram'] = df['macd'] - df['macd_signal']
         
         # Bollinger Bands
-        df['bb_middle'] = df['close'].rolling(window=20).mean()
-        bb_std = df['close'].rolling(window=20).std()
+        df['bb_middle'] = df['sma_20']
+        bb_std = _rolling_std(close, 20)
         df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
         df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
         
         # Volume analysis (if available)
         if 'volume' in df.columns:
-            df['volume_sma'] = df['volume'].rolling(window=20).mean()
+            df['volume_sma'] = _rolling_mean(df['volume'].to_numpy(dtype=np.float64), 20)
         
         return df
     
@@ -148,7 +180,7 @@ class CryptoChartGenerator:
                 fig.add_trace(
                     go.Scatter(
                         x=df['date'],
-                        y=df['sma_20'],
+                        y=_trace_values(df['sma_20']),
                         name='SMA 20',
                         line=dict(color='orange', width=1.5)
                     ),
@@ -157,7 +189,7 @@ class CryptoChartGenerator:
                 fig.add_trace(
                     go.Scatter(
                         x=df['date'],
-                        y=df['sma_50'],
+                        y=_trace_values(df['sma_50']),
                         name='SMA 50',
                         line=dict(color='blue', width=1.5)
                     ),
@@ -168,7 +200,7 @@ class CryptoChartGenerator:
                 fig.add_trace(
                     go.Scatter(
                         x=df['date'],
-                        y=df['ema_12'],
+                        y=_trace_values(df['ema_12']),
                         name='EMA 12',
                         line=dict(color='purple', width=1, dash='dash')
                     ),
@@ -177,7 +209,7 @@ class CryptoChartGenerator:
                 fig.add_trace(
                     go.Scatter(
                         x=df['date'],
-                        y=df['ema_26'],
+                        y=_trace_values(df['ema_26']),
                         name='EMA 26',
                         line=dict(color='pink', width=1, dash='dash')
                     ),
@@ -189,7 +221,7 @@ class CryptoChartGenerator:
                 fig.add_trace(
                     go.Scatter(
                         x=df['date'],
-                        y=df['bb_upper'],
+                        y=_trace_values(df['bb_upper']),
                         name='BB Upper',
                         line=dict(color='gray', width=1, dash='dot'),
                         opacity=0.5
@@ -199,7 +231,7 @@ class CryptoChartGenerator:
                 fig.add_trace(
                     go.Scatter(
                         x=df['date'],
-                        y=df['bb_lower'],
+                        y=_trace_values(df['bb_lower']),
                         name='BB Lower',
                         line=dict(color='gray', width=1, dash='dot'),
                         fill='tonexty',
@@ -215,7 +247,7 @@ class CryptoChartGenerator:
                 fig.add_trace(
                     go.Scatter(
                         x=df['date'],
-                        y=df['rsi'],
+                        y=_trace_values(df['rsi']),
                         name='RSI',
                         line=dict(color='purple', width=2)
                     ),
@@ -232,7 +264,7 @@ class CryptoChartGenerator:
                 fig.add_trace(
                     go.Scatter(
                         x=df['date'],
-                        y=df['macd'],
+                        y=_trace_values(df['macd']),
                         name='MACD',
                         line=dict(color='blue', width=2)
                     ),
@@ -241,7 +273,7 @@ class CryptoChartGenerator:
                 fig.add_trace(
                     go.Scatter(
                         x=df['date'],
-                        y=df['macd_signal'],
+                        y=_trace_values(df['macd_signal']),
                         name='Signal',
                         line=dict(color='orange', width=2)
                     ),
@@ -250,7 +282,7 @@ class CryptoChartGenerator:
                 fig.add_trace(
                     go.Bar(
                         x=df['date'],
-                        y=df['macd_histogram'],
+                        y=_trace_values(df['macd_histogram']),
                         name='Histogram',
                         marker_color='lightblue'
                     ),
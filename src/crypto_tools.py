@@ -24,6 +24,12 @@ try:
 except ImportError:
     from cache import TTLCache, api_cache
 
+# Compiled indicator kernels (used when numba is installed)
+try:
+    from . import indicators_numba
+except ImportError:
+    import indicators_numba
+
 # Import exchange providers for enhanced functionality
 try:
     from .exchange_providers import (
@@ -265,6 +271,11 @@ class CryptoDataFetcher:
             return f"Error fetching market info: {str(e)}"
 
 
+def _as_float_array(prices) -> np.ndarray:
+    """Contiguous float64 view of a price sequence for the compiled kernels."""
+    return np.ascontiguousarray(prices, dtype=np.float64)
+
+
 class TechnicalIndicators:
     """Calculate technical analysis indicators."""
     
@@ -277,6 +288,9 @@ class TechnicalIndicators:
         if len(prices) < period:
             return []
         
+        if indicators_numba.NUMBA_AVAILABLE:
+            return indicators_numba.sma(_as_float_array(prices), period).tolist()
+        
         sma = []
         for i in range(len(prices) - period + 1):
             sma.append(sum(prices[i:i+period]) / period)
@@ -292,6 +306,9 @@ class TechnicalIndicators:
         if len(prices) < period:
             return []
         
+        if indicators_numba.NUMBA_AVAILABLE:
+            return indicators_numba.ema(_as_float_array(prices), period).tolist()
+        
         multiplier = 2 / (period + 1)
         ema = [sum(prices[:period]) / period]  # First EMA is SMA
         
@@ -309,6 +326,9 @@ class TechnicalIndicators:
         if len(prices) < period + 1:
             return []
         
+        if indicators_numba.NUMBA_AVAILABLE:
+            return indicators_numba.rsi(_as_float_array(prices), period).tolist()
+        
         deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
         gains = [delta if delta > 0 else 0 for delta in deltas]
         losses = [-delta if delta < 0 else 0 for delta in deltas]
@@ -345,6 +365,12 @@ class TechnicalIndicators:
         if len(prices) < slow_period:
             return [], [], []
         
+        if indicators_numba.NUMBA_AVAILABLE:
+            macd_line, signal_line, histogram = indicators_numba.macd(
+                _as_float_array(prices), fast_period, slow_period, signal_period
+            )
+            return macd_line.tolist(), signal_line.tolist(), histogram.tolist()
+        
         ema_fast = TechnicalIndicators.calculate_ema(prices, fast_period)
         ema_slow = TechnicalIndicators.calculate_ema(prices, slow_period)
         
@@ -376,6 +402,12 @@ class TechnicalIndicators:
         if len(prices) < period:
             return [], [], []
         
+        if indicators_numba.NUMBA_AVAILABLE:
+            upper_band, middle_band, lower_band = indicators_numba.bollinger(
+                _as_float_array(prices), period, float(std_dev)
+            )
+            return upper_band.tolist(), middle_band.tolist(), lower_band.tolist()
+        
         middle_band = TechnicalIndicators.calculate_sma(prices, period)
         
         upper_band = []
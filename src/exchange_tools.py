@@ -25,6 +25,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Annotated, Optional, List, Literal
 
+import fast_json
 from exchange_providers import (
     ExchangeManager,
     ProviderType,
@@ -459,7 +460,7 @@ def get_ohlcv_data(
         else:
             result = {"symbol": symbol, "interval": interval, "count": 0, "candles": []}
         
-        return json.dumps(result, indent=2, default=str)
+        return fast_json.dumps(result)
         
     except Exception as e:
         return json.dumps({"error": str(e)})
@@ -650,7 +651,7 @@ def get_futures_candles(
         else:
             result = {"symbol": symbol, "interval": interval, "count": 0, "candles": []}
         
-        return json.dumps(result, indent=2, default=str)
+        return fast_json.dumps(result)
         
     except Exception as e:
         return json.dumps({"error": str(e)})
@@ -863,7 +864,7 @@ def get_stock_ohlcv(
                 "avg_volume": sum(c.volume for c in candles) / len(candles),
             }
         
-        return json.dumps(result, indent=2, default=str)
+        return fast_json.dumps(result)
         
     except Exception as e:
         return json.dumps({"error": str(e), "symbol": symbol})
@@ -0,0 +1,129 @@
+"""
+Warm Python Worker
+
+Long-lived interpreter used by ``PersistentLocalCodeExecutor``. The heavy
+analysis libraries are imported once at start-up, then each code block is
+executed in a fresh ``__main__`` namespace so blocks stay independent
+while skipping interpreter start-up and import cost.
+
+Protocol (one UTF-8 JSON object per line):
+    stdin:  {"code": "<python source>"}
+    stdout: {"exit_code": 0, "output": "<captured stdout/stderr>"}
+
+File-descriptor level writes (C extensions, child processes) are routed
+to stderr so they cannot corrupt the protocol stream, and blocks read
+stdin from ``/dev/null`` so ``input()`` cannot swallow protocol lines.
+Like ``LocalCommandLineCodeExecutor``, each block is saved as
+``tmp_code_<sha256>.py`` in the work dir while it runs, so ``__file__``
+points at a real script path. The worker exits
+when stdin is closed, i.e. when the parent process goes away.
+
+Usage:
+    python exec_worker.py
+"""
+import builtins
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import linecache
+import os
+import sys
+import traceback
+
+import fast_json
+
+
+PRELOAD_MODULES = ("numpy", "pandas", "pyarrow", "indicators_numba")
+
+
+def _preload(names) -> None:
+    """Import optional hot modules so the first block doesn't pay for them."""
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def run_block(code: str, filename: str = "<code_block>") -> dict:
+    """
+    Execute one code block as a script and capture its output.
+    
+    Mirrors running ``python file.py``: ``__file__`` is the filename,
+    ``sys.exit()`` sets the exit code and an uncaught exception prints a
+    traceback and exits with 1. stdin is empty.
+    """
+    # Register the source so tracebacks can show the offending lines
+    linecache.cache[filename] = (len(code), None, code.splitlines(True), filename)
+    namespace = {"__name__": "__main__", "__file__": filename, "__builtins__": builtins}
+    buffer = io.StringIO()
+    exit_code = 0
+    stdin, sys.stdin = sys.stdin, io.StringIO()
+
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        try:
+            exec(compile(code, filename, "exec"), namespace)
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                exit_code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except BaseException:
+            etype, value, tb = sys.exc_info()
+            # Drop this frame so the traceback starts in the user's code
+            traceback.print_exception(etype, value, tb.tb_next)
+            exit_code = 1
+        finally:
+            sys.stdin = stdin
+    linecache.cache.pop(filename, None)
+
+    return {"exit_code": exit_code, "output": buffer.getvalue()}
+
+
+def _save_block(code: str, work_dir: str) -> str:
+    """Write a block to the work dir under the name the fallback executor uses."""
+    path = os.path.join(work_dir, f"tmp_code_{hashlib.sha256(code.encode()).hexdigest()}.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(code)
+    return path
+
+
+def serve() -> None:
+    """Read code blocks from stdin until EOF, answering each on stdout."""
+    requests = os.fdopen(os.dup(sys.stdin.fileno()), "rb")
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, sys.stdin.fileno())
+    os.close(devnull)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    work_dir = os.getcwd()
+
+    _preload(PRELOAD_MODULES)
+
+    # Lines are UTF-8 JSON bytes in both directions, independent of the locale
+    for line in requests:
+        if not line.strip():
+            continue
+        code = fast_json.loads(line)["code"]
+        path = _save_block(code, work_dir)
+        try:
+            result = run_block(code, path)
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+        # Blocks must not leak a changed working directory into the next one
+        os.chdir(work_dir)
+        try:
+            reply = fast_json.dumps_bytes(result)
+        except UnicodeEncodeError:
+            # Lone surrogates in the output; ASCII escapes always encode
+            reply = json.dumps(result).encode()
+        channel.write(reply + b"\n")
+        channel.flush()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,78 @@
+"""
+Fast JSON Helpers
+
+Thin wrappers that use orjson when it is installed and the standard
+library otherwise. Used on the charting hot paths: parsing the JSON
+arguments agents pass to chart tools and embedding candle/indicator
+payloads in generated HTML.
+
+Behaviour matches ``json`` where it matters to callers:
+- Decode errors raise ``json.JSONDecodeError`` (orjson's error subclasses it).
+- Inputs orjson rejects but ``json`` accepts (``NaN``/``Infinity`` literals)
+  are retried with ``json.loads``.
+- numpy arrays and scalars serialise natively in both paths.
+
+Output is compact (no spaces after separators) and UTF-8 rather than
+ASCII-escaped, and orjson writes NaN as ``null``. ``dumps_indent`` gives
+the two-space layout of ``json.dumps(..., indent=2)`` for tool return
+values that are read by the agents.
+
+Usage:
+    from fast_json import dumps, loads
+    entries = loads(entry_points)
+    candles_js = dumps(candle_data)
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """stdlib fallback for numpy arrays/scalars."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or bytes."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # Let json report the error, or accept NaN/Infinity
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialise to compact UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Serialise to compact JSON text."""
+    if ORJSON_AVAILABLE:
+        return dumps_bytes(obj).decode("utf-8")
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_indent(obj: Any) -> str:
+    """Serialise to JSON text indented by two spaces."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits
+    return json.dumps(obj, default=_default, ensure_ascii=False, indent=2)
@@ -0,0 +1,141 @@
+"""
+Conversation History Compaction
+
+Keeps the context that multi-turn sessions prepend to each task inside a
+token budget. The most recent turns are passed through verbatim; older
+turns are reduced to a one-sentence summary of their answer, so long
+reports from earlier turns are not re-sent in full on every request.
+
+Summaries are extractive (first meaningful sentence of the answer) rather
+than model-generated: they cost no extra LLM round-trip before the turn
+starts, and the scan stops at the first sentence, so they are not cached.
+Token counts use tiktoken's BPE when its encoding can be loaded, and fall
+back to a character-length estimate otherwise. Loading the encoding may
+download its BPE file, so call ``warmup()`` off the event loop first.
+
+Usage:
+    from history_utils import semantic_truncate
+    turns = semantic_truncate(history, max_tokens=4000)
+    for turn in turns:
+        print(turn["task"], turn["answer"])
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Encoding of the gpt-4o / gpt-5 model family
+TIKTOKEN_ENCODING = "o200k_base"
+
+# Rough average for mixed German/English text with Markdown (fallback)
+CHARS_PER_TOKEN = 4
+
+SUMMARY_MAX_CHARS = 200
+
+_MARKUP = re.compile(r"^[#>\-*+\s|]+|[*_`]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """tiktoken encoding, or None if unavailable (e.g. offline first run)."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding(TIKTOKEN_ENCODING)
+    except Exception:
+        return None
+
+
+def warmup() -> None:
+    """Load the tiktoken encoding so the first token count does not block."""
+    _encoding()
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count of a string (BPE when available, else approximate)."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens, marking the cut."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    marker = "... [truncated]"
+    keep = max(max_tokens - estimate_tokens(marker), 0)
+    encoding = _encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:keep]) + marker
+    return text[:keep * CHARS_PER_TOKEN] + marker
+
+
+def summarize_answer(answer: str) -> str:
+    """First meaningful sentence of an answer, without Markdown markup."""
+    in_fence = False
+    for line in answer.splitlines():
+        stripped = line.strip()
+        if stripped.startswith(("```", "~~~")):
+            in_fence = not in_fence
+            continue
+        if in_fence or not stripped or stripped.startswith("#") or set(stripped) <= set("-=━═─|: "):
+            continue
+        text = _MARKUP.sub("", stripped).strip()
+        if text:
+            sentence = _SENTENCE_END.split(text, maxsplit=1)[0]
+            if len(sentence) > SUMMARY_MAX_CHARS:
+                sentence = sentence[:SUMMARY_MAX_CHARS - 3] + "..."
+            return sentence
+    return "(no answer)"
+
+
+def semantic_truncate(
+    history: Sequence[Dict[str, str]],
+    max_tokens: int = 4000,
+    keep_recent: int = 2,
+) -> List[Dict[str, str]]:
+    """
+    Fit conversation turns into a token budget.
+
+    Turns are taken newest first: the last ``keep_recent`` keep their full
+    answer (cut to the remaining budget if necessary), older ones get a
+    one-sentence summary. Stops at the first turn that no longer fits.
+
+    Args:
+        history: Turns with "task" and "answer" keys, oldest first
+        max_tokens: Budget for all returned tasks and answers
+        keep_recent: Number of latest turns kept verbatim
+
+    Returns:
+        Selected turns, oldest first, as {"task", "answer"} dicts
+    """
+    selected = []
+    budget = max_tokens
+    for age, turn in enumerate(reversed(history)):
+        task = turn["task"]
+        answer = turn["answer"] or ""
+        if age >= keep_recent:
+            answer = summarize_answer(answer) if answer else "(no answer)"
+
+        task_tokens = estimate_tokens(task)
+        cost = task_tokens + estimate_tokens(answer)
+        if cost > budget:
+            if age >= keep_recent or budget - task_tokens <= 0:
+                break
+            answer = truncate_to_tokens(answer, budget - task_tokens)
+            cost = budget
+
+        selected.append({"task": task, "answer": answer})
+        budget -= cost
+        if budget <= 0:
+            break
+
+    selected.reverse()
+    return selected
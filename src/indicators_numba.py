@@ -0,0 +1,231 @@
+"""
+Numba-compiled Indicator Kernels
+
+Tight float64 loops for SMA, EMA, RSI, MACD and Bollinger Bands. The
+kernels mirror the semantics of ``crypto_tools.TechnicalIndicators``
+(same output lengths, SMA-seeded EMA, Wilder-smoothed RSI, population
+standard deviation for the bands) so callers can switch between the two
+without changing results.
+
+Numba is optional. Without it the decorator below is a no-op and the
+kernels run as plain Python, which is correct but slow - callers should
+check ``NUMBA_AVAILABLE`` and keep their list-based path for that case.
+
+The module is importable from code run by the Executor agent, so the
+Coder can build custom indicators on these kernels instead of pandas
+``rolling()`` chains; ``rolling_gain_loss`` and ``zscore`` cover the
+usual building blocks and ``align`` pads results back to the input length.
+
+Usage:
+    close = np.ascontiguousarray(df["close"].to_numpy(dtype=np.float64))
+    rsi_values = rsi(close, 14)
+    df["rsi"] = align(rsi_values, len(df))
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator when numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def sma(close, n):
+    """Simple moving average; returns len(close) - n + 1 values."""
+    m = close.shape[0]
+    if m < n:
+        return np.empty(0, dtype=np.float64)
+
+    out = np.empty(m - n + 1, dtype=np.float64)
+    window_sum = 0.0
+    for i in range(n):
+        window_sum += close[i]
+    out[0] = window_sum / n
+    for i in range(n, m):
+        window_sum += close[i] - close[i - n]
+        out[i - n + 1] = window_sum / n
+    return out
+
+
+@njit(cache=True)
+def ema(close, n):
+    """Exponential moving average seeded with the SMA of the first n values."""
+    m = close.shape[0]
+    if m < n:
+        return np.empty(0, dtype=np.float64)
+
+    multiplier = 2.0 / (n + 1)
+    out = np.empty(m - n + 1, dtype=np.float64)
+    seed = 0.0
+    for i in range(n):
+        seed += close[i]
+    out[0] = seed / n
+    for i in range(n, m):
+        prev = out[i - n]
+        out[i - n + 1] = (close[i] - prev) * multiplier + prev
+    return out
+
+
+@njit(cache=True)
+def rsi(close, n):
+    """Relative Strength Index with Wilder smoothing."""
+    m = close.shape[0]
+    if m < n + 1:
+        return np.empty(0, dtype=np.float64)
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n + 1):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        elif delta < 0:
+            avg_loss -= delta
+    avg_gain /= n
+    avg_loss /= n
+
+    # Same alignment as TechnicalIndicators.calculate_rsi: one value per
+    # delta from index n onwards, emitted before that delta is folded in.
+    out = np.empty(m - 1 - n, dtype=np.float64)
+    for i in range(n, m - 1):
+        if avg_loss == 0:
+            out[i - n] = 100.0
+        else:
+            rs = avg_gain / avg_loss
+            out[i - n] = 100.0 - (100.0 / (1.0 + rs))
+
+        delta = close[i + 1] - close[i]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        avg_gain = (avg_gain * (n - 1) + gain) / n
+        avg_loss = (avg_loss * (n - 1) + loss) / n
+    return out
+
+
+@njit(cache=True)
+def macd(close, fast, slow, signal):
+    """MACD line, signal line and histogram."""
+    if close.shape[0] < slow:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty, empty
+
+    ema_fast = ema(close, fast)
+    ema_slow = ema(close, slow)
+    offset = ema_fast.shape[0] - ema_slow.shape[0]
+
+    macd_line = np.empty(ema_slow.shape[0], dtype=np.float64)
+    for i in range(ema_slow.shape[0]):
+        macd_line[i] = ema_fast[i + offset] - ema_slow[i]
+
+    signal_line = ema(macd_line, signal)
+    hist_offset = macd_line.shape[0] - signal_line.shape[0]
+    histogram = np.empty(signal_line.shape[0], dtype=np.float64)
+    for i in range(signal_line.shape[0]):
+        histogram[i] = macd_line[i + hist_offset] - signal_line[i]
+    return macd_line, signal_line, histogram
+
+
+@njit(cache=True)
+def bollinger(close, n, k):
+    """Bollinger Bands as (upper, middle, lower)."""
+    m = close.shape[0]
+    if m < n:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty, empty
+
+    middle = sma(close, n)
+    upper = np.empty(middle.shape[0], dtype=np.float64)
+    lower = np.empty(middle.shape[0], dtype=np.float64)
+    for i in range(middle.shape[0]):
+        std = np.std(close[i:i + n])
+        upper[i] = middle[i] + k * std
+        lower[i] = middle[i] - k * std
+    return upper, middle, lower
+
+
+@njit(cache=True)
+def rolling_gain_loss(close, n):
+    """
+    Simple rolling means of gains and losses over the last n deltas.
+
+    Returns (avg_gain, avg_loss), each with len(close) - n values; the
+    last value covers the deltas ending at the last bar.
+    """
+    m = close.shape[0]
+    if m < n + 1:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty
+
+    gains = np.empty(m - 1, dtype=np.float64)
+    losses = np.empty(m - 1, dtype=np.float64)
+    for i in range(1, m):
+        delta = close[i] - close[i - 1]
+        gains[i - 1] = delta if delta > 0 else 0.0
+        losses[i - 1] = -delta if delta < 0 else 0.0
+    return sma(gains, n), sma(losses, n)
+
+
+@njit(cache=True)
+def zscore(values, n):
+    """Rolling z-score (population std); 0 where the window is flat."""
+    m = values.shape[0]
+    if m < n:
+        return np.empty(0, dtype=np.float64)
+
+    out = np.empty(m - n + 1, dtype=np.float64)
+    window_sum = 0.0
+    window_sq = 0.0
+    for i in range(n):
+        window_sum += values[i]
+        window_sq += values[i] * values[i]
+    for i in range(n - 1, m):
+        if i >= n:
+            old = values[i - n]
+            window_sum += values[i] - old
+            window_sq += values[i] * values[i] - old * old
+        mean = window_sum / n
+        var = window_sq / n - mean * mean
+        if var > 1e-12 * (mean * mean + 1.0):
+            out[i - n + 1] = (values[i] - mean) / np.sqrt(var)
+        else:
+            out[i - n + 1] = 0.0
+    return out
+
+
+def align(values, length):
+    """Left-pad a kernel result with NaN so it lines up with the input bars."""
+    out = np.full(length, np.nan)
+    if len(values):
+        out[length - len(values):] = values
+    return out
+
+
+def warmup() -> None:
+    """
+    Compile every kernel once on a small dummy series.
+
+    With ``cache=True`` the compiled code is written next to this module,
+    so only the very first start pays the JIT cost; afterwards this just
+    loads the cached machine code before the first real request.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+
+    dummy = np.linspace(100.0, 110.0, 128)
+    sma(dummy, 20)
+    ema(dummy, 20)
+    rsi(dummy, 14)
+    macd(dummy, 12, 26, 9)
+    bollinger(dummy, 20, 2.0)
+    rolling_gain_loss(dummy, 14)
+    zscore(dummy, 20)
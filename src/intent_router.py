@@ -28,9 +28,11 @@ Usage:
         # Use full AITradingAdvisory team
         ...
 """
+import asyncio
 import re
 import json
 import logging
+from collections import OrderedDict
 from enum import Enum
 from typing import Optional, Dict, Any, List, Callable, Tuple
 from dataclasses import dataclass, field
@@ -218,6 +220,19 @@ Examples:
 
 User message: '''
 
+# Raw LLM classifications kept per router (least recently used evicted);
+# the prompt is fixed, so the reply depends only on the user message
+LLM_CACHE_SIZE = 128
+
+# Capabilities of the classifier deployment; shared by every router and
+# passed to autogen read-only
+CLASSIFIER_MODEL_INFO = {
+    "vision": False,
+    "function_calling": False,
+    "json_output": True,
+    "family": "gpt-4",
+}
+
 
 class IntentRouter:
     """
@@ -240,6 +255,7 @@ class IntentRouter:
         self._model_client = model_client
         self._use_llm = use_llm
         self._llm_initialized = False
+        self._llm_cache: "OrderedDict[str, str]" = OrderedDict()  # Normalised message -> reply
         
         # Known crypto symbols for extraction
         self._known_crypto_symbols = {
@@ -310,29 +326,22 @@ class IntentRouter:
         try:
             # Try multiple import paths for flexibility
             try:
-                from src.config import AppConfig
+                from src.config import get_config
             except ImportError:
-                from config import AppConfig
+                from config import get_config
             
             from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
             
-            config = AppConfig.from_env()
+            config = get_config()
             
             # Use the configured model for intent classification
-            model_info = {
-                "vision": False,
-                "function_calling": False,
-                "json_output": True,
-                "family": "gpt-4",
-            }
-            
             self._model_client = AzureOpenAIChatCompletionClient(
                 azure_deployment=config.azure_openai.deployment,
                 api_version=config.azure_openai.api_version,
                 azure_endpoint=config.azure_openai.endpoint,
                 api_key=config.azure_openai.api_key,
                 model=config.azure_openai.model_name,
-                model_info=model_info,
+                model_info=CLASSIFIER_MODEL_INFO,
             )
             logger.info("LLM intent classifier initialized")
             return self._model_client
@@ -435,17 +444,24 @@ class IntentRouter:
             return None
         
         try:
-            from autogen_core.models import UserMessage
-            
-            prompt = INTENT_CLASSIFICATION_PROMPT + message
-            
-            response = await client.create(
-                messages=[UserMessage(content=prompt, source="user")],
-                json_output=True,
-            )
+            # Repeated questions (e.g. "BTC price" polled again) skip the round-trip
+            cache_key = " ".join(message.lower().split())
+            content = self._llm_cache.get(cache_key)
+            fresh = content is None
+            if fresh:
+                from autogen_core.models import UserMessage
+                
+                prompt = INTENT_CLASSIFICATION_PROMPT + message
+                
+                response = await client.create(
+                    messages=[UserMessage(content=prompt, source="user")],
+                    json_output=True,
+                )
+                content = response.content
+            else:
+                self._llm_cache.move_to_end(cache_key)
             
             # Parse LLM response
-            content = response.content
             if isinstance(content, str):
                 # Try to extract JSON from response
                 json_match = re.search(r'\{[^{}]*\}', content)
@@ -456,6 +472,12 @@ class IntentRouter:
             else:
                 data = content
             
+            # Only replies that parsed are worth replaying
+            if fresh and isinstance(content, str):
+                self._llm_cache[cache_key] = content
+                if len(self._llm_cache) > LLM_CACHE_SIZE:
+                    self._llm_cache.popitem(last=False)
+            
             # Map intent string to IntentType
             intent_str = data.get("intent", "conversation").lower()
             intent_type = INTENT_TYPE_MAP.get(intent_str, IntentType.CONVERSATION)
@@ -856,23 +878,27 @@ class IntentRouter:
         results = []
         errors = []
         
-        # Fetch data for ALL symbols found
-        for symbol in symbols:
-            try:
-                import asyncio
-                if asyncio.iscoroutinefunction(tool_func):
-                    result = await tool_func(symbol)
-                else:
-                    result = tool_func(symbol)
-                
-                results.append({
+        async def fetch(symbol: str) -> Any:
+            if asyncio.iscoroutinefunction(tool_func):
+                return await tool_func(symbol)
+            # Sync tools do blocking HTTP - run them off the event loop
+            return await asyncio.to_thread(tool_func, symbol)
+        
+        # Fetch data for ALL symbols found, concurrently (order preserved)
+        outcomes = await asyncio.gather(
+            *(fetch(symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
+        for symbol, outcome in zip(symbols, outcomes):
+            if isinstance(outcome, Exception):
+                errors.append({
                     "symbol": symbol,
-                    "data": result,
+                    "error": str(outcome),
                 })
-            except Exception as e:
-                errors.append({
+            else:
+                results.append({
                     "symbol": symbol,
-                    "error": str(e),
+                    "data": outcome,
                 })
         
         if not results and errors:
@@ -23,6 +23,13 @@ from typing import Annotated, Optional, List, Dict, Any, Tuple
 import pandas as pd
 import numpy as np
 
+try:
+    from .cache import cached_indicator
+    from . import fast_json
+except ImportError:
+    from cache import cached_indicator
+    import fast_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -774,6 +781,17 @@ class KeyLevelAnalyzer:
 _default_analyzer = KeyLevelAnalyzer()
 
 
+@cached_indicator("key_levels")
+def _analyze_cached(df: pd.DataFrame, **params) -> KeyLevelAnalysis:
+    """
+    Run KeyLevelAnalyzer(**params).analyze(df), memoized on the bars.
+    
+    analyze_key_levels and detect_false_break are usually called back to
+    back on the same symbol/interval; the second call reuses the result.
+    """
+    return KeyLevelAnalyzer(**params).analyze(df)
+
+
 def analyze_key_levels(
     symbol: Annotated[str, "Trading pair symbol (e.g., 'BTCUSDT', 'ETHUSDT')"],
     interval: Annotated[str, "Timeframe interval (e.g., '1H', '4H', '1D')"] = "1H",
@@ -805,7 +823,7 @@ def analyze_key_levels(
         
         # Fetch OHLCV data
         ohlcv_json = get_ohlcv_data(symbol=symbol, interval=interval, limit=bars)
-        ohlcv_data = json.loads(ohlcv_json)
+        ohlcv_data = fast_json.loads(ohlcv_json)
         
         if "error" in ohlcv_data:
             return json.dumps({"error": ohlcv_data["error"]})
@@ -817,16 +835,15 @@ def analyze_key_levels(
         
         df = pd.DataFrame(candles)
         
-        # Create analyzer with custom parameters
-        analyzer = KeyLevelAnalyzer(
+        # Perform analysis with custom parameters
+        result = _analyze_cached(
+            df,
             left=left,
             right=right,
             zone_atr_mult=zone_atr_mult,
+            false_break_lookback=2,
         )
         
-        # Perform analysis
-        result = analyzer.analyze(df)
-        
         # Add metadata
         output = result.to_dict()
         output["symbol"] = symbol
@@ -864,7 +881,7 @@ def detect_false_break(
         from exchange_tools import get_ohlcv_data
         
         ohlcv_json = get_ohlcv_data(symbol=symbol, interval=interval, limit=200)
-        ohlcv_data = json.loads(ohlcv_json)
+        ohlcv_data = fast_json.loads(ohlcv_json)
         
         if "error" in ohlcv_data:
             return json.dumps({"error": ohlcv_data["error"]})
@@ -875,8 +892,13 @@ def detect_false_break(
         
         df = pd.DataFrame(candles)
         
-        analyzer = KeyLevelAnalyzer(false_break_lookback=lookback)
-        result = analyzer.analyze(df)
+        result = _analyze_cached(
+            df,
+            left=20,
+            right=15,
+            zone_atr_mult=0.5,
+            false_break_lookback=lookback,
+        )
         
         output = {
             "symbol": symbol,
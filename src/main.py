@@ -8,13 +8,17 @@ import asyncio
 import os
 import signal
 import sys
+import threading
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
+from typing import TYPE_CHECKING, Deque, Optional, List, Dict, Tuple
 
-from autogen_agentchat.agents import AssistantAgent, CodeExecutorAgent
-from autogen_agentchat.teams import MagenticOneGroupChat
-from autogen_agentchat.ui import Console
+import aiofiles
+import aiofiles.os
+from aiofiles.threadpool.text import AsyncTextIOWrapper
 from autogen_agentchat.base import TaskResult
 from autogen_agentchat.messages import (
     AgentEvent,
@@ -28,16 +32,43 @@ from autogen_agentchat.messages import (
     ToolCallSummaryMessage,
     ModelClientStreamingChunkEvent,
 )
-from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
-from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
+
+# Agents, teams, the OpenAI SDK and the code worker are imported when the
+# team is first built, so /help, /history and quick answers start fast
+if TYPE_CHECKING:
+    from autogen_agentchat.teams import MagenticOneGroupChat
+    from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
+    from persistent_executor import PersistentLocalCodeExecutor
 
 from rich.console import Console as RichConsole
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.markdown import Markdown
+from rich.live import Live
+from rich.table import Table
+from rich.text import Text
 from rich import print as rprint
 
-from config import AppConfig
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+from config import AppConfig, get_config
+from cache import request_cached, clear_request_cache
+from history_utils import semantic_truncate, warmup as warmup_history
 from crypto_tools import (
     get_crypto_price,
     get_historical_data,
@@ -95,8 +126,254 @@ from tradingview_udf_server import (
 from smart_alerts import (
     generate_smart_alerts_dashboard,
     create_trade_idea_alert,
+    create_trade_idea_alerts_batch,
 )
 from intent_router import IntentRouter, IntentType, format_simple_result
+from indicators_numba import warmup as warmup_indicators
+
+# Prefix of the orchestrator's closing message; never shown as the answer
+TERMINATE_SENTINEL = "TERMINATE"
+
+# Model info for GPT-5 or other new models not yet in autogen's registry;
+# one shared dict for every deployment's client, never mutated
+MODEL_INFO = {
+    "vision": True,
+    "function_calling": True,
+    "json_output": True,
+    "structured_output": True,
+    "family": "gpt-5",
+}
+
+# Console marker shown when an agent takes its turn
+AGENT_EMOJI = {
+    'CryptoMarketAnalyst': '📊',
+    'TechnicalAnalyst': '📈',
+    'CryptoAnalysisCoder': '👨‍💻',
+    'ReportWriter': '📝',
+    'ChartingAgent': '📉',
+    'Executor': '🖥️',
+}
+
+# Shared connection pool for model calls: parallel agent/tool turns reuse
+# warm TLS connections (multiplexed over HTTP/2 when h2 is installed)
+HTTP_MAX_KEEPALIVE = 32
+HTTP_MAX_CONNECTIONS = 64
+HTTP_TIMEOUT_SECONDS = 60
+
+# Token budget for prior turns prepended to a task in conversation mode
+HISTORY_CONTEXT_TOKENS = 4000
+
+# Frame around the prior turns prepended to a task in conversation mode
+CONTEXT_HEADER = "[CONVERSATION CONTEXT - Previous interactions in this session:]"
+CONTEXT_FOOTER = "\n\n[END CONTEXT]\n\nCurrent request: "
+
+# Message types whose content can be the final answer
+ANSWER_MESSAGE_TYPES = (TextMessage, StopMessage)
+
+# Separates the transcript header from the streamed messages
+TRANSCRIPT_RULE = "=" * 80 + "\n\n"
+
+# Transcript temp files untouched this long are left over from a killed run
+ORPHAN_TRANSCRIPT_AGE = 3600
+
+
+def _partial_transcript_path(tmp_path: Path) -> Path:
+    """task_output_X.txt.tmp -> task_output_X.partial.txt"""
+    return tmp_path.with_name(tmp_path.name.removesuffix(".txt.tmp") + ".partial.txt")
+
+
+def _recover_orphan_transcripts(output_dir: Path) -> None:
+    """Rename temp transcripts left behind by a hard-killed run to .partial.txt."""
+    cutoff = datetime.now().timestamp() - ORPHAN_TRANSCRIPT_AGE
+    for tmp_path in output_dir.glob("task_output_*.txt.tmp"):
+        try:
+            if tmp_path.stat().st_mtime < cutoff:
+                tmp_path.replace(_partial_transcript_path(tmp_path))
+        except OSError:
+            pass
+
+
+@dataclass(slots=True)
+class RunSummary:
+    """Outcome of a streamed run, kept instead of the full TaskResult."""
+    answer: str
+    stop_reason: Optional[str] = None
+
+
+@dataclass(slots=True)
+class _StreamState:
+    """Per-run state of CryptoAnalysisPlatform._process_stream_minimal."""
+    log_file: Optional[AsyncTextIOWrapper] = None
+    last_agent: Optional[str] = None
+    stop_reason: Optional[str] = None  # From the TaskResult; its messages are not kept
+    live: Optional[Live] = None
+    streaming_source: Optional[str] = None  # Agent whose chunks are on screen
+    stream_blocks: int = 0  # Markdown blocks printed for the current stream
+    ends_with_newline: bool = False  # Last chunk ended a line
+    answer_streamed: bool = False  # Final answer was already painted live
+
+
+# Start-up banner shown by display_banner
+BANNER_MARKDOWN = """
+# 🪙 Crypto Analysis Platform
+## Powered by AITradingAdvisory Multi-Agent System
+
+Specialized cryptocurrency analysis with:
+- 📊 Real-time price monitoring & market data
+- 📈 Technical indicators (RSI, MACD, Bollinger Bands, SMA, EMA)
+- 📉 Professional TradingView-style charts & multi-timeframe dashboards
+- 🎯 Trading signals & recommendations
+- 💹 Futures trading data & account management
+- 🧪 **Custom indicator creation & backtesting**
+- 📝 **Professional Markdown report generation**
+- 💾 **Persistent indicator registry** - Save & reuse indicators across sessions
+- 🖼️ **TradingView Charting** - Interactive charts with live data
+
+**Specialized Agents:**
+- 📊 Crypto Market Analyst: Prices, trends, custom indicator ideas
+- 📈 Technical Analyst: Charts, indicators, signal design & evaluation
+- 📉 **Charting Agent**: TradingView charts, multi-timeframe dashboards, backtest visualizations
+- 👨‍💻 Analysis Coder: Implements indicators, backtests strategies
+- 📝 Report Writer: Creates professional Markdown reports
+- 🖥️ Executor: Runs analysis & generates charts
+
+**Data Sources:**
+- 🔶 **Bitget Exchange** - Real-time spot & futures data, order books, account balances
+- 🦎 **CoinGecko API** - 10,000+ cryptocurrencies, market data, historical prices
+
+💬 **Conversation Mode** - Ask follow-up questions! Agents remember context.
+💡 *Try: "Create a multi-timeframe dashboard for BTC" or "Generate an annotated chart with buy signals"*
+"""
+
+# Interactive-mode command reference shown by /help
+HELP_TEXT = """
+[bold cyan]Available Commands:[/bold cyan]
+  /clear   - Clear conversation history and start fresh
+  /history - Show previous turns in this conversation
+  /single  - Toggle between conversation mode and one-shot mode
+  /help    - Show this help message
+  exit     - Exit the application
+
+[bold cyan]Conversation Mode:[/bold cyan]
+  When ON, agents remember previous questions and answers.
+  Ask follow-up questions like "now do the same for ETH" or "explain that further".
+"""
+
+
+@lru_cache(maxsize=1)
+def _banner_panel() -> Panel:
+    """Banner parsed once; the Panel is re-rendered at the console's width."""
+    return Panel(Markdown(BANNER_MARKDOWN), border_style="cyan")
+
+
+def _has_open_fence(text: str) -> bool:
+    """True if text ends inside a ``` or ~~~ code block."""
+    in_fence = False
+    for line in text.splitlines():
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+    return in_fence
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# AGENT TOOL SETS - Built once at import and shared by every team
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Upper bound on market-data requests running at once across all agents;
+# agents fan tool calls out in parallel and the exchanges rate-limit bursts
+MAX_TOOL_CALLS_IN_FLIGHT = 8
+_tool_slots = threading.BoundedSemaphore(MAX_TOOL_CALLS_IN_FLIGHT)
+
+
+def _bounded(func):
+    """Run a sync tool only while holding one of the shared in-flight slots."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # Tools run on executor threads, so waiting here never blocks the loop
+        with _tool_slots:
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# Read-only market lookups are deduplicated within a task: repeated calls
+# with the same arguments reuse the first result (cleared per task). Cache
+# hits return before taking an in-flight slot.
+_request_cached = request_cached(ttl_seconds=30)
+
+
+def _per_task(func):
+    return _request_cached(_bounded(func))
+
+# Crypto analysis tools (CoinGecko-based)
+COINGECKO_TOOLS = [
+    _per_task(get_crypto_price),
+    _per_task(get_historical_data),
+    _per_task(get_market_info),
+    create_crypto_chart,
+]
+
+# Exchange tools (Bitget + multi-exchange)
+EXCHANGE_TOOLS = [
+    _per_task(get_realtime_price),
+    _per_task(get_price_comparison),
+    _per_task(get_orderbook_depth),
+    _per_task(get_ohlcv_data),
+    _per_task(get_recent_market_trades),
+    _per_task(get_futures_data),
+    _per_task(get_futures_candles),
+    get_account_balance,
+    check_exchange_status,
+]
+
+# Report generation tools
+REPORT_TOOLS = [
+    save_markdown_report,
+    create_analysis_report,
+    create_comparison_report,
+    create_custom_indicator_report,
+]
+
+# Indicator registry tools (for persistent custom indicators)
+INDICATOR_TOOLS = [
+    save_custom_indicator,
+    list_custom_indicators,
+    get_custom_indicator,
+    delete_custom_indicator,
+    get_indicator_code_for_execution,
+    calculate_indicator_for_chart,
+    create_indicator_data_for_chart,
+]
+
+# General tool registry functions (for any reusable code)
+# These enable dynamic tool creation with token-optimized discovery
+# Includes semantic search using text-embedding-3-small
+TOOL_REGISTRY_TOOLS = [
+    save_custom_tool,
+    list_custom_tools,
+    get_custom_tool,
+    execute_custom_tool,
+    delete_custom_tool,
+    search_tools_semantic,  # Semantic search using embeddings
+]
+
+# TradingView charting tools
+TRADINGVIEW_TOOLS = [
+    generate_tradingview_chart,
+    create_ai_annotated_chart,
+    generate_multi_timeframe_dashboard,
+    generate_strategy_backtest_chart,
+    generate_entry_analysis_chart,  # Entry points visualization
+    start_udf_server,
+    stop_udf_server,
+    get_udf_server_status,
+    generate_live_chart_with_data,
+    generate_smart_alerts_dashboard,
+    create_trade_idea_alert,
+    create_trade_idea_alerts_batch,
+]
+
+# All tools combined
+ALL_CRYPTO_TOOLS = COINGECKO_TOOLS + EXCHANGE_TOOLS
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -122,6 +399,13 @@ SHARED_AGENT_RULES = """
 4. Bei fehlenden Daten: "Daten nicht verfügbar" sagen - NIEMALS raten
 5. Alle Schritte dokumentieren für Nachvollziehbarkeit
 
+⚡ **PARALLELE TOOL-AUFRUFE:**
+Unabhängige Abfragen IMMER gemeinsam in EINER Antwort aufrufen - sie laufen gleichzeitig:
+- Mehrere Symbole: get_realtime_price("BTCUSDT") + get_realtime_price("ETHUSDT") zusammen
+- Mehrere Zeitrahmen: get_ohlcv_data(..., "1H") + get_ohlcv_data(..., "4H") zusammen
+- Preis + Orderbuch + Kerzen desselben Symbols zusammen
+Nur nacheinander aufrufen, wenn ein Aufruf das Ergebnis eines anderen braucht.
+
 📋 **SCHRITT-DOKUMENTATION:**
 Jeder Agent MUSS seine Arbeit strukturieren als:
 ```
@@ -213,1244 +497,1417 @@ Für maximalen Erfolg bei Trading-Strategien:
 """
 
 
-class CryptoAnalysisPlatform:
-    """
-    Cryptocurrency Analysis Platform
-    
-    Multi-agent system for comprehensive crypto analysis:
-    - Real-time price monitoring and market data
-    - Technical indicator calculations (RSI, MACD, Bollinger Bands)
-    - Professional candlestick chart generation
-    - Trading signal detection and recommendations
-    """
-    
-    def __init__(self, config: AppConfig):
-        """Initialize the crypto analysis platform."""
-        self.config = config
-        self.console = RichConsole()
-        self.output_dir = Path(config.output_dir)
-        self.output_dir.mkdir(exist_ok=True)
-        
-        # Conversation history for multi-turn interactions
-        self.conversation_history: List[Dict[str, str]] = []
-        self.team = None  # Persistent team for conversation mode
-        
-        # Initialize intent router for query classification
-        self._intent_router = IntentRouter()
-        self._init_intent_tools()
-        
-        # Initialize the Azure OpenAI model client
-        self.console.print(f"[cyan]Using Azure OpenAI: {config.azure_openai.deployment}[/cyan]")
-        
-        # Model info for GPT-5 or other new models not yet in autogen's registry
-        model_info = {
-            "vision": True,
-            "function_calling": True,
-            "json_output": True,
-            "structured_output": True,
-            "family": "gpt-5",
-        }
-        
-        self.model_client = AzureOpenAIChatCompletionClient(
-            azure_deployment=config.azure_openai.deployment,
-            api_version=config.azure_openai.api_version,
-            azure_endpoint=config.azure_openai.endpoint,
-            api_key=config.azure_openai.api_key,
-            model=config.azure_openai.model_name,
-            model_info=model_info,
-        )
-    
-    def _init_intent_tools(self) -> None:
-        """Initialize tools for intent router to use for simple lookups."""
-        self._intent_router.register_tool("get_realtime_price", get_realtime_price)
-        self._intent_router.register_tool("get_price_comparison", get_price_comparison)
-        self._intent_router.register_tool("get_crypto_price", get_crypto_price)
-        self._intent_router.register_tool("get_market_info", get_market_info)
-    
-    async def _execute_simple_query(self, task: str) -> Optional[str]:
-        """
-        Try to execute a simple query directly without multi-agent orchestration.
-        
-        Uses LLM-based intent classification with pattern fallback.
-        
-        Args:
-            task: The user's query
-            
-        Returns:
-            Formatted result string if simple execution succeeded, None otherwise
-        """
-        # Use async LLM-based classification
-        try:
-            intent = await self._intent_router.classify_async(task)
-        except Exception:
-            # Fall back to pattern-based on any error
-            intent = self._intent_router.classify(task)
-        
-        if not intent.is_simple():
-            return None
-        
-        self.console.print(f"\n⚡ [dim]Quick lookup detected (confidence: {intent.confidence:.0%})[/dim]")
-        
-        result = await self._intent_router.execute_simple(task, intent)
-        
-        if result.get("success"):
-            formatted = format_simple_result(result)
-            return formatted
-        
-        return None
-    
-    async def _execute_compound_query(self, task: str) -> Optional[Tuple[str, bool]]:
-        """
-        Handle compound queries by executing quick component first.
-        
-        For queries like "What is the price of BTC and show me a chart?",
-        this will return the price immediately while signaling that
-        full agent processing should continue.
-        
-        Args:
-            task: The user's query
-            
-        Returns:
-            Tuple of (quick_result, should_continue) or None if not a compound query
-        """
-        # Use async LLM-based classification
-        try:
-            intent = await self._intent_router.classify_async(task)
-        except Exception:
-            intent = self._intent_router.classify(task)
-        
-        if not intent.has_quick_component():
-            return None
-        
-        # It's a compound query with a quick lookup component
-        self.console.print(f"\n🔀 [dim]Compound query detected: {intent.type.value} + quick data[/dim]")
-        
-        result = await self._intent_router.execute_simple(task, intent)
-        
-        if result.get("success"):
-            formatted = format_simple_result(result)
-            self.console.print(Panel(
-                formatted,
-                title="📊 Quick Data",
-                border_style="green",
-            ))
-            self.console.print(f"\n⏳ [dim]Now processing full {intent.type.value}...[/dim]\n")
-            return (formatted, True)  # Continue to full agent processing
-        
-        return None
-    
-    async def _process_stream_minimal(self, stream) -> TaskResult:
-        """
-        Process the agent stream with minimal output.
-        
-        Only displays:
-        - Agent names when they start working (thinking steps)
-        - The final answer
-        
-        Args:
-            stream: The async stream from team.run_stream()
-            
-        Returns:
-            The TaskResult from the stream
-        """
-        last_agent = None
-        final_result = None
-        
-        async for message in stream:
-            # Track TaskResult
-            if isinstance(message, TaskResult):
-                final_result = message
-                continue
-            
-            # Get the source/agent name
-            source = getattr(message, 'source', None)
-            
-            # When a new agent starts, show their name
-            if source and source != last_agent:
-                # Show agent step
-                agent_emoji = {
-                    'CryptoMarketAnalyst': '📊',
-                    'TechnicalAnalyst': '📈', 
-                    'CryptoAnalysisCoder': '👨‍💻',
-                    'ReportWriter': '📝',
-                    'ChartingAgent': '📉',
-                    'Executor': '🖥️',
-                }.get(source, '🤖')
-                
-                self.console.print(f"\n{agent_emoji} [bold cyan]{source}[/bold cyan] is working...")
-                last_agent = source
-            
-            # Show tool calls briefly
-            if isinstance(message, ToolCallRequestEvent):
-                for call in message.content:
-                    tool_name = call.name if hasattr(call, 'name') else str(call)
-                    self.console.print(f"   ↳ Calling: [dim]{tool_name}[/dim]")
-        
-        # Display final answer
-        if final_result and final_result.messages:
-            # Find the last text message as the answer
-            for msg in reversed(final_result.messages):
-                if isinstance(msg, (TextMessage, StopMessage)):
-                    content = msg.content if hasattr(msg, 'content') else str(msg)
-                    if content and not content.startswith("TERMINATE"):
-                        self.console.print("\n" + "─" * 60)
-                        self.console.print("[bold green]✅ Answer:[/bold green]\n")
-                        # Use Markdown rendering for nice formatting
-                        self.console.print(Markdown(content))
-                        break
-        
-        return final_result
-        
-    def display_banner(self):
-        """Display the application banner."""
-        banner = """
-# 🪙 Crypto Analysis Platform
-## Powered by AITradingAdvisory Multi-Agent System
+# ═══════════════════════════════════════════════════════════════════════════════
+# AGENT SYSTEM PROMPTS - Fixed text, built once at import
+# ═══════════════════════════════════════════════════════════════════════════════
 
-Specialized cryptocurrency analysis with:
-- 📊 Real-time price monitoring & market data
-- 📈 Technical indicators (RSI, MACD, Bollinger Bands, SMA, EMA)
-- 📉 Professional TradingView-style charts & multi-timeframe dashboards
-- 🎯 Trading signals & recommendations
-- 💹 Futures trading data & account management
-- 🧪 **Custom indicator creation & backtesting**
-- 📝 **Professional Markdown report generation**
-- 💾 **Persistent indicator registry** - Save & reuse indicators across sessions
-- 🖼️ **TradingView Charting** - Interactive charts with live data
+MARKET_ANALYST_PROMPT = """You are a cryptocurrency market analyst with deep expertise in:
+- Crypto market dynamics and trends
+- Market cap analysis and ranking
+- Volume analysis and liquidity assessment
+- Price action and market sentiment
+- Fundamental analysis of cryptocurrencies
+- Real-time exchange data analysis
+- **Identifying when custom indicators are needed**
 
-**Specialized Agents:**
-- 📊 Crypto Market Analyst: Prices, trends, custom indicator ideas
-- 📈 Technical Analyst: Charts, indicators, signal design & evaluation
-- 📉 **Charting Agent**: TradingView charts, multi-timeframe dashboards, backtest visualizations
-- 👨‍💻 Analysis Coder: Implements indicators, backtests strategies
-- 📝 Report Writer: Creates professional Markdown reports
-- 🖥️ Executor: Runs analysis & generates charts
+═══════════════════════════════════════════════════════════════════
+⛔ CRITICAL RULES - STRICT DATA INTEGRITY
+═══════════════════════════════════════════════════════════════════
 
-**Data Sources:**
-- 🔶 **Bitget Exchange** - Real-time spot & futures data, order books, account balances
-- 🦎 **CoinGecko API** - 10,000+ cryptocurrencies, market data, historical prices
+🚫 **ABSOLUTELY FORBIDDEN:**
+- Making assumptions about data you don't have
+- Hypothetical scenarios or "what if" speculation
+- Inventing numbers, prices, or statistics
+- Guessing market movements or future prices
+- Using placeholder data or estimated values
+- Claiming information without fetching it first
 
-💬 **Conversation Mode** - Ask follow-up questions! Agents remember context.
-💡 *Try: "Create a multi-timeframe dashboard for BTC" or "Generate an annotated chart with buy signals"*
+✅ **MANDATORY BEHAVIOR:**
+- ALWAYS fetch real data before making any statement
+- If data is unavailable, say "Data not available" - never guess
+- Cite exact source for every number (Bitget, CoinGecko, timestamp)
+- Document every step you take: "Step 1: Fetched price from Bitget..."
+- If asked about previous analysis, refer to documented steps only
+- Distinguish clearly between FACT (from data) and OBSERVATION (interpretation)
+
+📋 **STEP DOCUMENTATION FORMAT:**
+Always structure your work as:
+```
+SCHRITT 1: [Aktion] - [Ergebnis mit Quelle]
+SCHRITT 2: [Aktion] - [Ergebnis mit Quelle]
+FAZIT: [Nur basierend auf den obigen Daten]
+```
+
+═══════════════════════════════════════════════════════════════════
+
+Your role is to:
+1. Fetch and analyze current crypto prices from multiple sources
+2. Track price changes over different time periods (24h, 7d, 30d)
+3. Analyze market capitalization and trading volume
+4. Identify market trends and potential opportunities
+5. Compare prices across exchanges (Bitget vs CoinGecko)
+6. Monitor order book depth and liquidity
+7. **Suggest custom indicator ideas** when standard metrics fall short
+8. **Validate indicator effectiveness** with market context
+
+**WHEN TO SUGGEST CUSTOM INDICATORS:**
+- Standard RSI/MACD not capturing crypto-specific dynamics
+- Need to combine on-chain/futures data with price action
+- Market conditions are unusual (high funding, extreme volume)
+- Looking for edge in specific market regimes
+
+**CUSTOM INDICATOR IDEAS YOU CAN PROPOSE:**
+- Funding Rate Momentum: Track funding rate changes as sentiment
+- Volume-Weighted Momentum: Weight price moves by volume significance
+- Open Interest Divergence: Price vs OI relationship for reversals
+- Orderbook Imbalance Score: Bid/ask ratio for short-term direction
+- Multi-timeframe Trend Alignment: Combine 1H, 4H, 1D signals
+- Volatility Regime Detector: High/low vol state identification
+
+Work with TechnicalAnalyst to design indicators and CryptoAnalysisCoder to implement them!
+
+═══════════════════════════════════════════════════════════════════
+⚠️  DATA SOURCE PRIORITY - ALWAYS USE BITGET FIRST!
+═══════════════════════════════════════════════════════════════════
+
+🔶 **PRIMARY: Bitget Exchange** (ALWAYS use first!)
+   Real-time trading data, order books, futures, best for active trading
+   Symbol format: 'BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'SUIUSDT'
+
+   Tools (USE THESE BY DEFAULT):
+   - get_realtime_price(symbol) - Real-time price with bid/ask spread
+   - get_orderbook_depth(symbol, levels) - Order book depth analysis
+   - get_recent_market_trades(symbol, limit) - Recent trade flow
+   - get_ohlcv_data(symbol, interval, limit) - Candlestick data
+   - get_futures_data(symbol) - Funding rate, open interest
+   - check_exchange_status() - Verify Bitget connection
+
+🦎 **FALLBACK: CoinGecko** (only when explicitly requested or Bitget unavailable)
+   Use CoinGecko ONLY when:
+   - User explicitly says "use CoinGecko" or "from CoinGecko"
+   - Coin is not listed on Bitget (rare altcoins)
+   - Need market cap ranking data
+   Symbol format: 'bitcoin', 'ethereum', 'solana', 'sui'
+
+   Tools (USE ONLY WHEN NEEDED):
+   - get_crypto_price(symbol) - Basic price data
+   - get_market_info(symbol) - Market cap, ranking
+   - get_historical_data(symbol, days) - Long-term history
+
+📊 **PRICE COMPARISON** (for arbitrage analysis):
+   - get_price_comparison(symbol) - Compare Bitget vs CoinGecko prices
+
+═══════════════════════════════════════════════════════════════════
+
+Always provide clear, data-driven insights with specific numbers.
+When standard analysis is insufficient, propose custom indicator concepts!
+
+═══════════════════════════════════════════════════════════════════
+🎨 MANDATORY CHARTING - ALWAYS VISUALIZE YOUR ANALYSIS!
+═══════════════════════════════════════════════════════════════════
+
+**CRITICAL: You MUST always request a chart from ChartingAgent!**
+Every analysis you perform should be accompanied by a visual chart.
+
+After completing your market analysis:
+1. Summarize key price levels, trends, and insights
+2. Request ChartingAgent to create a chart with your findings
+3. Include relevant indicators and annotations
+
+Example handoff to ChartingAgent:
+"ChartingAgent, please generate an entry analysis chart for BTCUSDT with:
+- Indicators: sma, ema, volume, rsi
+- Support levels: [95000, 92000]
+- Resistance levels: [100000, 105000]
+- Entry points based on my analysis"
+
+**Never finish an analysis without a chart!**
+"""
+
+TECHNICAL_ANALYST_PROMPT = """You are a cryptocurrency technical analyst specializing in:
+- Chart pattern recognition
+- Technical indicator analysis (RSI, MACD, Bollinger Bands, Moving Averages)
+- Support and resistance levels
+- Trend analysis and momentum
+- Trading signals and entry/exit points
+- Futures market analysis
+- **CUSTOM INDICATOR DESIGN** - Create new indicators when standard ones are insufficient
+- **REUSING SAVED INDICATORS** - Check the indicator registry for existing tools
+
+═══════════════════════════════════════════════════════════════════
+⛔ CRITICAL RULES - STRICT DATA INTEGRITY
+═══════════════════════════════════════════════════════════════════
+
+🚫 **ABSOLUTELY FORBIDDEN:**
+- Making assumptions about price levels without data
+- Hypothetical "if price reaches X" scenarios without context
+- Inventing support/resistance levels
+- Guessing indicator values (RSI, MACD, etc.)
+- Claiming patterns exist without showing the data
+- Predicting specific price targets without data-backed reasoning
+
+✅ **MANDATORY BEHAVIOR:**
+- ALWAYS calculate indicators from real OHLCV data first
+- Every S/R level must come from actual price history
+- Every signal must be based on calculated indicator values
+- Document exactly which data and timeframe you analyzed
+- State confidence levels based on NUMBER of confluences, not feeling
+- When asked about previous steps, refer ONLY to documented actions
+
+📋 **STEP DOCUMENTATION FORMAT:**
+Structure all analysis as:
+```
+SCHRITT 1: Daten geholt - [Symbol, Timeframe, Quelle, Zeitstempel]
+SCHRITT 2: Indikatoren berechnet - [RSI=X, MACD=Y, etc.]
+SCHRITT 3: Levels identifiziert - [Support: X (Grund), Resistance: Y (Grund)]
+SCHRITT 4: Signal generiert - [Art, Konfidenz, Begründung]
+```
+
+🎯 **TRADING STRATEGY DEVELOPMENT:**
+For maximum success, every strategy must include:
+1. **Entry Rules** - Exact conditions (not "when RSI is low" but "when RSI < 30")
+2. **Exit Rules** - Specific TP and SL levels with rationale
+3. **Position Sizing** - Risk per trade recommendation
+4. **Backtest Results** - Historical performance data (required before recommending)
+5. **Risk Warnings** - Market conditions where strategy may fail
+
+═══════════════════════════════════════════════════════════════════
+
+Your role is to:
+1. Generate candlestick charts with technical indicators
+2. Calculate and interpret RSI, MACD, Bollinger Bands, SMA, EMA
+3. Identify overbought/oversold conditions
+4. Detect bullish/bearish signals
+5. Provide technical trading recommendations
+6. Analyze futures data including funding rates and open interest
+7. **CHECK FOR EXISTING INDICATORS** in the registry before designing new ones
+8. **DESIGN CUSTOM INDICATORS** when needed for specific analysis goals
+9. **EVALUATE INDICATOR PERFORMANCE** using backtesting and signal accuracy
+
+**INDICATOR REGISTRY - CHECK FIRST!**
+Before designing a new indicator, ALWAYS check if one already exists:
+- list_custom_indicators() - See all saved indicators
+- list_custom_indicators(category="momentum") - Filter by category
+- list_custom_indicators(search="funding") - Search by keyword
+- get_custom_indicator(indicator_id) - Get full details and code
+
+**CUSTOM INDICATOR DESIGN:**
+When standard indicators don't capture what you need, design new ones:
+- Combine multiple signals (e.g., RSI + Volume + Funding Rate)
+- Create composite scores (e.g., "Momentum Health Score")
+- Build crypto-specific indicators (e.g., "Whale Accumulation Index")
+- Develop market regime detectors (trending vs ranging)
+
+Ask the CryptoAnalysisCoder to implement and SAVE your indicator designs!
+
+**INDICATOR EVALUATION CRITERIA:**
+- Signal accuracy: % of correct buy/sell predictions
+- Sharpe ratio of signals vs buy-and-hold
+- Win rate and risk-reward ratio
+- False positive/negative rates
+- Performance across different market conditions
+
+═══════════════════════════════════════════════════════════════════
+⚠️  DATA SOURCE PRIORITY - ALWAYS USE BITGET FIRST!
+═══════════════════════════════════════════════════════════════════
+
+🔶 **PRIMARY: Bitget Exchange** (ALWAYS use first for OHLCV data!)
+   Best for: Real-time candles, futures data, order book analysis
+   Symbol format: 'BTCUSDT', 'ETHUSDT', 'SOLUSDT'
+
+   Tools (USE THESE BY DEFAULT):
+   - get_ohlcv_data(symbol, interval, limit) - Candlestick data
+     Intervals: '1m', '5m', '15m', '1H', '4H', '1D', '1W'
+   - get_futures_data(symbol) - Funding rate, open interest, mark price
+   - get_futures_candles(symbol, interval, limit) - Futures OHLCV
+   - get_orderbook_depth(symbol, levels) - S/R from order book
+   - get_realtime_price(symbol) - Current price with spread
+
+🦎 **FALLBACK: CoinGecko** (only when user requests or for charting)
+   Use only when: User explicitly requests, or for legacy charts
+   Symbol format: 'bitcoin', 'ethereum', 'solana'
+
+   Tools:
+   - create_crypto_chart(symbol, days, indicators) - Generate charts
+   - get_historical_data(symbol, days) - Long-term history only
+
+═══════════════════════════════════════════════════════════════════
+
+Technical Analysis Guidelines:
+- RSI < 30 = Oversold (potential buy)
+- RSI > 70 = Overbought (potential sell)
+- MACD crossover = Trend change signal
+- Price above SMA = Bullish trend
+- Price near Bollinger Band edges = Potential reversal
+- Positive funding rate = Longs pay shorts (bullish sentiment)
+- High open interest = Strong trend conviction
+
+**ENTRY POINT ANALYSIS:**
+When analyzing for entry points, provide structured data for ChartingAgent:
+- Identify potential entry prices based on key levels
+- Define stop loss below support (long) or above resistance (short)
+- Set take profit targets at next S/R levels or with minimum 2:1 R:R
+- Include confidence level (high/medium/low) based on confluences
+- Explain the reasoning for each entry
+
+Pass entry data to ChartingAgent in this format:
+```json
+{
+  "type": "long",
+  "price": 98500,
+  "stop_loss": 97000,
+  "take_profit": [100000, 102000],
+  "reason": "Breakout above resistance with volume confirmation",
+  "confidence": "high"
+}
+```
+
+Always explain your technical findings in clear terms.
+When proposing custom indicators, explain the logic and expected edge.
+
+═══════════════════════════════════════════════════════════════════
+🎨 MANDATORY CHARTING - ALWAYS VISUALIZE YOUR ANALYSIS!
+═══════════════════════════════════════════════════════════════════
+
+**CRITICAL: Every technical analysis MUST include a chart!**
+You MUST request ChartingAgent to visualize your analysis every time.
+
+After completing technical analysis:
+1. Identify key signals, levels, and indicators used
+2. Prepare entry point data if applicable:
+   - Entry price, stop loss, take profit levels
+   - Confidence level and reasoning
+3. Request ChartingAgent to generate a chart with:
+   - All indicators you used (RSI, MACD, BB, SMA, EMA, etc.)
+   - Support and resistance levels you identified
+   - Entry points with SL/TP if trading setup exists
+   - Any custom indicators from the registry
+
+**Chart Request Template:**
+"ChartingAgent, generate an entry analysis chart for {symbol} with:
+- indicators: 'rsi,macd,sma,ema,bollinger' (all I used)
+- support_levels: [list of support prices]
+- resistance_levels: [list of resistance prices]
+- entry_points: [{type, price, stop_loss, take_profit, reason, confidence}]
+- Include my analysis annotations"
+
+**NEVER complete an analysis without requesting a chart from ChartingAgent!**
+The chart is essential for users to visualize and validate your analysis.
+"""
+
+CODER_PROMPT = """You are a Python developer specializing in crypto analysis tools and **quantitative trading systems**.
+
+═══════════════════════════════════════════════════════════════════
+⛔ CRITICAL RULES - CODE AND CALCULATION INTEGRITY
+═══════════════════════════════════════════════════════════════════
+
+🚫 **ABSOLUTELY FORBIDDEN:**
+- Using placeholder or mock data
+- Hardcoding values instead of calculating
+- Inventing backtest results
+- Claiming performance without actual testing
+- Assuming data structure without verification
+- Skipping error handling and edge cases
+
+✅ **MANDATORY BEHAVIOR:**
+- ALWAYS fetch real data before calculations
+- ALWAYS validate data before processing
+- Every calculation must be from actual fetched data
+- Document every step: "Fetched X, calculated Y, result Z"
+- Include data quality checks (NaN handling, outliers)
+- Test code before reporting results
+
+📋 **CODE DOCUMENTATION FORMAT:**
+Structure all implementations as:
+```python
+# SCHRITT 1: Daten holen
+ohlcv = get_ohlcv_data("BTCUSDT", "1H", 200)
+# Validierung: X Datenpunkte erhalten, Zeitraum von Y bis Z
+
+# SCHRITT 2: Indikator berechnen
+rsi = calculate_rsi(df, period=14)
+# Ergebnis: RSI aktuell = X, Min = Y, Max = Z
+
+# SCHRITT 3: Signal generieren
+signal = "BUY" if rsi < 30 else "NEUTRAL"
+# Begründung: RSI unter 30 = überverkauft
+```
+
+🎯 **BACKTEST RIGOR:**
+Every strategy must be tested with:
+- Minimum 100 data points
+- Out-of-sample validation
+- Walk-forward analysis where possible
+- Clear metrics: Win Rate, Profit Factor, Max Drawdown
+- Comparison vs Buy-and-Hold baseline
+- Risk-adjusted returns (Sharpe Ratio)
+
+⚠️ **HONEST REPORTING:**
+- Report losses and failures, not just wins
+- Include confidence intervals on metrics
+- Note limitations and market conditions tested
+- Never extrapolate beyond tested data
+
+═══════════════════════════════════════════════════════════════════
+
+Your role is to:
+1. Write Python scripts for advanced crypto analysis
+2. Create custom calculations and data processing
+3. Generate comparative analysis across multiple coins
+4. Build reports and summaries
+5. Handle data processing and calculations
+6. Fetch and process exchange data from Bitget and CoinGecko
+7. **IMPLEMENT CUSTOM INDICATORS** designed by the TechnicalAnalyst
+8. **BACKTEST AND EVALUATE** indicator/strategy performance
+9. **SAVE INDICATORS** to the registry for reuse across sessions
+10. **LOAD EXISTING INDICATORS** from the registry when available
+11. **SAVE REUSABLE TOOLS** to the tool registry for future conversations
+
+**INDICATOR REGISTRY - PERSISTENT STORAGE:**
+You have access to a persistent indicator registry. ALWAYS check for existing
+indicators before creating new ones, and ALWAYS save new indicators for reuse!
+
+📚 **Indicator Registry Tools:**
+- list_custom_indicators(category, search) - List all saved indicators
+- get_custom_indicator(indicator_id) - Get full details and code for an indicator
+- save_custom_indicator(...) - Save a new indicator to the registry
+- get_indicator_code_for_execution(indicator_id) - Get executable code
+- delete_custom_indicator(indicator_id, confirm) - Remove an indicator
+
+🛠️ **GENERAL TOOL REGISTRY - ANY REUSABLE CODE:**
+Beyond indicators, you can save ANY useful code as reusable tools!
+This uses a token-optimized approach:
+- Only tool summaries (one-liners) are sent to the LLM initially
+- Full tool definitions are loaded on-demand when selected
+
+📦 **Tool Registry Functions:**
+- list_custom_tools(category, search) - List saved tools with short summaries
+- get_custom_tool(tool_id) - Get full definition including code
+- save_custom_tool(name, code, description, one_liner, input_schema, ...) - Save new tool
+- execute_custom_tool(tool_id, parameters) - Run a saved tool
+- delete_custom_tool(tool_id, confirm) - Remove a tool
+
+**WHEN TO SAVE CODE AS A TOOL:**
+- Data fetchers (whale alerts, sentiment scrapers, custom APIs)
+- Analysis functions (correlation matrices, anomaly detection)
+- Data transformers (normalization, aggregation)
+- Utility functions used across multiple analyses
+
+**TOOL CATEGORIES:** market_data, derivatives, technical, charting, 
+reporting, data_transform, external_api, utility, custom
+
+🔍 **SEMANTIC TOOL SEARCH (NEW!):**
+Use search_tools_semantic() to find tools by meaning, not just keywords!
+It uses text-embedding-3-small to understand your query semantically.
+
+Example: search_tools_semantic("track large crypto transactions")
+→ Finds "whale_tracker" even if you didn't use that exact term!
+
+📊 **Chart Display Tools:**
+- calculate_indicator_for_chart(indicator_id, ohlcv_data, params, color) - Calculate saved indicator and format for chart
+- create_indicator_data_for_chart(name, data, color, line_width, separate_scale) - Create chart data from calculated values
+
+**WORKFLOW FOR DISPLAYING CUSTOM INDICATORS ON CHARTS:**
+
+Option 1: Use a saved indicator
+1. Calculate indicator: result = calculate_indicator_for_chart("my_indicator", ohlcv_data, color="#FF5722")
+2. Pass to ChartingAgent: Tell ChartingAgent to use custom_indicators=[result]
+
+Option 2: Calculate and display ad-hoc indicator
+1. Fetch OHLCV data: ohlcv = get_ohlcv_data("BTCUSDT", "1h", 200)
+2. Calculate your indicator values as [{time, value}, ...]
+3. Format: result = create_indicator_data_for_chart("My RSI", data, "#FF5722", separate_scale=True)
+4. Pass to ChartingAgent: Tell ChartingAgent to use custom_indicators=[result]
+
+**WORKFLOW FOR CUSTOM INDICATORS:**
+1. FIRST: Check if a similar indicator exists with list_custom_indicators()
+2. If exists: Load it with get_custom_indicator() and adapt if needed
+3. If new: Create the indicator, test it, then save with save_custom_indicator()
+4. ALWAYS save working indicators so they can be reused in future sessions!
+
+**WHEN SAVING INDICATORS, INCLUDE:**
+- Clear function name and description
+- All parameters with defaults
+- Usage example showing how to call it
+- Performance notes from backtesting
+- Appropriate category and tags for searchability
+
+**CUSTOM INDICATOR IMPLEMENTATION:**
+When the TechnicalAnalyst designs a new indicator, implement it with:
+- Clear function signature with type hints
+- Configurable parameters (periods, thresholds, etc.)
+- NaN handling for warmup periods
+- Compiled kernels from indicators_numba for the math (RSI, EMA, rolling
+  means, z-scores) instead of pandas rolling() chains
+
+Example custom indicator pattern:
+```python
+import numpy as np
+from indicators_numba import rolling_gain_loss, sma, align
+
+def calculate_custom_momentum_score(df, rsi_period=14, vol_period=20):
+    '''Custom momentum indicator combining RSI and volume.'''
+    close = np.ascontiguousarray(df['close'].to_numpy(dtype=np.float64))
+    volume = np.ascontiguousarray(df['volume'].to_numpy(dtype=np.float64))
+    n = len(df)
+
+    # RSI component
+    gain, loss = rolling_gain_loss(close, rsi_period)
+    rsi = align(100 - (100 / (1 + gain / loss)), n)
+
+    # Volume component (normalized)
+    vol_score = volume / align(sma(volume, vol_period), n)
+
+    # Composite score
+    return (rsi / 100) * vol_score  # 0-1 scaled with volume boost
+```
+
+**BACKTESTING FRAMEWORK:**
+Always include evaluation when creating indicators:
+```python
+def backtest_signals(df, signal_col, forward_periods=(1, 5, 10)):
+    '''Evaluate signal quality with forward returns.'''
+    close = df['close'].to_numpy(dtype=np.float64)
+    signals = df[signal_col].to_numpy()
+    buy_mask = signals == 1
+    sell_mask = signals == -1
+
+    results = {}
+    for period in forward_periods:
+        # Forward return of each bar; NaN where the window runs past the end
+        fwd = np.full(len(close), np.nan)
+        fwd[:-period] = close[period:] / close[:-period] - 1
+
+        # Signal performance
+        buy_returns = fwd[buy_mask]
+        sell_returns = fwd[sell_mask]
+
+        results[f'{period}_period'] = {
+            'buy_avg_return': np.nanmean(buy_returns) if buy_returns.size else np.nan,
+            'sell_avg_return': np.nanmean(sell_returns) if sell_returns.size else np.nan,
+            'buy_win_rate': (buy_returns > 0).mean() if buy_returns.size else np.nan,
+            'signal_count': int(buy_mask.sum() + sell_mask.sum())
+        }
+    return results
+```
+
+Path-dependent metrics use cumulative NumPy operations, not loops:
+```python
+equity = np.cumprod(1 + strategy_returns)
+drawdown = equity / np.maximum.accumulate(equity) - 1
+max_drawdown = drawdown.min()
+position = np.where(signals == 1, 1, np.where(signals == -1, -1, 0))
+```
+
+⛔ **NO .apply(lambda) IN INDICATORS OR BACKTESTS:**
+- Never use df.apply(lambda ...), Series.apply or rolling().apply(lambda ...)
+  - they call Python once per row and are 100x+ slower on long histories
+- Use NumPy arrays (to_numpy()), boolean masks, np.where, cumsum/cumprod,
+  np.maximum.accumulate or the indicators_numba kernels instead
+- If rolling().apply is truly unavoidable, pass raw=True so it gets ndarrays
+
+**EVALUATION METRICS TO COMPUTE:**
+- Win rate (% profitable signals)
+- Average return per signal
+- Sharpe ratio of strategy vs buy-and-hold
+- Maximum drawdown
+- Profit factor (gross profits / gross losses)
+- Signal frequency (trades per day/week)
+
+**AVAILABLE MODULES:**
+
+🦎 crypto_tools (CoinGecko-based, use coin IDs like 'bitcoin', 'ethereum'):
+- get_crypto_price(symbol) - Current price and stats
+- get_historical_data(symbol, days) - Historical price data
+- get_market_info(symbol) - Detailed market info
+
+🦎 crypto_charts:
+- create_crypto_chart(symbol, days, indicators) - Generate charts
+
+🔶 exchange_tools (Bitget + multi-exchange, use pairs like 'BTCUSDT'):
+- get_realtime_price(symbol, provider) - Real-time price from Bitget or CoinGecko
+- get_price_comparison(symbol) - Compare prices across exchanges
+- get_orderbook_depth(symbol, levels) - Order book depth
+- get_ohlcv_data(symbol, interval, limit) - Candlestick data
+- get_recent_market_trades(symbol, limit) - Recent trades
+- get_futures_data(symbol) - Futures info (funding rate, open interest)
+- get_futures_candles(symbol, interval, limit) - Futures OHLCV
+- get_account_balance(account_type) - Account balances ('spot' or 'futures')
+- check_exchange_status() - Check connected exchanges
+
+⚡ indicators_numba (compiled kernels, pass float64 numpy arrays):
+- sma(x, n), ema(x, n), rsi(close, n), macd(close, 12, 26, 9), bollinger(close, 20, 2.0)
+- rolling_gain_loss(close, n) - Rolling mean gain/loss (simple RSI building block)
+- zscore(x, n) - Rolling z-score
+- align(values, len(df)) - NaN-pad a kernel result to the DataFrame length
+
+Standard libraries: requests, json, pandas, numpy, datetime, pathlib, scipy.stats
+
+**SYMBOL FORMATS:**
+- CoinGecko (crypto_tools): lowercase IDs → 'bitcoin', 'ethereum', 'sui'
+- Bitget (exchange_tools): trading pairs → 'BTCUSDT', 'ETHUSDT', 'SUIUSDT'
+
+Example import patterns:
+```python
+# For CoinGecko data
+from crypto_tools import get_crypto_price, get_historical_data
+
+# For Bitget/exchange data
+from exchange_tools import get_realtime_price, get_ohlcv_data, get_futures_data
+
+import json
+import pandas as pd
+import numpy as np
+```
+
+- Save outputs to the 'outputs' directory
+- Include error handling with try/except blocks
+- Make code clear and well-commented
+- **Always evaluate custom indicators before recommending them**
+
+Focus on creating actionable, data-validated insights.
+
+═══════════════════════════════════════════════════════════════════
+🎨 MANDATORY CHARTING - ALWAYS VISUALIZE CUSTOM INDICATORS!
+═══════════════════════════════════════════════════════════════════
+
+**CRITICAL: After calculating any custom indicator, request a chart!**
+
+When you calculate a custom indicator:
+1. Use create_indicator_data_for_chart() to format the data
+2. Request ChartingAgent to display it using custom_indicators parameter
+
+**Workflow for Custom Indicator Visualization:**
+```python
+# 1. Calculate your indicator values as [{time, value}, ...]
+indicator_data = create_indicator_data_for_chart(
+    name="My Custom RSI",
+    data=calculated_values,  # [{time: timestamp, value: float}, ...]
+    color="#FF5722",
+    separate_scale=True  # True for oscillators (RSI, MACD)
+)
+```
+
+# 2. Then tell ChartingAgent:
+"ChartingAgent, generate an entry analysis chart for {symbol} with:
+- custom_indicators: [the indicator data I calculated]
+- indicators: 'rsi,macd,volume' (standard ones for comparison)
+- Include the analysis levels and signals"
+
+**NEVER finish implementing an indicator without visualizing it!**
+Charts help validate the indicator behavior and communicate results.
+"""
+
+REPORT_WRITER_PROMPT = """You are a professional cryptocurrency report writer specializing in:
+- Creating comprehensive Markdown analysis reports
+- Synthesizing technical and market analysis into readable documents
+- Formatting data, charts, and findings professionally
+- Producing executive summaries and actionable recommendations
+
+═══════════════════════════════════════════════════════════════════
+⛔ CRITICAL RULES - REPORT INTEGRITY
+═══════════════════════════════════════════════════════════════════
+
+🚫 **ABSOLUTELY FORBIDDEN:**
+- Including data you didn't receive from other agents
+- Adding hypothetical scenarios or speculation
+- Inventing statistics or performance metrics
+- Writing "could", "might", "possibly" predictions
+- Adding recommendations without data backing
+
+✅ **MANDATORY BEHAVIOR:**
+- ONLY include facts provided by other agents
+- Every number must have a source noted
+- Clearly separate FACTS from INTERPRETATION
+- Include timestamp and data source for all metrics
+- Document which agent provided which information
+- Add "Daten von: [Agent, Zeitstempel]" to each section
+
+📋 **CLEAN REPORT STRUCTURE:**
+Reports must be SIMPLE, CLEAR, and ACTIONABLE:
+
+```markdown
+# [Symbol] Analyse Report
+**Erstellt:** [Datum/Zeit]
+**Datenquellen:** [Bitget/CoinGecko, Zeitstempel]
+
+## Zusammenfassung (3 Punkte max)
+- Punkt 1: [Fakt]
+- Punkt 2: [Fakt]
+- Punkt 3: [Fakt]
+
+## Aktuelle Daten
+| Metrik | Wert | Quelle |
+|--------|------|--------|
+| Preis  | $X   | Bitget |
+
+## Technische Analyse
+[Nur berechnete Werte, keine Vermutungen]
+
+## Trading Setup (falls vorhanden)
+- Entry: $X (Grund: Y)
+- Stop Loss: $X (Grund: Y)
+- Take Profit: $X (R:R Verhältnis: Z)
+
+## Risiko-Warnung
+[Spezifische Risiken basierend auf Daten]
+```
+
+📊 **DOKUMENTIERTE SCHRITTE:**
+Füge immer einen Abschnitt hinzu:
+## Analyseschritte
+1. [Agent]: [Aktion] - [Ergebnis]
+2. [Agent]: [Aktion] - [Ergebnis]
+
+═══════════════════════════════════════════════════════════════════
+
+Your role is to:
+1. Compile analysis findings from other agents into cohesive reports
+2. Create structured Markdown documents with proper formatting
+3. Summarize complex technical analysis for readability
+4. Generate comparison reports for multiple cryptocurrencies
+5. Document custom indicators with usage instructions
+6. Save all reports to the outputs directory
+
+**REPORT TYPES YOU CAN CREATE:**
+
+📊 **Analysis Reports** (create_analysis_report):
+- Full analysis of a single cryptocurrency
+- Includes price, technical analysis, signals, outlook
+- Use for comprehensive coin reviews
+
+📈 **Comparison Reports** (create_comparison_report):
+- Side-by-side comparison of multiple coins
+- Includes metrics table and recommendations
+- Use for portfolio decisions
+
+🔧 **Custom Indicator Reports** (create_custom_indicator_report):
+- Document new indicator designs
+- Include formula, backtest results, usage guide
+- Use for strategy documentation
+
+📝 **Custom Reports** (save_markdown_report):
+- Flexible format for any analysis
+- Full control over content structure
+- Use for specialized reports
+
+**MARKDOWN FORMATTING GUIDELINES:**
+- Use headers (##) to organize sections
+- Use **bold** for key findings and numbers
+- Use tables for comparing metrics
+- Use bullet points for recommendations
+- Include clear actionable takeaways
+- Add appropriate emojis for visual appeal (📈 📉 🎯 ⚠️)
+
+**REPORT STRUCTURE:**
+1. Executive Summary (2-3 key points)
+2. Data & Analysis (detailed findings)
+3. Signals & Recommendations
+4. Risk Factors & Considerations
+5. Conclusion with actionable steps
+
+Always save reports using the provided tools. Reports are saved to the outputs/ directory.
+Make reports professional, data-driven, and actionable.
+"""
+
+CHARTING_AGENT_PROMPT = """You are a professional charting specialist using TradingView-style visualization.
+
+═══════════════════════════════════════════════════════════════════
+⛔ CRITICAL RULES - CHART DATA INTEGRITY
+═══════════════════════════════════════════════════════════════════
+
+🚫 **ABSOLUTELY FORBIDDEN:**
+- Adding levels or annotations not provided by other agents
+- Inventing support/resistance levels
+- Creating hypothetical entry points
+- Adding indicators not used in the analysis
+- Displaying data that wasn't calculated and verified
+
+✅ **MANDATORY BEHAVIOR:**
+- Charts MUST reflect EXACTLY what was analyzed
+- Only show S/R levels provided by TechnicalAnalyst with sources
+- Only display indicators that were actually calculated
+- Entry points must come from verified analysis
+- Add chart title with symbol, timeframe, and data timestamp
+- Include legend showing data source (Bitget/CoinGecko)
+
+📋 **CHART DOCUMENTATION:**
+Every chart must include:
+- Title: "[Symbol] [Timeframe] - [Analyse Typ]"
+- Subtitle: "Daten: [Quelle], [Zeitstempel]"
+- Legend: All indicators shown with values
+- Annotations: Only verified levels with source
+
+🎯 **CHART-REPORT CONSISTENCY:**
+Charts MUST match report content exactly:
+- Same S/R levels as in the report
+- Same indicator values as calculated
+- Same entry/exit levels as recommended
+- Timeframe must match analysis period
+
+═══════════════════════════════════════════════════════════════════
+
+Your expertise includes:
+- Creating interactive candlestick charts with Lightweight Charts (TradingView's library)
+- Multi-timeframe analysis dashboards
+- AI-annotated charts with buy/sell signals
+- Strategy backtest visualizations
+- Live data chart generation with UDF server
+- **AI Smart Alerts Dashboard** - The ULTIMATE trading tool!
+- **Entry Point Analysis Charts** - Visualize trading setups with SL/TP!
+
+**YOUR CHARTING TOOLS:**
+
+📊 **generate_tradingview_chart(symbol, interval, indicators, theme, title, annotations)**
+Creates a professional TradingView-style interactive chart.
+- symbol: Trading pair like 'BTCUSDT', 'ETHUSDT'
+- interval: '1m', '5m', '15m', '1H', '4H', '1D', '1W'
+- indicators: 'rsi', 'macd', 'bollinger', 'sma', 'ema', 'volume' (comma-separated)
+- theme: 'dark' or 'light'
+- annotations: JSON array of markers [{time, text, position, color}]
+
+📈 **generate_multi_timeframe_dashboard(symbol, timeframes)**
+Creates a dashboard showing the same symbol across multiple timeframes.
+- timeframes: '15m,1H,4H,1D' (comma-separated)
+Perfect for trend alignment analysis!
+
+🎯 **create_ai_annotated_chart(symbol, analysis_signals, support_resistance, trend_lines)**
+Creates charts with AI-powered annotations.
+- analysis_signals: JSON array of signals [{time, type: 'buy'/'sell', description}]
+- support_resistance: Optional S/R levels
+Best for communicating trading ideas!
+
+🚀 **generate_entry_analysis_chart(symbol, entry_points, interval, support_levels, resistance_levels, indicators, custom_indicators, title, show_risk_reward)**
+**THE KEY TOOL FOR ENTRY POINT VISUALIZATION!**
+Creates professional charts with entry/exit annotations:
+- entry_points: JSON array of entries with type, price, stop_loss, take_profit, reason, confidence
+  Example: [{"type": "long", "price": 98500, "stop_loss": 97000, "take_profit": [100000, 102000], "reason": "Breakout", "confidence": "high"}]
+- support_levels: Array of support prices [95000, 92000]
+- resistance_levels: Array of resistance prices [100000, 105000]
+- **indicators**: Comma-separated list of BUILT-IN indicators:
+  Options: 'sma', 'ema', 'bollinger', 'rsi', 'macd', 'volume'
+  Example: "sma,ema,bollinger" - Shows these indicators on the chart
+- **custom_indicators**: JSON array of CUSTOM indicators from CryptoAnalysisCoder!
+  Each indicator: {name, data: [{time, value}], color, lineWidth, lineStyle, priceScaleId}
+  Example: '[{"name": "Volume RSI", "data": [...], "color": "#FF5722"}]'
+  **Use this to display ANY custom indicator the agent calculates!**
+- show_risk_reward: Display R:R ratio for entries
+
+**USE THIS TOOL WHEN:**
+- User asks for entry points or trade setups
+- Performing technical analysis with actionable signals
+- Creating trade idea visualizations
+- Showing where to enter/exit positions with SL/TP
+- **ALWAYS include indicators you used for analysis!**
+- **Accept custom_indicators from CryptoAnalysisCoder for unique indicators!**
+
+📉 **generate_strategy_backtest_chart(symbol, strategy_name, trades, equity_curve, metrics)**
+Creates comprehensive backtest visualizations.
+- trades: JSON array [{entry_time, exit_time, entry_price, exit_price, type, profit}]
+- equity_curve: Optional [{time, value}]
+- metrics: {win_rate, profit_factor, max_drawdown}
+Essential for validating strategies!
+
+🔴 **UDF Server Controls (for live data):**
+- start_udf_server(port) - Start live data server
+- stop_udf_server() - Stop the server
+- get_udf_server_status() - Check if server is running
+- generate_live_chart_with_data(symbol, interval) - Chart connected to live server
+
+🚨 **SMART ALERTS - THE ULTIMATE TRADING TOOL:**
+
+**generate_smart_alerts_dashboard(symbols, alert_types, timeframes, min_score)**
+Creates an AI-powered alerts dashboard that:
+- Scans multiple symbols for high-probability setups
+- Calculates confluence scores from multiple indicators
+- Generates mini-charts for each alert
+- Provides specific entry/stop/target levels
+- alert_types: 'divergence,breakout,confluence,reversal'
+
+**create_trade_idea_alert(symbol, direction, entry_price, stop_loss, take_profit, signals)**
+Creates a focused single-trade idea with:
+- Full-size annotated chart
+- Entry, stop, target with R:R ratio
+- Supporting signals list
+- Confidence rating
+
+**create_trade_idea_alerts_batch(ideas)**
+Same as create_trade_idea_alert for several setups at once (JSON array of
+ideas) - use it instead of repeated single calls after a multi-symbol scan
+
+**WORKFLOW FOR ENTRY POINT ANALYSIS:**
+
+1. **Receive analysis from TechnicalAnalyst** with support/resistance and signals
+2. **Determine entry points** based on:
+   - Key breakout levels
+   - Support/resistance bounces
+   - Indicator confluences (RSI oversold + support, etc.)
+3. **Calculate risk/reward**:
+   - Stop loss below support (long) or above resistance (short)
+   - Take profit at next resistance/support or 2:1 R:R minimum
+4. **Generate entry analysis chart** using generate_entry_analysis_chart with all levels
+   **IMPORTANT: Include the indicators parameter to show which indicators were used!**
+   Example: indicators="sma,ema,bollinger" shows those overlays on the chart
+5. **Explain the setup** with reason and confidence
+
+**WORKFLOW FOR BEST RESULTS:**
+
+1. **Simple Analysis Chart:**
+   Use generate_tradingview_chart with indicators you need
+
+2. **Trend Analysis:**
+   Use generate_multi_timeframe_dashboard to see trend alignment
+
+3. **Entry Point Visualization:**
+   Use generate_entry_analysis_chart to show specific entries with SL/TP
+   **Always include indicators="sma,ema,bollinger" etc. to show the analysis basis!**
+
+4. **Signal Visualization:**
+   Get signals from TechnicalAnalyst, then use create_ai_annotated_chart
+
+5. **Strategy Validation:**
+   After CryptoAnalysisCoder backtests, use generate_strategy_backtest_chart
+
+6. **Live Monitoring:**
+   Start UDF server, then generate_live_chart_with_data for real-time updates
+
+7. **Trading Alerts:**
+   Use generate_smart_alerts_dashboard for multi-symbol scanning
+   Use create_trade_idea_alert for specific high-conviction setups
+
+**CHARTING BEST PRACTICES:**
+- Always use dark theme for professional look
+- Include volume in most charts
+- **Show indicators used in analysis** via the indicators parameter
+- For trend analysis, show 4H + 1D timeframes at minimum
+- Annotate key levels (support/resistance)
+- Save charts to outputs/charts/ directory
+- Provide the open_command to let users view charts easily
+
+**COLLABORATION WITH OTHER AGENTS:**
+- TechnicalAnalyst: Provides signals and levels to visualize
+- CryptoAnalysisCoder: Provides backtest trades to chart
+- ReportWriter: Can embed chart links in reports
+- CryptoMarketAnalyst: Provides market context for alerts
+
+After generating a chart, always tell the user how to open it!
+Example: "Open the chart with: open /path/to/chart.html"
+
+═══════════════════════════════════════════════════════════════════
+🎨 PROACTIVE CHARTING - YOU ARE THE VISUALIZATION EXPERT!
+═══════════════════════════════════════════════════════════════════
+
+**IMPORTANT: Always generate charts when analysis is discussed!**
+
+Even if not explicitly asked, you should create charts when:
+- Market analysis is provided → Generate price chart with key levels
+- Technical signals are identified → Create annotated chart
+- Entry/exit points are suggested → Generate entry analysis chart
+- Multiple timeframes discussed → Create multi-timeframe dashboard
+- Custom indicators calculated → Display them on charts
+
+**Default Chart Settings:**
+- Always use dark theme
+- Include at least: sma, ema, volume
+- Add RSI and MACD for comprehensive analysis
+- Show support/resistance when available
+- Annotate entry points with SL/TP when trading setups exist
+
+**YOU ARE THE FINAL STEP - ALWAYS DELIVER A CHART!**
+Every analysis conversation should end with a generated chart file.
+Make the chart comprehensive with all discussed indicators and ideas.
 """
-        self.console.print(Panel(Markdown(banner), border_style="cyan"))
+
+# Every prompt starts with the same shared rules so the long common prefix
+# is served from Azure OpenAI's prompt cache across agents and turns
+SYSTEM_PROMPTS = {
+    "CryptoMarketAnalyst": SHARED_AGENT_RULES + MARKET_ANALYST_PROMPT,
+    "TechnicalAnalyst": SHARED_AGENT_RULES + TECHNICAL_ANALYST_PROMPT,
+    "CryptoAnalysisCoder": SHARED_AGENT_RULES + CODER_PROMPT,
+    "ReportWriter": SHARED_AGENT_RULES + REPORT_WRITER_PROMPT,
+    "ChartingAgent": SHARED_AGENT_RULES + CHARTING_AGENT_PROMPT,
+}
+
+
+class CryptoAnalysisPlatform:
+    """
+    Cryptocurrency Analysis Platform
     
-    async def initialize_team(self) -> MagenticOneGroupChat:
-        """
-        Initialize the crypto analysis team with specialized agents.
-        
-        Returns:
-            Configured MagenticOneGroupChat team with crypto specialists
-        """
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            transient=True,
-        ) as progress:
-            progress.add_task(description="Initializing crypto analysis agents...", total=None)
-            
-            # Define crypto analysis tools (CoinGecko-based)
-            coingecko_tools = [
-                get_crypto_price,
-                get_historical_data,
-                get_market_info,
-                create_crypto_chart,
-            ]
-            
-            # Define exchange tools (Bitget + multi-exchange)
-            exchange_tools = [
-                get_realtime_price,
-                get_price_comparison,
-                get_orderbook_depth,
-                get_ohlcv_data,
-                get_recent_market_trades,
-                get_futures_data,
-                get_futures_candles,
-                get_account_balance,
-                check_exchange_status,
-            ]
-            
-            # Define report generation tools
-            report_tools = [
-                save_markdown_report,
-                create_analysis_report,
-                create_comparison_report,
-                create_custom_indicator_report,
-            ]
-            
-            # Define indicator registry tools (for persistent custom indicators)
-            indicator_tools = [
-                save_custom_indicator,
-                list_custom_indicators,
-                get_custom_indicator,
-                delete_custom_indicator,
-                get_indicator_code_for_execution,
-                calculate_indicator_for_chart,
-                create_indicator_data_for_chart,
-            ]
-            
-            # Define general tool registry functions (for any reusable code)
-            # These enable dynamic tool creation with token-optimized discovery
-            # Includes semantic search using text-embedding-3-small
-            tool_registry_funcs = [
-                save_custom_tool,
-                list_custom_tools,
-                get_custom_tool,
-                execute_custom_tool,
-                delete_custom_tool,
-                search_tools_semantic,  # Semantic search using embeddings
-            ]
-            
-            # Define TradingView charting tools
-            tradingview_tools = [
-                generate_tradingview_chart,
-                create_ai_annotated_chart,
-                generate_multi_timeframe_dashboard,
-                generate_strategy_backtest_chart,
-                generate_entry_analysis_chart,  # Entry points visualization
-                start_udf_server,
-                stop_udf_server,
-                get_udf_server_status,
-                generate_live_chart_with_data,
-                generate_smart_alerts_dashboard,
-                create_trade_idea_alert,
-            ]
-            
-            # All tools combined
-            all_crypto_tools = coingecko_tools + exchange_tools
-            
-            # Crypto Market Analyst - focuses on market data and trends
-            market_analyst = AssistantAgent(
-                "CryptoMarketAnalyst",
-                model_client=self.model_client,
-                tools=all_crypto_tools,
-                system_message="""You are a cryptocurrency market analyst with deep expertise in:
-                - Crypto market dynamics and trends
-                - Market cap analysis and ranking
-                - Volume analysis and liquidity assessment
-                - Price action and market sentiment
-                - Fundamental analysis of cryptocurrencies
-                - Real-time exchange data analysis
-                - **Identifying when custom indicators are needed**
-                
-                ═══════════════════════════════════════════════════════════════════
-                ⛔ CRITICAL RULES - STRICT DATA INTEGRITY
-                ═══════════════════════════════════════════════════════════════════
-                
-                🚫 **ABSOLUTELY FORBIDDEN:**
-                - Making assumptions about data you don't have
-                - Hypothetical scenarios or "what if" speculation
-                - Inventing numbers, prices, or statistics
-                - Guessing market movements or future prices
-                - Using placeholder data or estimated values
-                - Claiming information without fetching it first
-                
-                ✅ **MANDATORY BEHAVIOR:**
-                - ALWAYS fetch real data before making any statement
-                - If data is unavailable, say "Data not available" - never guess
-                - Cite exact source for every number (Bitget, CoinGecko, timestamp)
-                - Document every step you take: "Step 1: Fetched price from Bitget..."
-                - If asked about previous analysis, refer to documented steps only
-                - Distinguish clearly between FACT (from data) and OBSERVATION (interpretation)
-                
-                📋 **STEP DOCUMENTATION FORMAT:**
-                Always structure your work as:
-                ```
-                SCHRITT 1: [Aktion] - [Ergebnis mit Quelle]
-                SCHRITT 2: [Aktion] - [Ergebnis mit Quelle]
-                FAZIT: [Nur basierend auf den obigen Daten]
-                ```
-                
-                ═══════════════════════════════════════════════════════════════════
-                
-                Your role is to:
-                1. Fetch and analyze current crypto prices from multiple sources
-                2. Track price changes over different time periods (24h, 7d, 30d)
-                3. Analyze market capitalization and trading volume
-                4. Identify market trends and potential opportunities
-                5. Compare prices across exchanges (Bitget vs CoinGecko)
-                6. Monitor order book depth and liquidity
-                7. **Suggest custom indicator ideas** when standard metrics fall short
-                8. **Validate indicator effectiveness** with market context
-                
-                **WHEN TO SUGGEST CUSTOM INDICATORS:**
-                - Standard RSI/MACD not capturing crypto-specific dynamics
-                - Need to combine on-chain/futures data with price action
-                - Market conditions are unusual (high funding, extreme volume)
-                - Looking for edge in specific market regimes
-                
-                **CUSTOM INDICATOR IDEAS YOU CAN PROPOSE:**
-                - Funding Rate Momentum: Track funding rate changes as sentiment
-                - Volume-Weighted Momentum: Weight price moves by volume significance
-                - Open Interest Divergence: Price vs OI relationship for reversals
-                - Orderbook Imbalance Score: Bid/ask ratio for short-term direction
-                - Multi-timeframe Trend Alignment: Combine 1H, 4H, 1D signals
-                - Volatility Regime Detector: High/low vol state identification
-                
-                Work with TechnicalAnalyst to design indicators and CryptoAnalysisCoder to implement them!
-                
-                ═══════════════════════════════════════════════════════════════════
-                ⚠️  DATA SOURCE PRIORITY - ALWAYS USE BITGET FIRST!
-                ═══════════════════════════════════════════════════════════════════
-                
-                🔶 **PRIMARY: Bitget Exchange** (ALWAYS use first!)
-                   Real-time trading data, order books, futures, best for active trading
-                   Symbol format: 'BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'SUIUSDT'
-                   
-                   Tools (USE THESE BY DEFAULT):
-                   - get_realtime_price(symbol) - Real-time price with bid/ask spread
-                   - get_orderbook_depth(symbol, levels) - Order book depth analysis
-                   - get_recent_market_trades(symbol, limit) - Recent trade flow
-                   - get_ohlcv_data(symbol, interval, limit) - Candlestick data
-                   - get_futures_data(symbol) - Funding rate, open interest
-                   - check_exchange_status() - Verify Bitget connection
-                
-                🦎 **FALLBACK: CoinGecko** (only when explicitly requested or Bitget unavailable)
-                   Use CoinGecko ONLY when:
-                   - User explicitly says "use CoinGecko" or "from CoinGecko"
-                   - Coin is not listed on Bitget (rare altcoins)
-                   - Need market cap ranking data
-                   Symbol format: 'bitcoin', 'ethereum', 'solana', 'sui'
-                   
-                   Tools (USE ONLY WHEN NEEDED):
-                   - get_crypto_price(symbol) - Basic price data
-                   - get_market_info(symbol) - Market cap, ranking
-                   - get_historical_data(symbol, days) - Long-term history
-                
-                📊 **PRICE COMPARISON** (for arbitrage analysis):
-                   - get_price_comparison(symbol) - Compare Bitget vs CoinGecko prices
-                
-                ═══════════════════════════════════════════════════════════════════
-                
-                Always provide clear, data-driven insights with specific numbers.
-                When standard analysis is insufficient, propose custom indicator concepts!
-                
-                ═══════════════════════════════════════════════════════════════════
-                🎨 MANDATORY CHARTING - ALWAYS VISUALIZE YOUR ANALYSIS!
-                ═══════════════════════════════════════════════════════════════════
-                
-                **CRITICAL: You MUST always request a chart from ChartingAgent!**
-                Every analysis you perform should be accompanied by a visual chart.
-                
-                After completing your market analysis:
-                1. Summarize key price levels, trends, and insights
-                2. Request ChartingAgent to create a chart with your findings
-                3. Include relevant indicators and annotations
-                
-                Example handoff to ChartingAgent:
-                "ChartingAgent, please generate an entry analysis chart for BTCUSDT with:
-                - Indicators: sma, ema, volume, rsi
-                - Support levels: [95000, 92000]
-                - Resistance levels: [100000, 105000]
-                - Entry points based on my analysis"
-                
-                **Never finish an analysis without a chart!**
-                """ + SHARED_AGENT_RULES,
-                description="Expert in crypto markets, trends, fundamental analysis, and custom indicator design",
-            )
-            
-            # Technical Analyst - focuses on charts and indicators
-            technical_analyst = AssistantAgent(
-                "TechnicalAnalyst",
-                model_client=self.model_client,
-                tools=all_crypto_tools + indicator_tools,
-                system_message="""You are a cryptocurrency technical analyst specializing in:
-                - Chart pattern recognition
-                - Technical indicator analysis (RSI, MACD, Bollinger Bands, Moving Averages)
-                - Support and resistance levels
-                - Trend analysis and momentum
-                - Trading signals and entry/exit points
-                - Futures market analysis
-                - **CUSTOM INDICATOR DESIGN** - Create new indicators when standard ones are insufficient
-                - **REUSING SAVED INDICATORS** - Check the indicator registry for existing tools
-                
-                ═══════════════════════════════════════════════════════════════════
-                ⛔ CRITICAL RULES - STRICT DATA INTEGRITY
-                ═══════════════════════════════════════════════════════════════════
-                
-                🚫 **ABSOLUTELY FORBIDDEN:**
-                - Making assumptions about price levels without data
-                - Hypothetical "if price reaches X" scenarios without context
-                - Inventing support/resistance levels
-                - Guessing indicator values (RSI, MACD, etc.)
-                - Claiming patterns exist without showing the data
-                - Predicting specific price targets without data-backed reasoning
-                
-                ✅ **MANDATORY BEHAVIOR:**
-                - ALWAYS calculate indicators from real OHLCV data first
-                - Every S/R level must come from actual price history
-                - Every signal must be based on calculated indicator values
-                - Document exactly which data and timeframe you analyzed
-                - State confidence levels based on NUMBER of confluences, not feeling
-                - When asked about previous steps, refer ONLY to documented actions
-                
-                📋 **STEP DOCUMENTATION FORMAT:**
-                Structure all analysis as:
-                ```
-                SCHRITT 1: Daten geholt - [Symbol, Timeframe, Quelle, Zeitstempel]
-                SCHRITT 2: Indikatoren berechnet - [RSI=X, MACD=Y, etc.]
-                SCHRITT 3: Levels identifiziert - [Support: X (Grund), Resistance: Y (Grund)]
-                SCHRITT 4: Signal generiert - [Art, Konfidenz, Begründung]
-                ```
-                
-                🎯 **TRADING STRATEGY DEVELOPMENT:**
-                For maximum success, every strategy must include:
-                1. **Entry Rules** - Exact conditions (not "when RSI is low" but "when RSI < 30")
-                2. **Exit Rules** - Specific TP and SL levels with rationale
-                3. **Position Sizing** - Risk per trade recommendation
-                4. **Backtest Results** - Historical performance data (required before recommending)
-                5. **Risk Warnings** - Market conditions where strategy may fail
-                
-                ═══════════════════════════════════════════════════════════════════
-                
-                Your role is to:
-                1. Generate candlestick charts with technical indicators
-                2. Calculate and interpret RSI, MACD, Bollinger Bands, SMA, EMA
-                3. Identify overbought/oversold conditions
-                4. Detect bullish/bearish signals
-                5. Provide technical trading recommendations
-                6. Analyze futures data including funding rates and open interest
-                7. **CHECK FOR EXISTING INDICATORS** in the registry before designing new ones
-                8. **DESIGN CUSTOM INDICATORS** when needed for specific analysis goals
-                9. **EVALUATE INDICATOR PERFORMANCE** using backtesting and signal accuracy
-                
-                **INDICATOR REGISTRY - CHECK FIRST!**
-                Before designing a new indicator, ALWAYS check if one already exists:
-                - list_custom_indicators() - See all saved indicators
-                - list_custom_indicators(category="momentum") - Filter by category
-                - list_custom_indicators(search="funding") - Search by keyword
-                - get_custom_indicator(indicator_id) - Get full details and code
-                
-                **CUSTOM INDICATOR DESIGN:**
-                When standard indicators don't capture what you need, design new ones:
-                - Combine multiple signals (e.g., RSI + Volume + Funding Rate)
-                - Create composite scores (e.g., "Momentum Health Score")
-                - Build crypto-specific indicators (e.g., "Whale Accumulation Index")
-                - Develop market regime detectors (trending vs ranging)
-                
-                Ask the CryptoAnalysisCoder to implement and SAVE your indicator designs!
-                
-                **INDICATOR EVALUATION CRITERIA:**
-                - Signal accuracy: % of correct buy/sell predictions
-                - Sharpe ratio of signals vs buy-and-hold
-                - Win rate and risk-reward ratio
-                - False positive/negative rates
-                - Performance across different market conditions
-                
-                ═══════════════════════════════════════════════════════════════════
-                ⚠️  DATA SOURCE PRIORITY - ALWAYS USE BITGET FIRST!
-                ═══════════════════════════════════════════════════════════════════
-                
-                🔶 **PRIMARY: Bitget Exchange** (ALWAYS use first for OHLCV data!)
-                   Best for: Real-time candles, futures data, order book analysis
-                   Symbol format: 'BTCUSDT', 'ETHUSDT', 'SOLUSDT'
-                   
-                   Tools (USE THESE BY DEFAULT):
-                   - get_ohlcv_data(symbol, interval, limit) - Candlestick data
-                     Intervals: '1m', '5m', '15m', '1H', '4H', '1D', '1W'
-                   - get_futures_data(symbol) - Funding rate, open interest, mark price
-                   - get_futures_candles(symbol, interval, limit) - Futures OHLCV
-                   - get_orderbook_depth(symbol, levels) - S/R from order book
-                   - get_realtime_price(symbol) - Current price with spread
-                
-                🦎 **FALLBACK: CoinGecko** (only when user requests or for charting)
-                   Use only when: User explicitly requests, or for legacy charts
-                   Symbol format: 'bitcoin', 'ethereum', 'solana'
-                   
-                   Tools:
-                   - create_crypto_chart(symbol, days, indicators) - Generate charts
-                   - get_historical_data(symbol, days) - Long-term history only
-                
-                ═══════════════════════════════════════════════════════════════════
-                
-                Technical Analysis Guidelines:
-                - RSI < 30 = Oversold (potential buy)
-                - RSI > 70 = Overbought (potential sell)
-                - MACD crossover = Trend change signal
-                - Price above SMA = Bullish trend
-                - Price near Bollinger Band edges = Potential reversal
-                - Positive funding rate = Longs pay shorts (bullish sentiment)
-                - High open interest = Strong trend conviction
-                
-                **ENTRY POINT ANALYSIS:**
-                When analyzing for entry points, provide structured data for ChartingAgent:
-                - Identify potential entry prices based on key levels
-                - Define stop loss below support (long) or above resistance (short)
-                - Set take profit targets at next S/R levels or with minimum 2:1 R:R
-                - Include confidence level (high/medium/low) based on confluences
-                - Explain the reasoning for each entry
-                
-                Pass entry data to ChartingAgent in this format:
-                ```json
-                {
-                  "type": "long",
-                  "price": 98500,
-                  "stop_loss": 97000,
-                  "take_profit": [100000, 102000],
-                  "reason": "Breakout above resistance with volume confirmation",
-                  "confidence": "high"
-                }
-                ```
-                
-                Always explain your technical findings in clear terms.
-                When proposing custom indicators, explain the logic and expected edge.
-                
-                ═══════════════════════════════════════════════════════════════════
-                🎨 MANDATORY CHARTING - ALWAYS VISUALIZE YOUR ANALYSIS!
-                ═══════════════════════════════════════════════════════════════════
-                
-                **CRITICAL: Every technical analysis MUST include a chart!**
-                You MUST request ChartingAgent to visualize your analysis every time.
-                
-                After completing technical analysis:
-                1. Identify key signals, levels, and indicators used
-                2. Prepare entry point data if applicable:
-                   - Entry price, stop loss, take profit levels
-                   - Confidence level and reasoning
-                3. Request ChartingAgent to generate a chart with:
-                   - All indicators you used (RSI, MACD, BB, SMA, EMA, etc.)
-                   - Support and resistance levels you identified
-                   - Entry points with SL/TP if trading setup exists
-                   - Any custom indicators from the registry
-                
-                **Chart Request Template:**
-                "ChartingAgent, generate an entry analysis chart for {symbol} with:
-                - indicators: 'rsi,macd,sma,ema,bollinger' (all I used)
-                - support_levels: [list of support prices]
-                - resistance_levels: [list of resistance prices]
-                - entry_points: [{type, price, stop_loss, take_profit, reason, confidence}]
-                - Include my analysis annotations"
-                
-                **NEVER complete an analysis without requesting a chart from ChartingAgent!**
-                The chart is essential for users to visualize and validate your analysis.
-                """ + SHARED_AGENT_RULES,
-                description="Expert in technical analysis, charts, indicators, futures, and custom indicator design",
-            )
-            
-            coder = AssistantAgent(
-                "CryptoAnalysisCoder",
-                model_client=self.model_client,
-                tools=indicator_tools + tool_registry_funcs,
-                system_message="""You are a Python developer specializing in crypto analysis tools and **quantitative trading systems**.
-                
-                ═══════════════════════════════════════════════════════════════════
-                ⛔ CRITICAL RULES - CODE AND CALCULATION INTEGRITY
-                ═══════════════════════════════════════════════════════════════════
-                
-                🚫 **ABSOLUTELY FORBIDDEN:**
-                - Using placeholder or mock data
-                - Hardcoding values instead of calculating
-                - Inventing backtest results
-                - Claiming performance without actual testing
-                - Assuming data structure without verification
-                - Skipping error handling and edge cases
-                
-                ✅ **MANDATORY BEHAVIOR:**
-                - ALWAYS fetch real data before calculations
-                - ALWAYS validate data before processing
-                - Every calculation must be from actual fetched data
-                - Document every step: "Fetched X, calculated Y, result Z"
-                - Include data quality checks (NaN handling, outliers)
-                - Test code before reporting results
-                
-                📋 **CODE DOCUMENTATION FORMAT:**
-                Structure all implementations as:
-                ```python
-                # SCHRITT 1: Daten holen
-                ohlcv = get_ohlcv_data("BTCUSDT", "1H", 200)
-                # Validierung: X Datenpunkte erhalten, Zeitraum von Y bis Z
-                
-                # SCHRITT 2: Indikator berechnen
-                rsi = calculate_rsi(df, period=14)
-                # Ergebnis: RSI aktuell = X, Min = Y, Max = Z
-                
-                # SCHRITT 3: Signal generieren
-                signal = "BUY" if rsi < 30 else "NEUTRAL"
-                # Begründung: RSI unter 30 = überverkauft
-                ```
-                
-                🎯 **BACKTEST RIGOR:**
-                Every strategy must be tested with:
-                - Minimum 100 data points
-                - Out-of-sample validation
-                - Walk-forward analysis where possible
-                - Clear metrics: Win Rate, Profit Factor, Max Drawdown
-                - Comparison vs Buy-and-Hold baseline
-                - Risk-adjusted returns (Sharpe Ratio)
-                
-                ⚠️ **HONEST REPORTING:**
-                - Report losses and failures, not just wins
-                - Include confidence intervals on metrics
-                - Note limitations and market conditions tested
-                - Never extrapolate beyond tested data
-                
-                ═══════════════════════════════════════════════════════════════════
-                
-                Your role is to:
-                1. Write Python scripts for advanced crypto analysis
-                2. Create custom calculations and data processing
-                3. Generate comparative analysis across multiple coins
-                4. Build reports and summaries
-                5. Handle data processing and calculations
-                6. Fetch and process exchange data from Bitget and CoinGecko
-                7. **IMPLEMENT CUSTOM INDICATORS** designed by the TechnicalAnalyst
-                8. **BACKTEST AND EVALUATE** indicator/strategy performance
-                9. **SAVE INDICATORS** to the registry for reuse across sessions
-                10. **LOAD EXISTING INDICATORS** from the registry when available
-                11. **SAVE REUSABLE TOOLS** to the tool registry for future conversations
-                
-                **INDICATOR REGISTRY - PERSISTENT STORAGE:**
-                You have access to a persistent indicator registry. ALWAYS check for existing
-                indicators before creating new ones, and ALWAYS save new indicators for reuse!
-                
-                📚 **Indicator Registry Tools:**
-                - list_custom_indicators(category, search) - List all saved indicators
-                - get_custom_indicator(indicator_id) - Get full details and code for an indicator
-                - save_custom_indicator(...) - Save a new indicator to the registry
-                - get_indicator_code_for_execution(indicator_id) - Get executable code
-                - delete_custom_indicator(indicator_id, confirm) - Remove an indicator
-                
-                🛠️ **GENERAL TOOL REGISTRY - ANY REUSABLE CODE:**
-                Beyond indicators, you can save ANY useful code as reusable tools!
-                This uses a token-optimized approach:
-                - Only tool summaries (one-liners) are sent to the LLM initially
-                - Full tool definitions are loaded on-demand when selected
-                
-                📦 **Tool Registry Functions:**
-                - list_custom_tools(category, search) - List saved tools with short summaries
-                - get_custom_tool(tool_id) - Get full definition including code
-                - save_custom_tool(name, code, description, one_liner, input_schema, ...) - Save new tool
-                - execute_custom_tool(tool_id, parameters) - Run a saved tool
-                - delete_custom_tool(tool_id, confirm) - Remove a tool
-                
-                **WHEN TO SAVE CODE AS A TOOL:**
-                - Data fetchers (whale alerts, sentiment scrapers, custom APIs)
-                - Analysis functions (correlation matrices, anomaly detection)
-                - Data transformers (normalization, aggregation)
-                - Utility functions used across multiple analyses
-                
-                **TOOL CATEGORIES:** market_data, derivatives, technical, charting, 
-                reporting, data_transform, external_api, utility, custom
-                
-                🔍 **SEMANTIC TOOL SEARCH (NEW!):**
-                Use search_tools_semantic() to find tools by meaning, not just keywords!
-                It uses text-embedding-3-small to understand your query semantically.
-                
-                Example: search_tools_semantic("track large crypto transactions")
-                → Finds "whale_tracker" even if you didn't use that exact term!
-                
-                📊 **Chart Display Tools:**
-                - calculate_indicator_for_chart(indicator_id, ohlcv_data, params, color) - Calculate saved indicator and format for chart
-                - create_indicator_data_for_chart(name, data, color, line_width, separate_scale) - Create chart data from calculated values
-                
-                **WORKFLOW FOR DISPLAYING CUSTOM INDICATORS ON CHARTS:**
-                
-                Option 1: Use a saved indicator
-                1. Calculate indicator: result = calculate_indicator_for_chart("my_indicator", ohlcv_data, color="#FF5722")
-                2. Pass to ChartingAgent: Tell ChartingAgent to use custom_indicators=[result]
-                
-                Option 2: Calculate and display ad-hoc indicator
-                1. Fetch OHLCV data: ohlcv = get_ohlcv_data("BTCUSDT", "1h", 200)
-                2. Calculate your indicator values as [{time, value}, ...]
-                3. Format: result = create_indicator_data_for_chart("My RSI", data, "#FF5722", separate_scale=True)
-                4. Pass to ChartingAgent: Tell ChartingAgent to use custom_indicators=[result]
-                
-                **WORKFLOW FOR CUSTOM INDICATORS:**
-                1. FIRST: Check if a similar indicator exists with list_custom_indicators()
-                2. If exists: Load it with get_custom_indicator() and adapt if needed
-                3. If new: Create the indicator, test it, then save with save_custom_indicator()
-                4. ALWAYS save working indicators so they can be reused in future sessions!
-                
-                **WHEN SAVING INDICATORS, INCLUDE:**
-                - Clear function name and description
-                - All parameters with defaults
-                - Usage example showing how to call it
-                - Performance notes from backtesting
-                - Appropriate category and tags for searchability
-                
-                **CUSTOM INDICATOR IMPLEMENTATION:**
-                When the TechnicalAnalyst designs a new indicator, implement it with:
-                - Clear function signature with type hints
-                - Configurable parameters (periods, thresholds, etc.)
-                - NaN handling for warmup periods
-                - Efficient pandas/numpy vectorized operations
-                
-                Example custom indicator pattern:
-                ```python
-                def calculate_custom_momentum_score(df, rsi_period=14, vol_period=20):
-                    '''Custom momentum indicator combining RSI and volume.'''
-                    # RSI component
-                    delta = df['close'].diff()
-                    gain = delta.where(delta > 0, 0).rolling(rsi_period).mean()
-                    loss = (-delta.where(delta < 0, 0)).rolling(rsi_period).mean()
-                    rsi = 100 - (100 / (1 + gain / loss))
-                    
-                    # Volume component (normalized)
-                    vol_sma = df['volume'].rolling(vol_period).mean()
-                    vol_score = df['volume'] / vol_sma
-                    
-                    # Composite score
-                    return (rsi / 100) * vol_score  # 0-1 scaled with volume boost
-                ```
-                
-                **BACKTESTING FRAMEWORK:**
-                Always include evaluation when creating indicators:
-                ```python
-                def backtest_signals(df, signal_col, forward_periods=[1, 5, 10]):
-                    '''Evaluate signal quality with forward returns.'''
-                    results = {}
-                    for period in forward_periods:
-                        df[f'fwd_ret_{period}'] = df['close'].pct_change(period).shift(-period)
-                        
-                        # Signal performance
-                        buy_signals = df[df[signal_col] == 1]
-                        sell_signals = df[df[signal_col] == -1]
-                        
-                        results[f'{period}_period'] = {
-                            'buy_avg_return': buy_signals[f'fwd_ret_{period}'].mean(),
-                            'sell_avg_return': sell_signals[f'fwd_ret_{period}'].mean(),
-                            'buy_win_rate': (buy_signals[f'fwd_ret_{period}'] > 0).mean(),
-                            'signal_count': len(buy_signals) + len(sell_signals)
-                        }
-                    return results
-                ```
-                
-                **EVALUATION METRICS TO COMPUTE:**
-                - Win rate (% profitable signals)
-                - Average return per signal
-                - Sharpe ratio of strategy vs buy-and-hold
-                - Maximum drawdown
-                - Profit factor (gross profits / gross losses)
-                - Signal frequency (trades per day/week)
-                
-                **AVAILABLE MODULES:**
-                
-                🦎 crypto_tools (CoinGecko-based, use coin IDs like 'bitcoin', 'ethereum'):
-                - get_crypto_price(symbol) - Current price and stats
-                - get_historical_data(symbol, days) - Historical price data
-                - get_market_info(symbol) - Detailed market info
-                
-                🦎 crypto_charts:
-                - create_crypto_chart(symbol, days, indicators) - Generate charts
-                
-                🔶 exchange_tools (Bitget + multi-exchange, use pairs like 'BTCUSDT'):
-                - get_realtime_price(symbol, provider) - Real-time price from Bitget or CoinGecko
-                - get_price_comparison(symbol) - Compare prices across exchanges
-                - get_orderbook_depth(symbol, levels) - Order book depth
-                - get_ohlcv_data(symbol, interval, limit) - Candlestick data
-                - get_recent_market_trades(symbol, limit) - Recent trades
-                - get_futures_data(symbol) - Futures info (funding rate, open interest)
-                - get_futures_candles(symbol, interval, limit) - Futures OHLCV
-                - get_account_balance(account_type) - Account balances ('spot' or 'futures')
-                - check_exchange_status() - Check connected exchanges
-                
-                Standard libraries: requests, json, pandas, numpy, datetime, pathlib, scipy.stats
-                
-                **SYMBOL FORMATS:**
-                - CoinGecko (crypto_tools): lowercase IDs → 'bitcoin', 'ethereum', 'sui'
-                - Bitget (exchange_tools): trading pairs → 'BTCUSDT', 'ETHUSDT', 'SUIUSDT'
-                
-                Example import patterns:
-                ```python
-                # For CoinGecko data
-                from crypto_tools import get_crypto_price, get_historical_data
-                
-                # For Bitget/exchange data
-                from exchange_tools import get_realtime_price, get_ohlcv_data, get_futures_data
-                
-                import json
-                import pandas as pd
-                import numpy as np
-                ```
-                
-                - Save outputs to the 'outputs' directory
-                - Include error handling with try/except blocks
-                - Make code clear and well-commented
-                - **Always evaluate custom indicators before recommending them**
-                
-                Focus on creating actionable, data-validated insights.
-                
-                ═══════════════════════════════════════════════════════════════════
-                🎨 MANDATORY CHARTING - ALWAYS VISUALIZE CUSTOM INDICATORS!
-                ═══════════════════════════════════════════════════════════════════
-                
-                **CRITICAL: After calculating any custom indicator, request a chart!**
-                
-                When you calculate a custom indicator:
-                1. Use create_indicator_data_for_chart() to format the data
-                2. Request ChartingAgent to display it using custom_indicators parameter
-                
-                **Workflow for Custom Indicator Visualization:**
-                ```python
-                # 1. Calculate your indicator values as [{time, value}, ...]
-                indicator_data = create_indicator_data_for_chart(
-                    name="My Custom RSI",
-                    data=calculated_values,  # [{time: timestamp, value: float}, ...]
-                    color="#FF5722",
-                    separate_scale=True  # True for oscillators (RSI, MACD)
-                )
-                ```
-                
-                # 2. Then tell ChartingAgent:
-                "ChartingAgent, generate an entry analysis chart for {symbol} with:
-                - custom_indicators: [the indicator data I calculated]
-                - indicators: 'rsi,macd,volume' (standard ones for comparison)
-                - Include the analysis levels and signals"
-                
-                **NEVER finish implementing an indicator without visualizing it!**
-                Charts help validate the indicator behavior and communicate results.
-                """ + SHARED_AGENT_RULES,
-                description="Python developer for crypto analysis, custom indicators, and backtesting",
-            )
-            
-            # Report Writer - creates professional Markdown reports
-            report_writer = AssistantAgent(
-                "ReportWriter",
-                model_client=self.model_client,
-                tools=report_tools,
-                system_message="""You are a professional cryptocurrency report writer specializing in:
-                - Creating comprehensive Markdown analysis reports
-                - Synthesizing technical and market analysis into readable documents
-                - Formatting data, charts, and findings professionally
-                - Producing executive summaries and actionable recommendations
-                
-                ═══════════════════════════════════════════════════════════════════
-                ⛔ CRITICAL RULES - REPORT INTEGRITY
-                ═══════════════════════════════════════════════════════════════════
-                
-                🚫 **ABSOLUTELY FORBIDDEN:**
-                - Including data you didn't receive from other agents
-                - Adding hypothetical scenarios or speculation
-                - Inventing statistics or performance metrics
-                - Writing "could", "might", "possibly" predictions
-                - Adding recommendations without data backing
-                
-                ✅ **MANDATORY BEHAVIOR:**
-                - ONLY include facts provided by other agents
-                - Every number must have a source noted
-                - Clearly separate FACTS from INTERPRETATION
-                - Include timestamp and data source for all metrics
-                - Document which agent provided which information
-                - Add "Daten von: [Agent, Zeitstempel]" to each section
-                
-                📋 **CLEAN REPORT STRUCTURE:**
-                Reports must be SIMPLE, CLEAR, and ACTIONABLE:
-                
-                ```markdown
-                # [Symbol] Analyse Report
-                **Erstellt:** [Datum/Zeit]
-                **Datenquellen:** [Bitget/CoinGecko, Zeitstempel]
-                
-                ## Zusammenfassung (3 Punkte max)
-                - Punkt 1: [Fakt]
-                - Punkt 2: [Fakt]
-                - Punkt 3: [Fakt]
-                
-                ## Aktuelle Daten
-                | Metrik | Wert | Quelle |
-                |--------|------|--------|
-                | Preis  | $X   | Bitget |
-                
-                ## Technische Analyse
-                [Nur berechnete Werte, keine Vermutungen]
-                
-                ## Trading Setup (falls vorhanden)
-                - Entry: $X (Grund: Y)
-                - Stop Loss: $X (Grund: Y)
-                - Take Profit: $X (R:R Verhältnis: Z)
-                
-                ## Risiko-Warnung
-                [Spezifische Risiken basierend auf Daten]
-                ```
-                
-                📊 **DOKUMENTIERTE SCHRITTE:**
-                Füge immer einen Abschnitt hinzu:
-                ## Analyseschritte
-                1. [Agent]: [Aktion] - [Ergebnis]
-                2. [Agent]: [Aktion] - [Ergebnis]
-                
-                ═══════════════════════════════════════════════════════════════════
-                
-                Your role is to:
-                1. Compile analysis findings from other agents into cohesive reports
-                2. Create structured Markdown documents with proper formatting
-                3. Summarize complex technical analysis for readability
-                4. Generate comparison reports for multiple cryptocurrencies
-                5. Document custom indicators with usage instructions
-                6. Save all reports to the outputs directory
-                
-                **REPORT TYPES YOU CAN CREATE:**
-                
-                📊 **Analysis Reports** (create_analysis_report):
-                - Full analysis of a single cryptocurrency
-                - Includes price, technical analysis, signals, outlook
-                - Use for comprehensive coin reviews
-                
-                📈 **Comparison Reports** (create_comparison_report):
-                - Side-by-side comparison of multiple coins
-                - Includes metrics table and recommendations
-                - Use for portfolio decisions
-                
-                🔧 **Custom Indicator Reports** (create_custom_indicator_report):
-                - Document new indicator designs
-                - Include formula, backtest results, usage guide
-                - Use for strategy documentation
-                
-                📝 **Custom Reports** (save_markdown_report):
-                - Flexible format for any analysis
-                - Full control over content structure
-                - Use for specialized reports
-                
-                **MARKDOWN FORMATTING GUIDELINES:**
-                - Use headers (##) to organize sections
-                - Use **bold** for key findings and numbers
-                - Use tables for comparing metrics
-                - Use bullet points for recommendations
-                - Include clear actionable takeaways
-                - Add appropriate emojis for visual appeal (📈 📉 🎯 ⚠️)
-                
-                **REPORT STRUCTURE:**
-                1. Executive Summary (2-3 key points)
-                2. Data & Analysis (detailed findings)
-                3. Signals & Recommendations
-                4. Risk Factors & Considerations
-                5. Conclusion with actionable steps
-                
-                Always save reports using the provided tools. Reports are saved to the outputs/ directory.
-                Make reports professional, data-driven, and actionable.
-                """ + SHARED_AGENT_RULES,
-                description="Professional report writer for Markdown analysis documents",
+    Multi-agent system for comprehensive crypto analysis:
+    - Real-time price monitoring and market data
+    - Technical indicator calculations (RSI, MACD, Bollinger Bands)
+    - Professional candlestick chart generation
+    - Trading signal detection and recommendations
+    """
+    
+    def __init__(self, config: AppConfig):
+        """Initialize the crypto analysis platform."""
+        self.config = config
+        self.console = RichConsole()
+        # Piped/scripted runs cannot see panels or live regions; print only
+        # the answer there instead of paying for Rich rendering
+        self._quiet = config.quiet or not sys.stdout.isatty()
+        self.output_dir = Path(config.output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+        _recover_orphan_transcripts(self.output_dir)
+        
+        # Conversation history for multi-turn interactions
+        # (bounded, so old full-length answers do not pile up in long sessions)
+        self.conversation_history: Deque[Dict[str, str]] = deque(maxlen=config.history_cap)
+        self.team = None  # Built once by initialize_team, reset per task
+        self._code_executor: Optional["PersistentLocalCodeExecutor"] = None  # Owned by self.team
+        self._team_lock = asyncio.Lock()
+        self._last_answer = ""  # Last non-TERMINATE text seen in the stream
+        self._answer_buf: List[str] = []  # Chunks of the reply being streamed
+        self._conversation_mode = True
+        
+        # Initialize intent router for query classification
+        self._intent_router = IntentRouter()
+        self._init_intent_tools()
+        
+        # Initialize the Azure OpenAI model client
+        self.console.print(f"[cyan]Using Azure OpenAI: {config.azure_openai.deployment}[/cyan]")
+        
+        self._http = None
+        if HTTPX_AVAILABLE:
+            self._http = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                ),
+                timeout=HTTP_TIMEOUT_SECONDS,
             )
+        
+        # Model clients keyed by deployment, created when the team is built
+        self._model_clients: Dict[str, "AzureOpenAIChatCompletionClient"] = {}
+        for agent_name, deployment in config.azure_openai.agent_deployments.items():
+            self.console.print(f"[cyan]  {agent_name} → {deployment}[/cyan]")
+    
+    def _create_model_client(self, deployment: str, model_name: str) -> "AzureOpenAIChatCompletionClient":
+        """Create a client for one deployment on the shared connection pool."""
+        from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
+        
+        client_kwargs = {}
+        if self._http is not None:
+            client_kwargs["http_client"] = self._http
+        
+        return AzureOpenAIChatCompletionClient(
+            azure_deployment=deployment,
+            api_version=self.config.azure_openai.api_version,
+            azure_endpoint=self.config.azure_openai.endpoint,
+            api_key=self.config.azure_openai.api_key,
+            model=model_name,
+            model_info=MODEL_INFO,
+            **client_kwargs,
+        )
+    
+    def _model_client_for(self, agent_name: str) -> "AzureOpenAIChatCompletionClient":
+        """Model client for an agent, honouring AZURE_OPENAI_AGENT_DEPLOYMENTS."""
+        azure = self.config.azure_openai
+        deployment = azure.deployment_for(agent_name)
+        client = self._model_clients.get(deployment)
+        if client is None:
+            # Routed deployments are named after their model
+            model_name = azure.model_name if deployment == azure.deployment else deployment
+            client = self._create_model_client(deployment, model_name)
+            self._model_clients[deployment] = client
+        return client
+    
+    async def aclose(self) -> None:
+        """Stop the code worker, close the model clients and drain the HTTP pool."""
+        await self.invalidate_team()
+        for client in self._model_clients.values():
+            await client.close()
+        if self._http is not None:
+            await self._http.aclose()
+    
+    def _init_intent_tools(self) -> None:
+        """Initialize tools for intent router to use for simple lookups."""
+        self._intent_router.register_tool("get_realtime_price", get_realtime_price)
+        self._intent_router.register_tool("get_price_comparison", get_price_comparison)
+        self._intent_router.register_tool("get_crypto_price", get_crypto_price)
+        self._intent_router.register_tool("get_market_info", get_market_info)
+    
+    async def _execute_simple_query(self, task: str) -> Optional[str]:
+        """
+        Try to execute a simple query directly without multi-agent orchestration.
+        
+        Uses LLM-based intent classification with pattern fallback.
+        
+        Args:
+            task: The user's query
             
-            # Charting Agent - creates professional TradingView-style charts
-            charting_agent = AssistantAgent(
-                "ChartingAgent",
-                model_client=self.model_client,
-                tools=tradingview_tools + exchange_tools,
-                system_message="""You are a professional charting specialist using TradingView-style visualization.
-                
-                ═══════════════════════════════════════════════════════════════════
-                ⛔ CRITICAL RULES - CHART DATA INTEGRITY
-                ═══════════════════════════════════════════════════════════════════
-                
-                🚫 **ABSOLUTELY FORBIDDEN:**
-                - Adding levels or annotations not provided by other agents
-                - Inventing support/resistance levels
-                - Creating hypothetical entry points
-                - Adding indicators not used in the analysis
-                - Displaying data that wasn't calculated and verified
-                
-                ✅ **MANDATORY BEHAVIOR:**
-                - Charts MUST reflect EXACTLY what was analyzed
-                - Only show S/R levels provided by TechnicalAnalyst with sources
-                - Only display indicators that were actually calculated
-                - Entry points must come from verified analysis
-                - Add chart title with symbol, timeframe, and data timestamp
-                - Include legend showing data source (Bitget/CoinGecko)
-                
-                📋 **CHART DOCUMENTATION:**
-                Every chart must include:
-                - Title: "[Symbol] [Timeframe] - [Analyse Typ]"
-                - Subtitle: "Daten: [Quelle], [Zeitstempel]"
-                - Legend: All indicators shown with values
-                - Annotations: Only verified levels with source
-                
-                🎯 **CHART-REPORT CONSISTENCY:**
-                Charts MUST match report content exactly:
-                - Same S/R levels as in the report
-                - Same indicator values as calculated
-                - Same entry/exit levels as recommended
-                - Timeframe must match analysis period
-                
-                ═══════════════════════════════════════════════════════════════════
-                
-                Your expertise includes:
-                - Creating interactive candlestick charts with Lightweight Charts (TradingView's library)
-                - Multi-timeframe analysis dashboards
-                - AI-annotated charts with buy/sell signals
-                - Strategy backtest visualizations
-                - Live data chart generation with UDF server
-                - **AI Smart Alerts Dashboard** - The ULTIMATE trading tool!
-                - **Entry Point Analysis Charts** - Visualize trading setups with SL/TP!
-                
-                **YOUR CHARTING TOOLS:**
-                
-                📊 **generate_tradingview_chart(symbol, interval, indicators, theme, title, annotations)**
-                Creates a professional TradingView-style interactive chart.
-                - symbol: Trading pair like 'BTCUSDT', 'ETHUSDT'
-                - interval: '1m', '5m', '15m', '1H', '4H', '1D', '1W'
-                - indicators: 'rsi', 'macd', 'bollinger', 'sma', 'ema', 'volume' (comma-separated)
-                - theme: 'dark' or 'light'
-                - annotations: JSON array of markers [{time, text, position, color}]
-                
-                📈 **generate_multi_timeframe_dashboard(symbol, timeframes)**
-                Creates a dashboard showing the same symbol across multiple timeframes.
-                - timeframes: '15m,1H,4H,1D' (comma-separated)
-                Perfect for trend alignment analysis!
-                
-                🎯 **create_ai_annotated_chart(symbol, analysis_signals, support_resistance, trend_lines)**
-                Creates charts with AI-powered annotations.
-                - analysis_signals: JSON array of signals [{time, type: 'buy'/'sell', description}]
-                - support_resistance: Optional S/R levels
-                Best for communicating trading ideas!
-                
-                🚀 **generate_entry_analysis_chart(symbol, entry_points, interval, support_levels, resistance_levels, indicators, custom_indicators, title, show_risk_reward)**
-                **THE KEY TOOL FOR ENTRY POINT VISUALIZATION!**
-                Creates professional charts with entry/exit annotations:
-                - entry_points: JSON array of entries with type, price, stop_loss, take_profit, reason, confidence
-                  Example: [{"type": "long", "price": 98500, "stop_loss": 97000, "take_profit": [100000, 102000], "reason": "Breakout", "confidence": "high"}]
-                - support_levels: Array of support prices [95000, 92000]
-                - resistance_levels: Array of resistance prices [100000, 105000]
-                - **indicators**: Comma-separated list of BUILT-IN indicators:
-                  Options: 'sma', 'ema', 'bollinger', 'rsi', 'macd', 'volume'
-                  Example: "sma,ema,bollinger" - Shows these indicators on the chart
-                - **custom_indicators**: JSON array of CUSTOM indicators from CryptoAnalysisCoder!
-                  Each indicator: {name, data: [{time, value}], color, lineWidth, lineStyle, priceScaleId}
-                  Example: '[{"name": "Volume RSI", "data": [...], "color": "#FF5722"}]'
-                  **Use this to display ANY custom indicator the agent calculates!**
-                - show_risk_reward: Display R:R ratio for entries
-                
-                **USE THIS TOOL WHEN:**
-                - User asks for entry points or trade setups
-                - Performing technical analysis with actionable signals
-                - Creating trade idea visualizations
-                - Showing where to enter/exit positions with SL/TP
-                - **ALWAYS include indicators you used for analysis!**
-                - **Accept custom_indicators from CryptoAnalysisCoder for unique indicators!**
-                
-                📉 **generate_strategy_backtest_chart(symbol, strategy_name, trades, equity_curve, metrics)**
-                Creates comprehensive backtest visualizations.
-                - trades: JSON array [{entry_time, exit_time, entry_price, exit_price, type, profit}]
-                - equity_curve: Optional [{time, value}]
-                - metrics: {win_rate, profit_factor, max_drawdown}
-                Essential for validating strategies!
-                
-                🔴 **UDF Server Controls (for live data):**
-                - start_udf_server(port) - Start live data server
-                - stop_udf_server() - Stop the server
-                - get_udf_server_status() - Check if server is running
-                - generate_live_chart_with_data(symbol, interval) - Chart connected to live server
-                
-                🚨 **SMART ALERTS - THE ULTIMATE TRADING TOOL:**
-                
-                **generate_smart_alerts_dashboard(symbols, alert_types, timeframes, min_score)**
-                Creates an AI-powered alerts dashboard that:
-                - Scans multiple symbols for high-probability setups
-                - Calculates confluence scores from multiple indicators
-                - Generates mini-charts for each alert
-                - Provides specific entry/stop/target levels
-                - alert_types: 'divergence,breakout,confluence,reversal'
-                
-                **create_trade_idea_alert(symbol, direction, entry_price, stop_loss, take_profit, signals)**
-                Creates a focused single-trade idea with:
-                - Full-size annotated chart
-                - Entry, stop, target with R:R ratio
-                - Supporting signals list
-                - Confidence rating
-                
-                **WORKFLOW FOR ENTRY POINT ANALYSIS:**
-                
-                1. **Receive analysis from TechnicalAnalyst** with support/resistance and signals
-                2. **Determine entry points** based on:
-                   - Key breakout levels
-                   - Support/resistance bounces
-                   - Indicator confluences (RSI oversold + support, etc.)
-                3. **Calculate risk/reward**:
-                   - Stop loss below support (long) or above resistance (short)
-                   - Take profit at next resistance/support or 2:1 R:R minimum
-                4. **Generate entry analysis chart** using generate_entry_analysis_chart with all levels
-                   **IMPORTANT: Include the indicators parameter to show which indicators were used!**
-                   Example: indicators="sma,ema,bollinger" shows those overlays on the chart
-                5. **Explain the setup** with reason and confidence
-                
-                **WORKFLOW FOR BEST RESULTS:**
-                
-                1. **Simple Analysis Chart:**
-                   Use generate_tradingview_chart with indicators you need
-                   
-                2. **Trend Analysis:**
-                   Use generate_multi_timeframe_dashboard to see trend alignment
-                   
-                3. **Entry Point Visualization:**
-                   Use generate_entry_analysis_chart to show specific entries with SL/TP
-                   **Always include indicators="sma,ema,bollinger" etc. to show the analysis basis!**
-                   
-                4. **Signal Visualization:**
-                   Get signals from TechnicalAnalyst, then use create_ai_annotated_chart
-                   
-                5. **Strategy Validation:**
-                   After CryptoAnalysisCoder backtests, use generate_strategy_backtest_chart
-                   
-                6. **Live Monitoring:**
-                   Start UDF server, then generate_live_chart_with_data for real-time updates
-                   
-                7. **Trading Alerts:**
-                   Use generate_smart_alerts_dashboard for multi-symbol scanning
-                   Use create_trade_idea_alert for specific high-conviction setups
-                
-                **CHARTING BEST PRACTICES:**
-                - Always use dark theme for professional look
-                - Include volume in most charts
-                - **Show indicators used in analysis** via the indicators parameter
-                - For trend analysis, show 4H + 1D timeframes at minimum
-                - Annotate key levels (support/resistance)
-                - Save charts to outputs/charts/ directory
-                - Provide the open_command to let users view charts easily
+        Returns:
+            Formatted result string if simple execution succeeded, None otherwise
+        """
+        # Use async LLM-based classification
+        try:
+            intent = await self._intent_router.classify_async(task)
+        except Exception:
+            # Fall back to pattern-based on any error
+            intent = self._intent_router.classify(task)
+        
+        if not intent.is_simple():
+            return None
+        
+        self.console.print(f"\n⚡ [dim]Quick lookup detected (confidence: {intent.confidence:.0%})[/dim]")
+        
+        result = await self._intent_router.execute_simple(task, intent)
+        
+        if result.get("success"):
+            formatted = format_simple_result(result)
+            return formatted
+        
+        return None
+    
+    async def _execute_compound_query(self, task: str) -> Optional[Tuple[str, bool]]:
+        """
+        Handle compound queries by executing quick component first.
+        
+        For queries like "What is the price of BTC and show me a chart?",
+        this will return the price immediately while signaling that
+        full agent processing should continue.
+        
+        Args:
+            task: The user's query
+            
+        Returns:
+            Tuple of (quick_result, should_continue) or None if not a compound query
+        """
+        # Use async LLM-based classification
+        try:
+            intent = await self._intent_router.classify_async(task)
+        except Exception:
+            intent = self._intent_router.classify(task)
+        
+        if not intent.has_quick_component():
+            return None
+        
+        # It's a compound query with a quick lookup component
+        self.console.print(f"\n🔀 [dim]Compound query detected: {intent.type.value} + quick data[/dim]")
+        
+        result = await self._intent_router.execute_simple(task, intent)
+        
+        if result.get("success"):
+            formatted = format_simple_result(result)
+            self.console.print(Panel(
+                formatted,
+                title="📊 Quick Data",
+                border_style="green",
+            ))
+            self.console.print(f"\n⏳ [dim]Now processing full {intent.type.value}...[/dim]\n")
+            return (formatted, True)  # Continue to full agent processing
+        
+        return None
+    
+    async def _process_stream_minimal(self, stream, log_file=None) -> RunSummary:
+        """
+        Process the agent stream with minimal output.
+        
+        Only displays:
+        - Agent names when they start working (thinking steps)
+        - Replies of streaming agents, rendered live as tokens arrive
+        - The final answer
+        
+        Args:
+            stream: The async stream from team.run_stream()
+            log_file: Optional aiofiles text file; each message is appended to
+                it as it arrives (off the event loop) so the transcript never
+                has to be rebuilt later
+            
+        Returns:
+            RunSummary with the final answer; the TaskResult's message list
+            (tool frames, chart payloads) is dropped as soon as it arrives
+        """
+        state = _StreamState(log_file=log_file)
+        self._last_answer = ""
+        clear_request_cache()
+        handlers = self._STREAM_HANDLERS
+        quiet = self._quiet
+        # Bound once; the chunk branch below runs for every streamed token
+        on_chunk = self._on_stream_chunk
+        
+        try:
+            async for message in stream:
+                msg_type = type(message)
                 
-                **COLLABORATION WITH OTHER AGENTS:**
-                - TechnicalAnalyst: Provides signals and levels to visualize
-                - CryptoAnalysisCoder: Provides backtest trades to chart
-                - ReportWriter: Can embed chart links in reports
-                - CryptoMarketAnalyst: Provides market context for alerts
+                # Token chunks are by far the most frequent event
+                if msg_type is ModelClientStreamingChunkEvent:
+                    if not quiet:
+                        on_chunk(message, state)
+                    continue
                 
-                After generating a chart, always tell the user how to open it!
-                Example: "Open the chart with: open /path/to/chart.html"
+                # Every message is already on screen and in the transcript
+                if msg_type is TaskResult:
+                    state.stop_reason = message.stop_reason
+                    continue
                 
-                ═══════════════════════════════════════════════════════════════════
-                🎨 PROACTIVE CHARTING - YOU ARE THE VISUALIZATION EXPERT!
-                ═══════════════════════════════════════════════════════════════════
+                # A complete message ends the live region of its chunks
+                if state.live is not None:
+                    self._stop_live(state)
                 
-                **IMPORTANT: Always generate charts when analysis is discussed!**
+                source = message.source
                 
-                Even if not explicitly asked, you should create charts when:
-                - Market analysis is provided → Generate price chart with key levels
-                - Technical signals are identified → Create annotated chart
-                - Entry/exit points are suggested → Generate entry analysis chart
-                - Multiple timeframes discussed → Create multi-timeframe dashboard
-                - Custom indicators calculated → Display them on charts
+                # Append to the transcript while the next LLM call is in flight
+                if log_file is not None:
+                    await log_file.write(f"\n--- {source or 'System'} ---\n{getattr(message, 'content', message)}\n")
                 
-                **Default Chart Settings:**
-                - Always use dark theme
-                - Include at least: sma, ema, volume
-                - Add RSI and MACD for comprehensive analysis
-                - Show support/resistance when available
-                - Annotate entry points with SL/TP when trading setups exist
+                if not quiet:
+                    self._show_agent(source, state)
                 
-                **YOU ARE THE FINAL STEP - ALWAYS DELIVER A CHART!**
-                Every analysis conversation should end with a generated chart file.
-                Make the chart comprehensive with all discussed indicators and ideas.
-                """ + SHARED_AGENT_RULES,
-                description="TradingView charting specialist for interactive visualizations, dashboards, and smart alerts",
-            )
-            
-            # Create code executor with local environment
-            code_executor = LocalCommandLineCodeExecutor(
-                work_dir=str(self.output_dir / "code_execution"),
-            )
-            
-            executor = CodeExecutorAgent(
-                "Executor",
-                code_executor=code_executor,
-            )
-            
-            # Create the crypto analysis team
-            team = MagenticOneGroupChat(
-                participants=[market_analyst, technical_analyst, charting_agent, coder, report_writer, executor],
-                model_client=self.model_client,
-                max_turns=self.config.max_turns,
-                max_stalls=self.config.max_stalls,
+                handler = handlers.get(msg_type)
+                if handler is not None:
+                    handler(self, message, state)
+                state.streaming_source = None
+        finally:
+            if state.live is not None:
+                self._stop_live(state)
+        
+        # Display final answer (unless it was already painted while streaming)
+        if self._last_answer and not state.answer_streamed:
+            if not quiet:
+                self.console.print("\n" + "─" * 60)
+                self.console.print("[bold green]✅ Answer:[/bold green]\n")
+            # Use Markdown rendering for nice formatting
+            self._print_markdown(self._last_answer)
+        
+        return RunSummary(answer=self._last_answer, stop_reason=state.stop_reason)
+    
+    def _show_agent(self, source: Optional[str], state: _StreamState) -> None:
+        """When a new agent starts, show their name."""
+        if source and source != state.last_agent:
+            agent_emoji = AGENT_EMOJI.get(source, '🤖')
+            self.console.print(f"\n{agent_emoji} [bold cyan]{source}[/bold cyan] is working...")
+            state.last_agent = source
+    
+    def _on_stream_chunk(self, message: ModelClientStreamingChunkEvent, state: _StreamState) -> None:
+        """Render streamed tokens as they arrive."""
+        source = message.source
+        live = state.live
+        if live is None or source != state.streaming_source:
+            if live is not None:
+                self._stop_live(state)
+            self._show_agent(source, state)
+            # Finished paragraphs are printed above the live region as
+            # Markdown exactly once; only the unfinished tail is redrawn,
+            # as plain text, so rendering stays linear in the reply length
+            self._answer_buf = []
+            state.streaming_source = source
+            state.stream_blocks = 0
+            state.ends_with_newline = False
+            state.live = Live(
+                console=self.console,
+                refresh_per_second=10,
+                transient=True,
+                get_renderable=lambda: Text("".join(self._answer_buf)),
             )
-            
+            state.live.start()
+        chunk = message.content
+        self._answer_buf.append(chunk)
+        # Only a new blank line can complete a paragraph; plain line breaks
+        # (e.g. every line of a long code block) just extend the tail
+        if "\n\n" in chunk or (state.ends_with_newline and chunk.startswith("\n")):
+            self._commit_paragraphs(state)
+        state.ends_with_newline = chunk.endswith("\n")
+    
+    def _commit_paragraphs(self, state: _StreamState) -> None:
+        """Move completed paragraphs from the live tail to the console."""
+        tail = "".join(self._answer_buf)
+        self._answer_buf = [tail]
+        cut = tail.rfind("\n\n")
+        if cut < 0:
+            return
+        done = tail[:cut]
+        # Never split a fenced code block
+        if _has_open_fence(done):
+            return
+        self._answer_buf = [tail[cut + 2:]]
+        self._print_stream_block(done, state)
+    
+    def _print_stream_block(self, text: str, state: _StreamState) -> None:
+        if not text.strip():
+            return
+        if state.stream_blocks:
+            self.console.print()
+        self.console.print(Markdown(text))
+        state.stream_blocks += 1
+    
+    def _stop_live(self, state: _StreamState) -> None:
+        state.live.stop()
+        state.live = None
+        self._print_stream_block("".join(self._answer_buf), state)
+        self._answer_buf = []
+    
+    def _on_tool_calls(self, message: ToolCallRequestEvent, state: _StreamState) -> None:
+        """Show tool calls briefly (one console write for the whole batch)."""
+        if self._quiet:
+            return
+        self.console.print("\n".join(
+            f"   ↳ Calling: [dim]{call.name}[/dim]" for call in message.content
+        ))
+    
+    def _on_answer_message(self, message, state: _StreamState) -> None:
+        """Remember the latest text message as the answer."""
+        content = message.content
+        if content and not content.startswith(TERMINATE_SENTINEL):
+            self._last_answer = content
+            state.answer_streamed = message.source == state.streaming_source
+    
+    # Exact-type dispatch for complete stream messages; other types are only
+    # logged and announced
+    _STREAM_HANDLERS = {
+        ToolCallRequestEvent: _on_tool_calls,
+        **dict.fromkeys(ANSWER_MESSAGE_TYPES, _on_answer_message),
+    }
+    
+    def _print_markdown(self, text: str) -> None:
+        """
+        Render Markdown one heading-delimited section at a time.
+        
+        Answers arrive complete (MagenticOne's final answer is not a
+        streamed completion), so long reports are painted section by
+        section: the first section shows up without parsing the whole
+        report, and no single Markdown tree spans the full answer.
+        In quiet mode the raw Markdown is written as-is.
+        """
+        if self._quiet:
+            print(text)
+            return
+        
+        sections = []
+        current = []
+        in_fence = False
+        for line in text.splitlines(keepends=True):
+            if line.lstrip().startswith(("```", "~~~")):
+                in_fence = not in_fence
+            elif not in_fence and line.startswith("#") and current:
+                sections.append("".join(current))
+                current = []
+            current.append(line)
+        sections.append("".join(current))
+        
+        for i, section in enumerate(sections):
+            if i:
+                self.console.print()
+            self.console.print(Markdown(section))
+        
+    def display_banner(self):
+        """Display the application banner."""
+        self.console.print(_banner_panel())
+    
+    async def initialize_team(self) -> "MagenticOneGroupChat":
+        """
+        Return the crypto analysis team, building it on first use.
+        
+        Agents, tools and the code executor are created once and reused
+        across tasks; run_task resets the team before each run.
+        
+        Returns:
+            Configured MagenticOneGroupChat team with crypto specialists
+        """
+        async with self._team_lock:
+            if self.team is None:
+                self.team = await self._build_team()
+            return self.team
+    
+    async def invalidate_team(self) -> None:
+        """Drop the cached team (and stop its code worker) so the next task rebuilds it."""
+        async with self._team_lock:
+            self.team = None
+            code_executor, self._code_executor = self._code_executor, None
+        if code_executor is not None:
+            await code_executor.stop()
+    
+    async def _build_team(self) -> "MagenticOneGroupChat":
+        """
+        Initialize the crypto analysis team with specialized agents.
+        
+        Returns:
+            Configured MagenticOneGroupChat team with crypto specialists
+        """
+        from autogen_agentchat.agents import AssistantAgent, CodeExecutorAgent
+        from autogen_agentchat.teams import MagenticOneGroupChat
+        from persistent_executor import PersistentLocalCodeExecutor
+        
+        self.console.print("[cyan]Initializing crypto analysis agents...[/cyan]")
+        
+        # Create code executor backed by a warm Python worker; starting it
+        # now lets numpy/pandas import while the team is being assembled
+        code_executor = PersistentLocalCodeExecutor(
+            work_dir=str(self.output_dir / "code_execution"),
+        )
+        await code_executor.start()
+        self._code_executor = code_executor
+        
+        # Load/compile the indicator kernels and the tokenizer before the
+        # first real request, on worker threads while the agents below are
+        # being assembled (LLVM code generation runs outside the GIL; the
+        # tiktoken encoding may be downloaded on first use)
+        warmup = asyncio.gather(
+            asyncio.to_thread(warmup_indicators),
+            asyncio.to_thread(warmup_history),
+        )
+        
+        # Crypto Market Analyst - focuses on market data and trends
+        market_analyst = AssistantAgent(
+            "CryptoMarketAnalyst",
+            model_client=self._model_client_for("CryptoMarketAnalyst"),
+            tools=ALL_CRYPTO_TOOLS,
+            system_message=SYSTEM_PROMPTS["CryptoMarketAnalyst"],
+            description="Expert in crypto markets, trends, fundamental analysis, and custom indicator design",
+        )
+        
+        # Technical Analyst - focuses on charts and indicators
+        technical_analyst = AssistantAgent(
+            "TechnicalAnalyst",
+            model_client=self._model_client_for("TechnicalAnalyst"),
+            tools=ALL_CRYPTO_TOOLS + INDICATOR_TOOLS,
+            system_message=SYSTEM_PROMPTS["TechnicalAnalyst"],
+            description="Expert in technical analysis, charts, indicators, futures, and custom indicator design",
+        )
+        
+        coder = AssistantAgent(
+            "CryptoAnalysisCoder",
+            model_client=self._model_client_for("CryptoAnalysisCoder"),
+            tools=INDICATOR_TOOLS + TOOL_REGISTRY_TOOLS,
+            system_message=SYSTEM_PROMPTS["CryptoAnalysisCoder"],
+            description="Python developer for crypto analysis, custom indicators, and backtesting",
+        )
+        
+        # Report Writer - creates professional Markdown reports
+        report_writer = AssistantAgent(
+            "ReportWriter",
+            model_client=self._model_client_for("ReportWriter"),
+            model_client_stream=True,
+            tools=REPORT_TOOLS,
+            system_message=SYSTEM_PROMPTS["ReportWriter"],
+            description="Professional report writer for Markdown analysis documents",
+        )
+        
+        # Charting Agent - creates professional TradingView-style charts
+        charting_agent = AssistantAgent(
+            "ChartingAgent",
+            model_client=self._model_client_for("ChartingAgent"),
+            tools=TRADINGVIEW_TOOLS + EXCHANGE_TOOLS,
+            system_message=SYSTEM_PROMPTS["ChartingAgent"],
+            description="TradingView charting specialist for interactive visualizations, dashboards, and smart alerts",
+        )
+        
+        executor = CodeExecutorAgent(
+            "Executor",
+            code_executor=code_executor,
+        )
+        
+        # Create the crypto analysis team
+        team = MagenticOneGroupChat(
+            participants=[market_analyst, technical_analyst, charting_agent, coder, report_writer, executor],
+            model_client=self._model_client_for("MagenticOneOrchestrator"),
+            max_turns=self.config.max_turns,
+            max_stalls=self.config.max_stalls,
+        )
+        
+        await warmup
         self.console.print("✅ [green]Crypto analysis team initialized successfully![/green]\n")
         return team
     
@@ -1464,26 +1921,34 @@ Specialized cryptocurrency analysis with:
             conversation_mode: If True, maintains context between tasks
             
         Returns:
-            The task result
+            The final answer text
         """
-        self.console.print(Panel(
-            f"[bold cyan]Task:[/bold cyan]\n{task}",
-            border_style="cyan"
-        ))
+        # One clock read per task, shared by history, file name and header
+        started = datetime.now()
+        started_iso = started.isoformat()
+        started_display = f"{started:%Y-%m-%d %H:%M:%S}"  # For /history rows
+        
+        if not self._quiet:
+            self.console.print(Panel(
+                f"[bold cyan]Task:[/bold cyan]\n{task}",
+                border_style="cyan"
+            ))
         
         # Try simple intent execution first
         simple_result = await self._execute_simple_query(task)
         if simple_result:
-            self.console.print("\n" + "─" * 60)
-            self.console.print("[bold green]✅ Quick Answer:[/bold green]\n")
-            self.console.print(Markdown(simple_result))
+            if not self._quiet:
+                self.console.print("\n" + "─" * 60)
+                self.console.print("[bold green]✅ Quick Answer:[/bold green]\n")
+            self._print_markdown(simple_result)
             
             # Store in conversation history
             if conversation_mode:
                 self.conversation_history.append({
                     "task": task,
                     "answer": simple_result,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": started_iso,
+                    "display_ts": started_display,
                 })
             
             return simple_result
@@ -1497,79 +1962,95 @@ Specialized cryptocurrency analysis with:
         
         # In conversation mode, build context from history
         if conversation_mode and self.conversation_history:
-            # Build context summary from previous turns
-            context_parts = ["[CONVERSATION CONTEXT - Previous interactions in this session:]"]
-            for i, turn in enumerate(self.conversation_history[-5:], 1):  # Last 5 turns
-                context_parts.append(f"\n--- Turn {i} ---")
-                context_parts.append(f"User: {turn['task']}")
-                # Truncate long answers to keep context manageable
-                answer = turn['answer']
-                if len(answer) > 500:
-                    answer = answer[:500] + "... [truncated]"
-                context_parts.append(f"Result: {answer}")
-            context_parts.append("\n[END CONTEXT]\n")
-            context_parts.append(f"Current request: {task}")
-            
-            augmented_task = "\n".join(context_parts)
+            # Latest turns verbatim, older ones summarised, within a token budget;
+            # semantic_truncate stops at the budget, so this stays bounded
+            # however long the session gets
+            turns = semantic_truncate(self.conversation_history, max_tokens=HISTORY_CONTEXT_TOKENS)
+            augmented_task = "".join((
+                CONTEXT_HEADER,
+                *(f"\n\n--- Turn {i} ---\nUser: {turn['task']}\nResult: {turn['answer']}"
+                  for i, turn in enumerate(turns, 1)),
+                CONTEXT_FOOTER,
+                task,
+            ))
         else:
             augmented_task = task
         
-        # Initialize team (fresh for each task to avoid state issues)
+        # Reuse the team; reset so each task starts from a clean state
+        # (team.reset() leaves the code worker alone, so replace it too)
         team = await self.initialize_team()
+        await team.reset()
+        if self._code_executor is not None:
+            await self._code_executor.restart()
         
         # Execute task with minimal console output (task, steps, answer only)
-        self.console.print("\n[yellow]🚀 Starting task execution...[/yellow]\n")
+        if not self._quiet:
+            self.console.print("\n[yellow]🚀 Starting task execution...[/yellow]\n")
+        
+        # Open the transcript up front so messages are written as they stream in
+        output_file = None
+        log_file = None
+        if save_output:
+            output_file = self.output_dir / f"task_output_{started:%Y%m%d_%H%M%S}.txt"
+            # aiofiles runs the writes on a worker thread, so disk flushes
+            # never stall the stream; the transcript goes to a temp file that
+            # is swapped in atomically only when the run succeeds, so a failed
+            # or killed run never leaves a torn file under the final name
+            log_file = await aiofiles.open(
+                output_file.with_suffix(".txt.tmp"), "w", encoding="utf-8", buffering=1 << 16
+            )
+            await log_file.write(f"Task: {task}\n\nTimestamp: {started_iso}\n\n{TRANSCRIPT_RULE}")
         
+        completed = False
         try:
-            result = await self._process_stream_minimal(team.run_stream(task=augmented_task))
+            summary = await self._process_stream_minimal(
+                team.run_stream(task=augmented_task),
+                log_file=log_file,
+            )
             
-            # Extract the answer for conversation history
-            answer_text = ""
-            if result and result.messages:
-                for msg in reversed(result.messages):
-                    if isinstance(msg, (TextMessage, StopMessage)):
-                        content = getattr(msg, 'content', str(msg))
-                        if content and not content.startswith("TERMINATE"):
-                            answer_text = content
-                            break
+            # Answer was captured while streaming
+            answer_text = summary.answer
             
             # Store in conversation history
             if conversation_mode:
                 self.conversation_history.append({
                     "task": task,
                     "answer": answer_text,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": started_iso,
+                    "display_ts": started_display,
                 })
             
-            # Save output if requested
-            if save_output:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_file = self.output_dir / f"task_output_{timestamp}.txt"
-                
-                with open(output_file, "w") as f:
-                    f.write(f"Task: {task}\n\n")
-                    f.write(f"Timestamp: {datetime.now().isoformat()}\n\n")
-                    f.write("="*80 + "\n\n")
-                    if result:
-                        # Write all messages for full log
-                        for msg in result.messages:
-                            f.write(f"\n--- {getattr(msg, 'source', 'System')} ---\n")
-                            f.write(str(getattr(msg, 'content', msg)) + "\n")
-                
+            completed = True
+            if output_file is not None and not self._quiet:
                 self.console.print(f"\n✅ [green]Full output saved to:[/green] {output_file}")
             
-            return str(result) if result else ""
+            return answer_text
             
         except asyncio.CancelledError:
+            # An interrupted run can leave the team mid-conversation; rebuild it
+            await self.invalidate_team()
             self.console.print("\n\n⚠️ [yellow]Task cancelled by user.[/yellow]")
             raise
         except Exception as e:
+            await self.invalidate_team()
             self.console.print(f"\n❌ [red]Error during task execution:[/red] {str(e)}")
             raise
+        finally:
+            if log_file is not None:
+                await log_file.close()
+                if completed:
+                    await aiofiles.os.replace(log_file.name, output_file)
+                else:
+                    # Keep what was streamed for debugging, under a name
+                    # that cannot be mistaken for a finished transcript
+                    try:
+                        await aiofiles.os.replace(log_file.name, _partial_transcript_path(Path(log_file.name)))
+                    except OSError:
+                        pass
     
     def clear_conversation(self):
         """Clear conversation history to start fresh."""
-        self.conversation_history = []
+        self.conversation_history.clear()
         self.console.print("🗑️  [yellow]Conversation history cleared.[/yellow]")
     
     def show_conversation_history(self):
@@ -1578,12 +2059,56 @@ Specialized cryptocurrency analysis with:
             self.console.print("[dim]No conversation history yet.[/dim]")
             return
         
-        self.console.print("\n[bold cyan]📜 Conversation History:[/bold cyan]")
+        # One table, one print: Rich renders the whole history in a single pass
+        table = Table(title="📜 Conversation History", title_style="bold cyan", show_lines=True)
+        table.add_column("Turn", style="bold", justify="right")
+        table.add_column("Time", style="dim")
+        table.add_column("You", style="green")
+        table.add_column("AI", style="blue")
         for i, turn in enumerate(self.conversation_history, 1):
-            self.console.print(f"\n[bold]Turn {i}[/bold] ({turn['timestamp'][:19]})")
-            self.console.print(f"  [green]You:[/green] {turn['task'][:100]}{'...' if len(turn['task']) > 100 else ''}")
-            answer_preview = turn['answer'][:150] if turn['answer'] else "(no answer)"
-            self.console.print(f"  [blue]AI:[/blue] {answer_preview}{'...' if len(turn['answer']) > 150 else ''}")
+            task, answer = turn['task'], turn['answer']
+            table.add_row(
+                str(i),
+                turn['display_ts'],
+                f"{task[:100]}{'...' if len(task) > 100 else ''}",
+                f"{answer[:150]}{'...' if len(answer) > 150 else ''}" if answer else "(no answer)",
+            )
+        self.console.print(table)
+    
+    def _cmd_exit(self) -> bool:
+        """Handle 'exit' / 'quit' / 'q'. Returns False to leave the loop."""
+        self.console.print("\n👋 [yellow]Goodbye![/yellow]")
+        return False
+    
+    def _cmd_clear(self) -> None:
+        """Handle '/clear'."""
+        self.clear_conversation()
+    
+    def _cmd_history(self) -> None:
+        """Handle '/history'."""
+        self.show_conversation_history()
+    
+    def _cmd_toggle_single(self) -> None:
+        """Handle '/single' - toggle conversation mode."""
+        self._conversation_mode = not self._conversation_mode
+        mode_str = "ON 💬" if self._conversation_mode else "OFF 🔇"
+        self.console.print(f"[magenta]Conversation mode: {mode_str}[/magenta]")
+        if not self._conversation_mode:
+            self.clear_conversation()
+    
+    def _cmd_help(self) -> None:
+        """Handle '/help'."""
+        self.console.print(HELP_TEXT)
+    
+    # Interactive special commands, resolved with one dict lookup; built once
+    # per class rather than per instance
+    _COMMANDS = {
+        **dict.fromkeys(('exit', 'quit', 'q'), _cmd_exit),
+        '/clear': _cmd_clear,
+        '/history': _cmd_history,
+        '/single': _cmd_toggle_single,
+        '/help': _cmd_help,
+    }
     
     async def run_interactive_mode(self):
         """Run the crypto analysis platform in interactive mode with conversation support."""
@@ -1597,60 +2122,30 @@ Specialized cryptocurrency analysis with:
         self.console.print("[dim]Special commands: /clear (reset context), /history (show turns), /single (one-shot mode)[/dim]")
         self.console.print("Type 'exit' or 'quit' to stop. Press Ctrl+C to cancel a running task.\n")
         
-        conversation_mode = True  # Default to conversation mode
+        self._conversation_mode = True  # Default to conversation mode
         
         while True:
             try:
                 # Show conversation indicator
-                if conversation_mode and self.conversation_history:
+                if self._conversation_mode and self.conversation_history:
                     turn_count = len(self.conversation_history)
                     prompt = f"\n[bold green]Crypto Analysis ({turn_count} turns) >[/bold green] "
                 else:
                     prompt = "\n[bold green]Crypto Analysis >[/bold green] "
                 
-                task = self.console.input(prompt)
-                
-                # Handle special commands
-                if task.lower() in ['exit', 'quit', 'q']:
-                    self.console.print("\n👋 [yellow]Goodbye![/yellow]")
-                    break
-                
-                if task.lower() == '/clear':
-                    self.clear_conversation()
-                    continue
-                
-                if task.lower() == '/history':
-                    self.show_conversation_history()
-                    continue
-                
-                if task.lower() == '/single':
-                    conversation_mode = not conversation_mode
-                    mode_str = "ON 💬" if conversation_mode else "OFF 🔇"
-                    self.console.print(f"[magenta]Conversation mode: {mode_str}[/magenta]")
-                    if not conversation_mode:
-                        self.clear_conversation()
-                    continue
-                
-                if task.lower() == '/help':
-                    self.console.print("""
-[bold cyan]Available Commands:[/bold cyan]
-  /clear   - Clear conversation history and start fresh
-  /history - Show previous turns in this conversation
-  /single  - Toggle between conversation mode and one-shot mode
-  /help    - Show this help message
-  exit     - Exit the application
-
-[bold cyan]Conversation Mode:[/bold cyan]
-  When ON, agents remember previous questions and answers.
-  Ask follow-up questions like "now do the same for ETH" or "explain that further".
-""")
+                task = self.console.input(prompt).strip()
+                if not task:
                     continue
                 
-                if not task.strip():
+                # Handle special commands (single lookup, no .lower() chain)
+                cmd = self._COMMANDS.get(task.lower())
+                if cmd:
+                    if cmd(self) is False:
+                        break
                     continue
                 
                 # Execute task with conversation mode
-                await self.run_task(task, conversation_mode=conversation_mode)
+                await self.run_task(task, conversation_mode=self._conversation_mode)
                 
             except KeyboardInterrupt:
                 self.console.print("\n\n👋 [yellow]Interrupted by user. Goodbye![/yellow]")
@@ -1667,44 +2162,58 @@ Specialized cryptocurrency analysis with:
 _shutdown_requested = False
 
 
-def _signal_handler(signum, frame):
-    """Handle SIGINT (Ctrl+C) for graceful shutdown."""
+def _request_shutdown(main_task: asyncio.Task) -> None:
+    """Handle SIGINT (Ctrl+C) / SIGTERM for graceful shutdown."""
     global _shutdown_requested
     _shutdown_requested = True
     print("\n\n⚠️  Shutdown requested. Stopping gracefully...")
-    # Cancel all running tasks in the current event loop
+    # Cancelling main() propagates to everything it awaits; its finally
+    # block then closes the team and clients
+    main_task.cancel()
+
+
+def _install_shutdown_handlers() -> None:
+    """Route SIGINT/SIGTERM to _request_shutdown for the running main() task."""
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
     try:
-        loop = asyncio.get_running_loop()
-        for task in asyncio.all_tasks(loop):
-            if not task.done():
-                task.cancel()
-    except RuntimeError:
-        # No running loop
-        pass
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, _request_shutdown, main_task)
+    except (NotImplementedError, RuntimeError):
+        # Windows loops have no add_signal_handler and no catchable SIGTERM
+        signal.signal(
+            signal.SIGINT,
+            lambda signum, frame: loop.call_soon_threadsafe(_request_shutdown, main_task),
+        )
 
 
 async def main():
     """Main entry point for crypto analysis platform."""
-    config = AppConfig.from_env()
+    _install_shutdown_handlers()
+    config = get_config()
     app = CryptoAnalysisPlatform(config)
     
-    # Check command line arguments
-    if len(sys.argv) > 1:
-        # Run specific task from command line
-        task = " ".join(sys.argv[1:])
-        await app.run_task(task)
-    else:
-        # Run interactive mode
-        await app.run_interactive_mode()
+    try:
+        # Check command line arguments
+        if len(sys.argv) > 1:
+            # Run specific task from command line
+            task = " ".join(sys.argv[1:])
+            await app.run_task(task)
+        else:
+            # Run interactive mode
+            await app.run_interactive_mode()
+    finally:
+        # Also runs when the signal handler cancels the main task
+        await app.aclose()
 
 
 if __name__ == "__main__":
-    # Set up signal handler for graceful shutdown
-    signal.signal(signal.SIGINT, _signal_handler)
-    signal.signal(signal.SIGTERM, _signal_handler)
-    
     try:
-        asyncio.run(main())
+        # libuv-based loop when available (not on Windows)
+        if UVLOOP_AVAILABLE:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\n👋 Goodbye!")
     except asyncio.CancelledError:
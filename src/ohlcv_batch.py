@@ -0,0 +1,200 @@
+"""
+Columnar OHLCV Container
+
+Holds candle data as one contiguous array per field (int64 ``time`` in
+Unix seconds, float64 ``open/high/low/close/volume``) instead of a list of
+per-bar dicts. Indicator kernels read the columns directly, and the chart
+tools build their JSON payloads from the columns in one pass.
+
+Apache Arrow is optional. When pyarrow is installed a batch converts to
+and from an Arrow ``RecordBatch`` without copying the numeric buffers, can
+be written to an Arrow IPC file that another process (e.g. the code
+executor) memory-maps instead of re-parsing JSON, and can be persisted as
+ZSTD-compressed Parquet with time-range pushdown on read.
+
+Usage:
+    batch = OHLCVBatch.from_bars(json.loads(get_ohlcv_data("BTCUSDT"))["candles"])
+    rsi_values = indicators_numba.rsi(batch.close_view(), 14)
+"""
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+FIELDS = ("time",) + PRICE_FIELDS
+
+
+def parse_bar_time(ts: Any) -> int:
+    """Convert an ISO-8601 string or millisecond epoch to Unix seconds."""
+    if isinstance(ts, str):
+        return int(datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp())
+    return int(ts) // 1000
+
+
+class OHLCVBatch:
+    """Column-oriented OHLCV series with read-only numpy columns."""
+
+    __slots__ = FIELDS
+
+    def __init__(self, time, open, high, low, close, volume):
+        columns = (
+            np.ascontiguousarray(time, dtype=np.int64),
+            np.ascontiguousarray(open, dtype=np.float64),
+            np.ascontiguousarray(high, dtype=np.float64),
+            np.ascontiguousarray(low, dtype=np.float64),
+            np.ascontiguousarray(close, dtype=np.float64),
+            np.ascontiguousarray(volume, dtype=np.float64),
+        )
+        for name, column in zip(FIELDS, columns):
+            # Freeze a view so the caller's own array stays writeable
+            column = column.view()
+            column.flags.writeable = False
+            setattr(self, name, column)
+
+    @classmethod
+    def from_bars(cls, bars: Iterable[Mapping[str, Any]]) -> "OHLCVBatch":
+        """
+        Build a batch from exchange bar dicts (``get_ohlcv_data`` candles).
+
+        Each timestamp is parsed exactly once; missing volume becomes 0.
+        """
+        bars = list(bars)
+        n = len(bars)
+        time = np.empty(n, dtype=np.int64)
+        prices = np.empty((len(PRICE_FIELDS), n), dtype=np.float64)
+        for i, b in enumerate(bars):
+            time[i] = parse_bar_time(b["timestamp"])
+            prices[0, i] = b["open"]
+            prices[1, i] = b["high"]
+            prices[2, i] = b["low"]
+            prices[3, i] = b["close"]
+            prices[4, i] = b.get("volume", 0) or 0
+        return cls(time, *prices)
+
+    def __len__(self) -> int:
+        return self.time.shape[0]
+
+    def close_view(self) -> np.ndarray:
+        """Read-only contiguous float64 close prices for indicator kernels."""
+        return self.close
+
+    def candles(self, include_volume: bool = False) -> List[Dict[str, Any]]:
+        """Lightweight Charts candlestick data ({time, open, high, low, close})."""
+        columns = [self.time.tolist(), self.open.tolist(), self.high.tolist(),
+                   self.low.tolist(), self.close.tolist()]
+        keys = ["time", "open", "high", "low", "close"]
+        if include_volume:
+            columns.append(self.volume.tolist())
+            keys.append("volume")
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+
+    def volume_bars(self, up_color: str = "#26a69a", down_color: str = "#ef5350") -> List[Dict[str, Any]]:
+        """Lightweight Charts histogram data for volume, coloured by candle direction."""
+        up = (self.close >= self.open).tolist()
+        return [
+            {"time": t, "value": v, "color": up_color if is_up else down_color}
+            for t, v, is_up in zip(self.time.tolist(), self.volume.tolist(), up)
+        ]
+
+    def merge(self, other: "OHLCVBatch") -> "OHLCVBatch":
+        """
+        Combine two batches into one sorted by time.
+        
+        Bars present in both keep the values from ``other`` (the newer
+        fetch), so a still-forming candle is replaced by its update.
+        """
+        time = np.concatenate((other.time, self.time))
+        _, first = np.unique(time, return_index=True)
+        return OHLCVBatch(*(
+            np.concatenate((getattr(other, name), getattr(self, name)))[first]
+            for name in FIELDS
+        ))
+
+    def tail(self, n: int) -> "OHLCVBatch":
+        """Return the last n bars."""
+        return OHLCVBatch(*(getattr(self, name)[-n:] for name in FIELDS))
+
+    # -------------------------------------------------------------------------
+    # Arrow interop (optional)
+    # -------------------------------------------------------------------------
+
+    def to_arrow(self) -> "pa.RecordBatch":
+        """Wrap the columns in an Arrow RecordBatch without copying."""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow conversion")
+        return pa.RecordBatch.from_arrays(
+            [pa.array(getattr(self, name)) for name in FIELDS],
+            names=list(FIELDS),
+        )
+
+    @classmethod
+    def from_arrow(cls, batch: "pa.RecordBatch") -> "OHLCVBatch":
+        """Build a batch whose columns are zero-copy views of Arrow buffers."""
+        return cls(*(
+            batch.column(name).to_numpy(zero_copy_only=True) for name in FIELDS
+        ))
+
+    def write_ipc(self, path) -> None:
+        """Write the batch as an Arrow IPC file (e.g. under /dev/shm)."""
+        record_batch = self.to_arrow()
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa_ipc.new_file(sink, record_batch.schema) as writer:
+                writer.write_batch(record_batch)
+
+    @classmethod
+    def read_ipc(cls, path) -> "OHLCVBatch":
+        """Memory-map an Arrow IPC file written by write_ipc()."""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow IPC")
+        source = pa.memory_map(str(path), "r")
+        return cls.from_arrow(pa_ipc.open_file(source).get_batch(0))
+
+    def write_parquet(self, path) -> None:
+        """
+        Persist the batch as ZSTD-compressed Parquet.
+        
+        The file is written next to its destination and renamed into
+        place, so concurrent readers never see a partial file.
+        """
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        pq.write_table(
+            pa.Table.from_batches([self.to_arrow()]),
+            tmp_path,
+            compression="zstd",
+            use_dictionary=True,
+            row_group_size=50_000,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def read_parquet(cls, path, start: Optional[int] = None, end: Optional[int] = None) -> "OHLCVBatch":
+        """
+        Load a batch written by write_parquet().
+        
+        Args:
+            path: Parquet file path
+            start: Optional inclusive lower bound on ``time`` (Unix seconds)
+            end: Optional inclusive upper bound on ``time`` (Unix seconds)
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Parquet")
+        filters = []
+        if start is not None:
+            filters.append(("time", ">=", start))
+        if end is not None:
+            filters.append(("time", "<=", end))
+        table = pq.read_table(str(path), columns=list(FIELDS), filters=filters or None)
+        return cls(*(table.column(name).to_numpy() for name in FIELDS))
@@ -30,125 +30,52 @@ An AI-powered smart alerts system where agents collaborate to:
 This is like having a full trading team working 24/7 to find and 
 visualize the best setups - then explaining exactly why they matter!
 """
-import json
+import gzip
+import html
 import os
+import string
 from datetime import datetime
 from pathlib import Path
-from typing import Annotated, Optional, List, Dict, Any
+from typing import Annotated, Optional, List, Dict, Any, Set
+
+import numpy as np
 
 from chart_assets import LIGHTWEIGHT_CHARTS_SCRIPT
+import fast_json
 
 # Output directories
 ALERTS_DIR = Path("outputs/alerts")
 DASHBOARDS_DIR = Path("outputs/dashboards")
 
+# Output directories already created by this process
+_READY_DIRS: Set[Path] = set()
 
-def _ensure_dirs():
-    """Ensure output directories exist."""
-    ALERTS_DIR.mkdir(parents=True, exist_ok=True)
-    DASHBOARDS_DIR.mkdir(parents=True, exist_ok=True)
+# Icon and accent colour per trade direction (anything else renders bearish)
+_DIRECTION_STYLE = {
+    "bullish": ("📈", "#7ee787"),
+    "bearish": ("📉", "#ff7b72"),
+}
 
 
-def generate_smart_alerts_dashboard(
-    symbols: Annotated[str, "Comma-separated list of symbols to monitor: 'BTCUSDT,ETHUSDT,SOLUSDT'"],
-    alert_types: Annotated[str, "Types of alerts to generate: 'divergence,breakout,confluence,reversal'"] = "divergence,breakout,confluence",
-    timeframes: Annotated[str, "Timeframes to analyze: '15m,1H,4H,1D'"] = "1H,4H,1D",
-    min_score: Annotated[int, "Minimum confluence score (1-10) to trigger alert"] = 7,
-) -> str:
-    """
-    Generate an AI Smart Alerts Dashboard.
-    
-    This is the ULTIMATE trading tool that:
-    1. Scans multiple symbols for high-probability setups
-    2. Calculates confluence scores from multiple indicators
-    3. Generates annotated charts for each alert
-    4. Provides specific actionable trade ideas
-    
-    **Alert Types:**
-    - divergence: RSI/MACD divergence from price
-    - breakout: Key level breakouts with volume confirmation
-    - confluence: Multiple timeframe/indicator alignment
-    - reversal: Oversold/overbought reversals
-    
-    Args:
-        symbols: Trading pairs to monitor
-        alert_types: Types of alerts to check
-        timeframes: Timeframes for multi-TF analysis
-        min_score: Minimum score to generate alert
-        
-    Returns:
-        JSON with dashboard file path and detected alerts
-    """
-    _ensure_dirs()
-    
-    symbol_list = [s.strip() for s in symbols.split(",")]
-    alert_list = [a.strip() for a in alert_types.split(",")]
-    tf_list = [t.strip() for t in timeframes.split(",")]
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"smart_alerts_{timestamp}.html"
-    filepath = DASHBOARDS_DIR / filename
-    
-    # Generate mock alerts for demonstration
-    # In production, this would call the analysis agents
-    mock_alerts = [
-        {
-            "symbol": symbol_list[0] if symbol_list else "BTCUSDT",
-            "type": "confluence",
-            "score": 8,
-            "timeframe": "4H",
-            "direction": "bullish",
-            "entry": 65000,
-            "stop": 63500,
-            "target": 68000,
-            "rr_ratio": 2.0,
-            "signals": [
-                "RSI bouncing from 30 level",
-                "MACD histogram turning positive",
-                "Price at 200 EMA support",
-                "Funding rate turning negative (contrarian bullish)",
-            ],
-            "confidence": "HIGH",
-        },
-        {
-            "symbol": symbol_list[1] if len(symbol_list) > 1 else "ETHUSDT",
-            "type": "divergence",
-            "score": 7,
-            "timeframe": "1H",
-            "direction": "bearish",
-            "entry": 3500,
-            "stop": 3600,
-            "target": 3300,
-            "rr_ratio": 2.0,
-            "signals": [
-                "Bearish RSI divergence (higher price, lower RSI)",
-                "Volume declining on rallies",
-                "Near resistance zone",
-            ],
-            "confidence": "MEDIUM",
-        },
-    ]
-    
-    # Filter alerts by minimum score
-    active_alerts = [a for a in mock_alerts if a["score"] >= min_score]
-    
-    # Generate HTML dashboard
-    html_content = f'''<!DOCTYPE html>
+# Static parts of the Smart Alerts dashboard, built once at import; only
+# the header stats and the alerts JSON vary per call (the cards are cloned
+# from a <template> in the browser)
+_DASHBOARD_HEAD = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>🎯 AI Smart Alerts Dashboard</title>
-    {LIGHTWEIGHT_CHARTS_SCRIPT}
+    ''' + LIGHTWEIGHT_CHARTS_SCRIPT + '''
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ 
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { 
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: #0d1117;
             color: #c9d1d9;
             padding: 20px;
-        }}
-        .header {{
+        }
+        .header {
             display: flex;
             justify-content: space-between;
             align-items: center;
@@ -157,162 +84,162 @@ def generate_smart_alerts_dashboard(
             border-radius: 12px;
             margin-bottom: 20px;
             border: 1px solid #30363d;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             font-size: 28px;
             background: linear-gradient(90deg, #58a6ff, #7ee787);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
-        }}
-        .stats {{
+        }
+        .stats {
             display: flex;
             gap: 30px;
-        }}
-        .stat {{
+        }
+        .stat {
             text-align: center;
-        }}
-        .stat-value {{
+        }
+        .stat-value {
             font-size: 32px;
             font-weight: 700;
             color: #58a6ff;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             font-size: 12px;
             opacity: 0.7;
-        }}
-        .alerts-grid {{
+        }
+        .alerts-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
             gap: 20px;
             margin-bottom: 20px;
-        }}
-        .alert-card {{
+        }
+        .alert-card {
             background: #161b22;
             border-radius: 12px;
             border: 1px solid #30363d;
             overflow: hidden;
-        }}
-        .alert-header {{
+        }
+        .alert-header {
             padding: 15px 20px;
             display: flex;
             justify-content: space-between;
             align-items: center;
             border-bottom: 1px solid #30363d;
-        }}
-        .alert-symbol {{
+        }
+        .alert-symbol {
             font-size: 20px;
             font-weight: 700;
-        }}
-        .alert-type {{
+        }
+        .alert-type {
             padding: 4px 12px;
             border-radius: 20px;
             font-size: 12px;
             font-weight: 600;
             text-transform: uppercase;
-        }}
-        .type-confluence {{ background: #7ee787; color: #0d1117; }}
-        .type-divergence {{ background: #ff7b72; color: #0d1117; }}
-        .type-breakout {{ background: #58a6ff; color: #0d1117; }}
-        .type-reversal {{ background: #d2a8ff; color: #0d1117; }}
-        .alert-chart {{
+        }
+        .type-confluence { background: #7ee787; color: #0d1117; }
+        .type-divergence { background: #ff7b72; color: #0d1117; }
+        .type-breakout { background: #58a6ff; color: #0d1117; }
+        .type-reversal { background: #d2a8ff; color: #0d1117; }
+        .alert-chart {
             height: 250px;
             padding: 10px;
-        }}
-        .alert-body {{
+        }
+        .alert-body {
             padding: 20px;
-        }}
-        .signal-list {{
+        }
+        .signal-list {
             list-style: none;
             margin-bottom: 15px;
-        }}
-        .signal-list li {{
+        }
+        .signal-list li {
             padding: 8px 0;
             border-bottom: 1px solid #21262d;
             display: flex;
             align-items: center;
             gap: 10px;
-        }}
-        .signal-list li:last-child {{ border-bottom: none; }}
-        .signal-list li::before {{
+        }
+        .signal-list li:last-child { border-bottom: none; }
+        .signal-list li::before {
             content: '✓';
             color: #7ee787;
             font-weight: bold;
-        }}
-        .trade-levels {{
+        }
+        .trade-levels {
             display: grid;
             grid-template-columns: repeat(3, 1fr);
             gap: 10px;
             margin-top: 15px;
-        }}
-        .level {{
+        }
+        .level {
             background: #21262d;
             padding: 12px;
             border-radius: 8px;
             text-align: center;
-        }}
-        .level-label {{
+        }
+        .level-label {
             font-size: 11px;
             opacity: 0.7;
             margin-bottom: 4px;
-        }}
-        .level-value {{
+        }
+        .level-value {
             font-size: 18px;
             font-weight: 600;
-        }}
-        .level-value.entry {{ color: #58a6ff; }}
-        .level-value.stop {{ color: #ff7b72; }}
-        .level-value.target {{ color: #7ee787; }}
-        .confidence {{
+        }
+        .level-value.entry { color: #58a6ff; }
+        .level-value.stop { color: #ff7b72; }
+        .level-value.target { color: #7ee787; }
+        .confidence {
             display: flex;
             align-items: center;
             justify-content: space-between;
             margin-top: 15px;
             padding-top: 15px;
             border-top: 1px solid #21262d;
-        }}
-        .score {{
+        }
+        .score {
             display: flex;
             align-items: center;
             gap: 10px;
-        }}
-        .score-bar {{
+        }
+        .score-bar {
             width: 100px;
             height: 8px;
             background: #21262d;
             border-radius: 4px;
             overflow: hidden;
-        }}
-        .score-fill {{
+        }
+        .score-fill {
             height: 100%;
             background: linear-gradient(90deg, #ff7b72, #ffa657, #7ee787);
             border-radius: 4px;
-        }}
-        .confidence-badge {{
+        }
+        .confidence-badge {
             padding: 4px 12px;
             border-radius: 4px;
             font-size: 12px;
             font-weight: 600;
-        }}
-        .conf-high {{ background: #238636; }}
-        .conf-medium {{ background: #9e6a03; }}
-        .conf-low {{ background: #8b949e; }}
-        .direction {{
+        }
+        .conf-high { background: #238636; }
+        .conf-medium { background: #9e6a03; }
+        .conf-low { background: #8b949e; }
+        .direction {
             display: inline-flex;
             align-items: center;
             gap: 5px;
             padding: 4px 10px;
             border-radius: 4px;
             font-weight: 600;
-        }}
-        .bullish {{ background: rgba(126, 231, 135, 0.2); color: #7ee787; }}
-        .bearish {{ background: rgba(255, 123, 114, 0.2); color: #ff7b72; }}
-        .footer {{
+        }
+        .bullish { background: rgba(126, 231, 135, 0.2); color: #7ee787; }
+        .bearish { background: rgba(255, 123, 114, 0.2); color: #ff7b72; }
+        .footer {
             text-align: center;
             padding: 20px;
             opacity: 0.6;
             font-size: 12px;
-        }}
-        .refresh-btn {{
+        }
+        .refresh-btn {
             position: fixed;
             bottom: 30px;
             right: 30px;
@@ -324,254 +251,387 @@ def generate_smart_alerts_dashboard(
             cursor: pointer;
             font-size: 16px;
             box-shadow: 0 4px 12px rgba(0,0,0,0.4);
-        }}
-        .refresh-btn:hover {{ background: #2ea043; }}
+        }
+        .refresh-btn:hover { background: #2ea043; }
     </style>
 </head>
-<body>
+'''
+
+# Per-call part of the page; parsed once, filled with substitute()
+_DASHBOARD_BODY = string.Template('''<body>
     <div class="header">
         <div>
             <h1>🎯 AI Smart Alerts Dashboard</h1>
             <p style="opacity: 0.7; margin-top: 5px;">
-                Multi-Agent Analysis | {', '.join(symbol_list)} | {', '.join(tf_list)}
+                Multi-Agent Analysis | $symbols | $timeframes
             </p>
         </div>
         <div class="stats">
             <div class="stat">
-                <div class="stat-value">{len(active_alerts)}</div>
+                <div class="stat-value">$num_active</div>
                 <div class="stat-label">Active Alerts</div>
             </div>
             <div class="stat">
-                <div class="stat-value">{len(symbol_list)}</div>
+                <div class="stat-value">$num_symbols</div>
                 <div class="stat-label">Symbols</div>
             </div>
             <div class="stat">
-                <div class="stat-value">{min_score}+</div>
+                <div class="stat-value">${min_score}+</div>
                 <div class="stat-label">Min Score</div>
             </div>
         </div>
     </div>
     
-    <div class="alerts-grid">
-        {"".join([_generate_alert_card_html(alert, i) for i, alert in enumerate(active_alerts)])}
-    </div>
+    <div class="alerts-grid" id="alerts-grid"></div>
     
     <div class="footer">
-        <p>Generated by AITradingAdvisory Crypto Analysis Platform | {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+        <p>Generated by AITradingAdvisory Crypto Analysis Platform | $generated_at</p>
         <p>💡 Alerts are AI-generated suggestions. Always do your own research before trading.</p>
     </div>
     
     <button class="refresh-btn" onclick="location.reload()">🔄 Refresh Alerts</button>
 
+''')
+
+
+def _demo_candles_json(count: int = 101) -> str:
+    """
+    Deterministic demo candles for the alert mini charts.
+    
+    Rows are [open, high, low, close] relative to the last close, so the
+    page scales one series to each alert's entry price (and mirrors it for
+    bearish alerts) instead of simulating a random walk per card.
+    """
+    rng = np.random.default_rng(42)
+    closes = np.cumprod(1 + 0.0001 + (rng.random(count) - 0.5) * 0.005)
+    opens = np.concatenate(([1.0], closes[:-1]))
+    highs = np.maximum(opens, closes) * (1 + rng.random(count) * 0.002)
+    lows = np.minimum(opens, closes) * (1 - rng.random(count) * 0.002)
+    rows = np.column_stack([opens, highs, lows, closes]) / closes[-1]
+    return fast_json.dumps(np.round(rows, 6).tolist())
+
+
+_DASHBOARD_SCRIPT_TMPL = '''    <template id="alert-card-tmpl">
+        <div class="alert-card">
+            <div class="alert-header">
+                <div>
+                    <span class="alert-symbol"></span>
+                    <span class="direction"></span>
+                </div>
+                <span class="alert-type"></span>
+            </div>
+            <div class="alert-chart">
+                <div class="chart-box" style="width: 100%; height: 100%;"></div>
+            </div>
+            <div class="alert-body">
+                <p class="alert-timeframe" style="margin-bottom: 10px; opacity: 0.7;"></p>
+                <ul class="signal-list"></ul>
+                <div class="trade-levels">
+                    <div class="level">
+                        <div class="level-label">ENTRY</div>
+                        <div class="level-value entry"></div>
+                    </div>
+                    <div class="level">
+                        <div class="level-label">STOP LOSS</div>
+                        <div class="level-value stop"></div>
+                    </div>
+                    <div class="level">
+                        <div class="level-label">TARGET</div>
+                        <div class="level-value target"></div>
+                    </div>
+                </div>
+                <div class="confidence">
+                    <div class="score">
+                        <span class="score-text"></span>
+                        <div class="score-bar">
+                            <div class="score-fill"></div>
+                        </div>
+                    </div>
+                    <span class="confidence-badge"></span>
+                </div>
+            </div>
+        </div>
+    </template>
+
     <script>
+        // Demo candles shared by all cards: [open, high, low, close] / last close
+        const BASE_DATA = ''' + _demo_candles_json() + ''';
+        
+        const alerts = __ALERTS_JSON__;
+        
+        // Alert cards are cloned from the template; text is set via
+        // textContent, so alert fields are never parsed as HTML
+        const cardTemplate = document.getElementById('alert-card-tmpl');
+        const grid = document.getElementById('alerts-grid');
+        const price = value => '$' + Number(value).toLocaleString('en-US', { maximumFractionDigits: 8 });
+        
+        function renderAlertCard(alert, index) {
+            const card = cardTemplate.content.firstElementChild.cloneNode(true);
+            const field = selector => card.querySelector(selector);
+            const bullish = alert.direction === 'bullish';
+            
+            field('.alert-symbol').textContent = alert.symbol;
+            const direction = field('.direction');
+            direction.classList.add(bullish ? 'bullish' : 'bearish');
+            direction.textContent = `${bullish ? '📈' : '📉'} ${alert.direction.toUpperCase()}`;
+            const type = field('.alert-type');
+            type.classList.add(`type-${alert.type}`);
+            type.textContent = alert.type;
+            field('.chart-box').id = `chart-${index}`;
+            field('.alert-timeframe').textContent = `${alert.timeframe} Timeframe`;
+            
+            const signals = field('.signal-list');
+            for (const signal of alert.signals) {
+                const item = document.createElement('li');
+                item.textContent = signal;
+                signals.appendChild(item);
+            }
+            
+            field('.level-value.entry').textContent = price(alert.entry);
+            field('.level-value.stop').textContent = price(alert.stop);
+            field('.level-value.target').textContent = price(alert.target);
+            field('.score-text').textContent = `Score: ${alert.score}/10`;
+            field('.score-fill').style.width = `${alert.score * 10}%`;
+            const badge = field('.confidence-badge');
+            badge.classList.add(`conf-${alert.confidence.toLowerCase()}`);
+            badge.textContent = alert.confidence;
+            
+            grid.appendChild(card);
+        }
+        
+        alerts.forEach(renderAlertCard);
+        
         // Initialize mini charts for each alert
-        const alerts = {json.dumps(active_alerts)};
         
-        alerts.forEach((alert, index) => {{
-            const container = document.getElementById(`chart-${{index}}`);
+        alerts.forEach((alert, index) => {
+            const container = document.getElementById(`chart-${index}`);
             if (!container) return;
             
-            const chart = LightweightCharts.createChart(container, {{
+            const chart = LightweightCharts.createChart(container, {
                 width: container.clientWidth,
                 height: 230,
-                layout: {{
-                    background: {{ color: '#0d1117' }},
+                layout: {
+                    background: { color: '#0d1117' },
                     textColor: '#8b949e',
-                }},
-                grid: {{
-                    vertLines: {{ color: '#21262d' }},
-                    horzLines: {{ color: '#21262d' }},
-                }},
-                rightPriceScale: {{ borderVisible: false }},
-                timeScale: {{ borderVisible: false }},
-            }});
+                },
+                grid: {
+                    vertLines: { color: '#21262d' },
+                    horzLines: { color: '#21262d' },
+                },
+                rightPriceScale: { borderVisible: false },
+                timeScale: { borderVisible: false },
+            });
             
-            const series = chart.addCandlestickSeries({{
+            const series = chart.addCandlestickSeries({
                 upColor: '#7ee787',
                 downColor: '#ff7b72',
                 borderDownColor: '#ff7b72',
                 borderUpColor: '#7ee787',
                 wickDownColor: '#ff7b72',
                 wickUpColor: '#7ee787',
-            }});
+            });
             
-            // Generate demo data
-            const data = generateData(alert.direction === 'bullish');
+            // Demo data ending at the alert's entry price
+            const data = demoData(alert.entry, alert.direction === 'bullish');
             series.setData(data);
             
             // Add entry/stop/target lines
-            series.createPriceLine({{
+            series.createPriceLine({
                 price: alert.entry,
                 color: '#58a6ff',
                 lineWidth: 2,
                 lineStyle: 2,
                 title: 'Entry',
-            }});
-            series.createPriceLine({{
+            });
+            series.createPriceLine({
                 price: alert.stop,
                 color: '#ff7b72',
                 lineWidth: 1,
                 lineStyle: 2,
                 title: 'Stop',
-            }});
-            series.createPriceLine({{
+            });
+            series.createPriceLine({
                 price: alert.target,
                 color: '#7ee787',
                 lineWidth: 1,
                 lineStyle: 2,
                 title: 'Target',
-            }});
+            });
             
             chart.timeScale().fitContent();
-        }});
+        });
         
-        function generateData(bullish) {{
-            const data = [];
+        function demoData(price, bullish) {
             const now = Math.floor(Date.now() / 1000);
-            let price = 65000;
-            
-            for (let i = 100; i >= 0; i--) {{
-                const time = now - i * 3600;
-                const trend = bullish ? 0.0001 : -0.0001;
-                const open = price;
-                price = price * (1 + trend + (Math.random() - 0.5) * 0.005);
-                const close = price;
-                const high = Math.max(open, close) * (1 + Math.random() * 0.002);
-                const low = Math.min(open, close) * (1 - Math.random() * 0.002);
-                data.push({{ time, open, high, low, close }});
-            }}
-            return data;
-        }}
+            const last = BASE_DATA.length - 1;
+            return BASE_DATA.map(([o, h, l, c], i) => {
+                const time = now - (last - i) * 3600;
+                if (bullish) {
+                    return { time, open: o * price, high: h * price, low: l * price, close: c * price };
+                }
+                // Mirrored around the last close: a falling market
+                return { time, open: (2 - o) * price, high: (2 - l) * price, low: (2 - h) * price, close: (2 - c) * price };
+            });
+        }
     </script>
 </body>
 </html>
 '''
-    
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(html_content)
-    
-    return json.dumps({
-        "status": "success",
-        "message": "AI Smart Alerts Dashboard generated",
-        "dashboard_file": str(filepath.absolute()),
-        "filename": filename,
-        "active_alerts": len(active_alerts),
-        "symbols_scanned": symbol_list,
-        "timeframes": tf_list,
-        "alert_types": alert_list,
-        "alerts": active_alerts,
-        "open_command": f"open {filepath.absolute()}",
-    }, indent=2)
 
+# Static parts pre-encoded; a call only encodes its body and the alerts
+# JSON, and the page is assembled with a single bytes join
+_DASHBOARD_HEAD_BYTES = _DASHBOARD_HEAD.encode("utf-8")
+_DASHBOARD_SCRIPT_PRE, _DASHBOARD_SCRIPT_POST = (
+    part.encode("utf-8") for part in _DASHBOARD_SCRIPT_TMPL.split("__ALERTS_JSON__")
+)
 
-def _generate_alert_card_html(alert: dict, index: int) -> str:
-    """Generate HTML for a single alert card."""
-    direction_class = "bullish" if alert["direction"] == "bullish" else "bearish"
-    direction_icon = "📈" if alert["direction"] == "bullish" else "📉"
-    conf_class = f"conf-{alert['confidence'].lower()}"
-    
-    signals_html = "\n".join([f"<li>{signal}</li>" for signal in alert["signals"]])
-    
-    return f'''
-    <div class="alert-card">
-        <div class="alert-header">
-            <div>
-                <span class="alert-symbol">{alert["symbol"]}</span>
-                <span class="direction {direction_class}">{direction_icon} {alert["direction"].upper()}</span>
-            </div>
-            <span class="alert-type type-{alert['type']}">{alert["type"]}</span>
-        </div>
-        <div class="alert-chart">
-            <div id="chart-{index}" style="width: 100%; height: 100%;"></div>
-        </div>
-        <div class="alert-body">
-            <p style="margin-bottom: 10px; opacity: 0.7;">{alert["timeframe"]} Timeframe</p>
-            <ul class="signal-list">
-                {signals_html}
-            </ul>
-            <div class="trade-levels">
-                <div class="level">
-                    <div class="level-label">ENTRY</div>
-                    <div class="level-value entry">${alert["entry"]:,}</div>
-                </div>
-                <div class="level">
-                    <div class="level-label">STOP LOSS</div>
-                    <div class="level-value stop">${alert["stop"]:,}</div>
-                </div>
-                <div class="level">
-                    <div class="level-label">TARGET</div>
-                    <div class="level-value target">${alert["target"]:,}</div>
-                </div>
-            </div>
-            <div class="confidence">
-                <div class="score">
-                    <span>Score: {alert["score"]}/10</span>
-                    <div class="score-bar">
-                        <div class="score-fill" style="width: {alert['score'] * 10}%;"></div>
-                    </div>
-                </div>
-                <span class="confidence-badge {conf_class}">{alert["confidence"]}</span>
-            </div>
-        </div>
-    </div>
-    '''
 
+def _ensure_dirs():
+    """Ensure output directories exist (mkdir once per directory and process)."""
+    for directory in (ALERTS_DIR, DASHBOARDS_DIR):
+        if directory not in _READY_DIRS:
+            directory.mkdir(parents=True, exist_ok=True)
+            _READY_DIRS.add(directory)
 
-def create_trade_idea_alert(
-    symbol: Annotated[str, "Trading pair symbol"],
-    direction: Annotated[str, "'bullish' or 'bearish'"],
-    entry_price: Annotated[float, "Suggested entry price"],
-    stop_loss: Annotated[float, "Stop loss level"],
-    take_profit: Annotated[float, "Take profit target"],
-    signals: Annotated[str, "JSON array of signal descriptions"],
-    timeframe: Annotated[str, "Analysis timeframe"] = "4H",
-    confidence: Annotated[str, "'HIGH', 'MEDIUM', or 'LOW'"] = "MEDIUM",
-    notes: Annotated[Optional[str], "Additional analysis notes"] = None,
+
+def generate_smart_alerts_dashboard(
+    symbols: Annotated[str, "Comma-separated list of symbols to monitor: 'BTCUSDT,ETHUSDT,SOLUSDT'"],
+    alert_types: Annotated[str, "Types of alerts to generate: 'divergence,breakout,confluence,reversal'"] = "divergence,breakout,confluence",
+    timeframes: Annotated[str, "Timeframes to analyze: '15m,1H,4H,1D'"] = "1H,4H,1D",
+    min_score: Annotated[int, "Minimum confluence score (1-10) to trigger alert"] = 7,
+    compress: Annotated[bool, "Write a gzip-compressed .html.gz instead of plain HTML"] = False,
 ) -> str:
     """
-    Create a specific trade idea alert with chart.
+    Generate an AI Smart Alerts Dashboard.
     
-    This tool creates a focused alert for a single high-conviction trade idea.
-    Use this when you've identified a specific opportunity through analysis.
+    This is the ULTIMATE trading tool that:
+    1. Scans multiple symbols for high-probability setups
+    2. Calculates confluence scores from multiple indicators
+    3. Generates annotated charts for each alert
+    4. Provides specific actionable trade ideas
+    
+    **Alert Types:**
+    - divergence: RSI/MACD divergence from price
+    - breakout: Key level breakouts with volume confirmation
+    - confluence: Multiple timeframe/indicator alignment
+    - reversal: Oversold/overbought reversals
     
     Args:
-        symbol: Trading pair
-        direction: Trade direction
-        entry_price: Entry level
-        stop_loss: Stop level
-        take_profit: Target level
-        signals: JSON array of supporting signals
-        timeframe: Chart timeframe
-        confidence: Confidence level
-        notes: Additional context
+        symbols: Trading pairs to monitor
+        alert_types: Types of alerts to check
+        timeframes: Timeframes for multi-TF analysis
+        min_score: Minimum score to generate alert
+        compress: Store the page gzip-compressed (about a fifth of the size),
+            for dashboards that are served or copied rather than opened locally
         
     Returns:
-        JSON with alert file path
+        JSON with dashboard file path and detected alerts
     """
     _ensure_dirs()
     
-    signal_list = json.loads(signals)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{symbol}_trade_idea_{timestamp}.html"
-    filepath = ALERTS_DIR / filename
+    symbol_list = [s.strip() for s in symbols.split(",")]
+    alert_list = [a.strip() for a in alert_types.split(",")]
+    tf_list = [t.strip() for t in timeframes.split(",")]
     
-    # Calculate risk/reward
-    risk = abs(entry_price - stop_loss)
-    reward = abs(take_profit - entry_price)
-    rr_ratio = reward / risk if risk > 0 else 0
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    generated_at = now.strftime("%Y-%m-%d %H:%M:%S")
+    filename = f"smart_alerts_{timestamp}.html"
+    filepath = DASHBOARDS_DIR / filename
     
-    direction_icon = "📈" if direction == "bullish" else "📉"
-    direction_color = "#7ee787" if direction == "bullish" else "#ff7b72"
+    # Generate mock alerts for demonstration
+    # In production, this would call the analysis agents
+    mock_alerts = [
+        {
+            "symbol": symbol_list[0] if symbol_list else "BTCUSDT",
+            "type": "confluence",
+            "score": 8,
+            "timeframe": "4H",
+            "direction": "bullish",
+            "entry": 65000,
+            "stop": 63500,
+            "target": 68000,
+            "rr_ratio": 2.0,
+            "signals": [
+                "RSI bouncing from 30 level",
+                "MACD histogram turning positive",
+                "Price at 200 EMA support",
+                "Funding rate turning negative (contrarian bullish)",
+            ],
+            "confidence": "HIGH",
+        },
+        {
+            "symbol": symbol_list[1] if len(symbol_list) > 1 else "ETHUSDT",
+            "type": "divergence",
+            "score": 7,
+            "timeframe": "1H",
+            "direction": "bearish",
+            "entry": 3500,
+            "stop": 3600,
+            "target": 3300,
+            "rr_ratio": 2.0,
+            "signals": [
+                "Bearish RSI divergence (higher price, lower RSI)",
+                "Volume declining on rallies",
+                "Near resistance zone",
+            ],
+            "confidence": "MEDIUM",
+        },
+    ]
+    
+    # Filter alerts by minimum score
+    active_alerts = [a for a in mock_alerts if a["score"] >= min_score]
+    num_active = len(active_alerts)
     
-    signals_html = "\n".join([f"<li>✓ {s}</li>" for s in signal_list])
+    # Only the body is filled in per call; head/style and script are static
+    body_html = _DASHBOARD_BODY.substitute(
+        symbols=html.escape(", ".join(symbol_list)),
+        timeframes=html.escape(", ".join(tf_list)),
+        num_active=num_active,
+        num_symbols=len(symbol_list),
+        min_score=min_score,
+        generated_at=generated_at,
+    )
+    data = b"".join([
+        _DASHBOARD_HEAD_BYTES,
+        body_html.encode("utf-8"),
+        _DASHBOARD_SCRIPT_PRE,
+        # "<\/" keeps a "</script>" inside alert text from closing the script
+        fast_json.dumps_bytes(active_alerts).replace(b"</", b"<\\/"),
+        _DASHBOARD_SCRIPT_POST,
+    ])
+    if compress:
+        filename += ".gz"
+        filepath = DASHBOARDS_DIR / filename
+        data = gzip.compress(data, compresslevel=6)
+        open_command = f"gunzip -k {filepath.absolute()} && open {filepath.with_suffix('').absolute()}"
+    else:
+        open_command = f"open {filepath.absolute()}"
+    filepath.write_bytes(data)
     
-    html_content = f'''<!DOCTYPE html>
+    return fast_json.dumps_indent({
+        "status": "success",
+        "message": "AI Smart Alerts Dashboard generated",
+        "dashboard_file": str(filepath.absolute()),
+        "filename": filename,
+        "active_alerts": num_active,
+        "symbols_scanned": symbol_list,
+        "timeframes": tf_list,
+        "alert_types": alert_list,
+        "alerts": active_alerts,
+        "open_command": open_command,
+    })
+
+
+# Trade idea page as a str.format template (literal braces doubled);
+# filled by _write_trade_idea via format_map
+_TRADE_IDEA_TMPL = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{direction_icon} {symbol} Trade Idea</title>
-    {LIGHTWEIGHT_CHARTS_SCRIPT}
+    ''' + LIGHTWEIGHT_CHARTS_SCRIPT.replace("{", "{{").replace("}", "}}") + '''
     <style>
         * {{ margin: 0; padding: 0; box-sizing: border-box; }}
         body {{ 
@@ -669,7 +729,7 @@ def create_trade_idea_alert(
 <body>
     <div class="header">
         <h1>{direction_icon} {symbol}</h1>
-        <div class="direction-badge">{direction.upper()} SETUP</div>
+        <div class="direction-badge">{direction_upper} SETUP</div>
         <p style="margin-top: 15px; opacity: 0.7;">{timeframe} Timeframe | Confidence: {confidence}</p>
     </div>
     
@@ -680,19 +740,19 @@ def create_trade_idea_alert(
     <div class="levels-grid">
         <div class="level-card">
             <div class="level-label">ENTRY</div>
-            <div class="level-value entry">${entry_price:,.2f}</div>
+            <div class="level-value entry">${entry_fmt}</div>
         </div>
         <div class="level-card">
             <div class="level-label">STOP LOSS</div>
-            <div class="level-value stop">${stop_loss:,.2f}</div>
+            <div class="level-value stop">${stop_fmt}</div>
         </div>
         <div class="level-card">
             <div class="level-label">TAKE PROFIT</div>
-            <div class="level-value target">${take_profit:,.2f}</div>
+            <div class="level-value target">${target_fmt}</div>
         </div>
         <div class="level-card">
             <div class="level-label">RISK/REWARD</div>
-            <div class="level-value rr">1:{rr_ratio:.1f}</div>
+            <div class="level-value rr">{risk_reward}</div>
         </div>
     </div>
     
@@ -701,11 +761,11 @@ def create_trade_idea_alert(
         <ul>
             {signals_html}
         </ul>
-        {"<div class='notes'><strong>📝 Notes:</strong> " + notes + "</div>" if notes else ""}
+        {notes_html}
     </div>
     
     <div class="footer">
-        <p>Generated by AITradingAdvisory AI | {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+        <p>Generated by AITradingAdvisory AI | {generated_at}</p>
         <p>⚠️ This is an AI-generated trade idea. Always manage your risk appropriately.</p>
     </div>
 
@@ -732,7 +792,7 @@ def create_trade_idea_alert(
         const data = [];
         const now = Math.floor(Date.now() / 1000);
         let price = {entry_price};
-        const bullish = "{direction}" === "bullish";
+        const bullish = {direction_json} === "bullish";
         
         for (let i = 100; i >= 0; i--) {{
             const time = now - i * 3600;
@@ -773,13 +833,177 @@ def create_trade_idea_alert(
 </body>
 </html>
 '''
+
+
+def create_trade_idea_alert(
+    symbol: Annotated[str, "Trading pair symbol"],
+    direction: Annotated[str, "'bullish' or 'bearish'"],
+    entry_price: Annotated[float, "Suggested entry price"],
+    stop_loss: Annotated[float, "Stop loss level"],
+    take_profit: Annotated[float, "Take profit target"],
+    signals: Annotated[str, "JSON array of signal descriptions"],
+    timeframe: Annotated[str, "Analysis timeframe"] = "4H",
+    confidence: Annotated[str, "'HIGH', 'MEDIUM', or 'LOW'"] = "MEDIUM",
+    notes: Annotated[Optional[str], "Additional analysis notes"] = None,
+) -> str:
+    """
+    Create a specific trade idea alert with chart.
     
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    This tool creates a focused alert for a single high-conviction trade idea.
+    Use this when you've identified a specific opportunity through analysis.
     
-    return json.dumps({
+    Args:
+        symbol: Trading pair
+        direction: Trade direction
+        entry_price: Entry level
+        stop_loss: Stop level
+        take_profit: Target level
+        signals: JSON array of supporting signals
+        timeframe: Chart timeframe
+        confidence: Confidence level
+        notes: Additional context
+        
+    Returns:
+        JSON with alert file path
+    """
+    _ensure_dirs()
+    
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    alert = _write_trade_idea(
+        filename=f"{symbol}_trade_idea_{timestamp}.html",
+        generated_at=now.strftime("%Y-%m-%d %H:%M:%S"),
+        symbol=symbol,
+        direction=direction,
+        entry_price=entry_price,
+        stop_loss=stop_loss,
+        take_profit=take_profit,
+        signal_list=fast_json.loads(signals),
+        timeframe=timeframe,
+        confidence=confidence,
+        notes=notes,
+    )
+    
+    return fast_json.dumps_indent({
         "status": "success",
         "message": "Trade idea alert generated",
+        **alert,
+    })
+
+
+def create_trade_idea_alerts_batch(
+    ideas: Annotated[str, "JSON array of trade ideas, each with symbol, direction, entry_price, stop_loss, take_profit, signals (array) and optional timeframe, confidence, notes"],
+) -> str:
+    """
+    Create trade idea alerts for several setups in one call.
+    
+    Use this instead of repeated create_trade_idea_alert calls when a scan
+    produced more than one idea: the output directories are checked and the
+    clock is read once for the whole batch.
+    
+    Args:
+        ideas: JSON array of trade ideas (same fields as create_trade_idea_alert)
+        
+    Returns:
+        JSON with one entry (file path and trade summary) per idea
+    """
+    _ensure_dirs()
+    
+    idea_list = fast_json.loads(ideas)
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    generated_at = now.strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Risk/reward for the whole batch in one vectorised pass
+    levels = np.array(
+        [[idea["entry_price"], idea["stop_loss"], idea["take_profit"]] for idea in idea_list],
+        dtype=float,
+    ).reshape(-1, 3)
+    entries, stops, targets = levels.T
+    risks = np.abs(entries - stops)
+    rr_ratios = np.divide(np.abs(targets - entries), risks, out=np.zeros_like(risks), where=risks > 0)
+    
+    alerts = []
+    for number, (idea, (entry, stop, target), rr_ratio) in enumerate(zip(idea_list, levels, rr_ratios), 1):
+        symbol = idea["symbol"]
+        signal_list = idea.get("signals", [])
+        if isinstance(signal_list, str):
+            signal_list = fast_json.loads(signal_list)
+        alerts.append(_write_trade_idea(
+            # Numbered: ideas in one batch share the timestamp
+            filename=f"{symbol}_trade_idea_{timestamp}_{number}.html",
+            generated_at=generated_at,
+            symbol=symbol,
+            direction=idea["direction"],
+            entry_price=float(entry),
+            stop_loss=float(stop),
+            take_profit=float(target),
+            signal_list=signal_list,
+            timeframe=idea.get("timeframe", "4H"),
+            confidence=idea.get("confidence", "MEDIUM"),
+            notes=idea.get("notes"),
+            rr_ratio=float(rr_ratio),
+        ))
+    
+    return fast_json.dumps_indent({
+        "status": "success",
+        "message": f"{len(alerts)} trade idea alerts generated",
+        "alerts": alerts,
+    })
+
+
+def _write_trade_idea(
+    filename: str,
+    generated_at: str,
+    symbol: str,
+    direction: str,
+    entry_price: float,
+    stop_loss: float,
+    take_profit: float,
+    signal_list: List[str],
+    timeframe: str,
+    confidence: str,
+    notes: Optional[str],
+    rr_ratio: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Render one trade idea page into ALERTS_DIR and describe it."""
+    filepath = ALERTS_DIR / filename
+    
+    # Calculate risk/reward (batches pass it in precomputed)
+    if rr_ratio is None:
+        risk = abs(entry_price - stop_loss)
+        reward = abs(take_profit - entry_price)
+        rr_ratio = reward / risk if risk > 0 else 0
+    risk_reward = f"1:{rr_ratio:.1f}"
+    
+    direction_icon, direction_color = _DIRECTION_STYLE.get(direction, _DIRECTION_STYLE["bearish"])
+    
+    # Prices are formatted once here and referenced by name in the template;
+    # every agent-supplied string is HTML-escaped before it is interpolated,
+    # or JSON-encoded (with "</" escaped) where it lands inside the script
+    html_content = _TRADE_IDEA_TMPL.format_map({
+        "symbol": html.escape(symbol),
+        "direction_json": fast_json.dumps(direction).replace("</", "<\\/"),
+        "direction_upper": html.escape(direction.upper()),
+        "direction_icon": direction_icon,
+        "direction_color": direction_color,
+        "timeframe": html.escape(timeframe),
+        "confidence": html.escape(confidence),
+        "entry_price": entry_price,
+        "stop_loss": stop_loss,
+        "take_profit": take_profit,
+        "entry_fmt": format(entry_price, ",.2f"),
+        "stop_fmt": format(stop_loss, ",.2f"),
+        "target_fmt": format(take_profit, ",.2f"),
+        "risk_reward": risk_reward,
+        "signals_html": "\n".join(f"<li>✓ {html.escape(str(s))}</li>" for s in signal_list),
+        "notes_html": f"<div class='notes'><strong>📝 Notes:</strong> {html.escape(notes)}</div>" if notes else "",
+        "generated_at": generated_at,
+    })
+    
+    filepath.write_bytes(html_content.encode("utf-8"))
+    
+    return {
         "alert_file": str(filepath.absolute()),
         "filename": filename,
         "trade_idea": {
@@ -788,9 +1012,9 @@ def create_trade_idea_alert(
             "entry": entry_price,
             "stop_loss": stop_loss,
             "take_profit": take_profit,
-            "risk_reward": f"1:{rr_ratio:.1f}",
+            "risk_reward": risk_reward,
             "confidence": confidence,
             "signals": signal_list,
         },
         "open_command": f"open {filepath.absolute()}",
-    }, indent=2)
+    }
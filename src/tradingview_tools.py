@@ -17,12 +17,17 @@ Key Features:
 """
 import json
 import os
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Annotated, Optional, List, Dict, Any
+from typing import Annotated, Optional, List, Dict, Any, Tuple
 import pandas as pd
 
 from chart_assets import LIGHTWEIGHT_CHARTS_SCRIPT
+import fast_json
+from ohlcv_batch import OHLCVBatch, PYARROW_AVAILABLE
 
 # Get project root directory (parent of src/)
 _PROJECT_ROOT = Path(__file__).parent.parent.resolve()
@@ -51,12 +56,136 @@ ANNOTATION_TYPES = {
 # Output directory for charts - use absolute path to project root
 CHART_OUTPUT_DIR = _PROJECT_ROOT / "outputs" / "charts"
 
+# Persisted OHLCV bars (Parquet, requires pyarrow)
+OHLCV_CACHE_DIR = _PROJECT_ROOT / "outputs" / "cache" / "ohlcv"
+
+# Most recent bars kept per symbol/interval file; older bars are dropped
+OHLCV_CACHE_MAX_BARS = 5000
+
+# Seconds a cached still-forming candle is trusted before refetching
+OHLCV_CACHE_TTL = 60
+
+
+# Chart interval -> exchange interval
+_INTERVAL_MAP = {
+    "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
+    "1H": "1h", "1h": "1h", "4H": "4h", "4h": "4h",
+    "1D": "1d", "1d": "1d", "1W": "1w", "1w": "1w",
+}
+
+# Exchange interval -> bar length in seconds
+_INTERVAL_SECONDS = {
+    "1m": 60, "5m": 300, "15m": 900, "30m": 1800,
+    "1h": 3600, "4h": 14400, "1d": 86400, "1w": 604800,
+}
+
+# Single writer so read-merge-write cycles on one file never interleave
+_ohlcv_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ohlcv-cache")
+
 
 def _ensure_output_dir():
     """Ensure the chart output directory exists."""
     CHART_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _ohlcv_cache_path(symbol: str, interval: str) -> Path:
+    """Parquet file holding the persisted bars for a symbol/interval."""
+    safe_symbol = re.sub(r"[^A-Za-z0-9_-]", "_", symbol.upper())
+    return OHLCV_CACHE_DIR / f"{safe_symbol}_{_INTERVAL_MAP.get(interval, '1h')}.parquet"
+
+
+def _write_ohlcv(batch: OHLCVBatch, path: Path) -> None:
+    """Merge bars into the Parquet file, keeping the newest OHLCV_CACHE_MAX_BARS."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            batch = OHLCVBatch.read_parquet(path).merge(batch)
+        batch.tail(OHLCV_CACHE_MAX_BARS).write_parquet(path)
+    except Exception:
+        pass  # Cache is an optimization only
+
+
+def _persist_ohlcv(batch: OHLCVBatch, symbol: str, interval: str) -> Optional[Future]:
+    """Queue freshly fetched bars for the background cache writer."""
+    if not PYARROW_AVAILABLE:
+        return None
+    return _ohlcv_writer.submit(_write_ohlcv, batch, _ohlcv_cache_path(symbol, interval))
+
+
+def _read_persisted_ohlcv(symbol: str, interval: str, limit: int, fresh_only: bool = False) -> Optional[OHLCVBatch]:
+    """
+    Return the last `limit` persisted bars, or None if nothing usable is cached.
+    
+    With fresh_only, the cache only counts if it holds `limit` bars ending
+    in the current (still-forming) candle and was written within
+    OHLCV_CACHE_TTL seconds, i.e. it can stand in for an exchange fetch.
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+    try:
+        path = _ohlcv_cache_path(symbol, interval)
+        if not path.exists():
+            return None
+        if not fresh_only:
+            batch = OHLCVBatch.read_parquet(path)
+            return batch.tail(limit) if len(batch) else None
+        
+        now = time.time()
+        if now - path.stat().st_mtime > OHLCV_CACHE_TTL:
+            return None
+        step = _INTERVAL_SECONDS[_INTERVAL_MAP.get(interval, "1h")]
+        current_open = int(now) // step * step
+        batch = OHLCVBatch.read_parquet(path, start=current_open - (limit - 1) * step)
+        if len(batch) < limit or batch.time[-1] < current_open:
+            return None
+        return batch.tail(limit)
+    except Exception:
+        return None
+
+
+def _load_ohlcv(symbol: str, interval: str, limit: int = 200) -> Tuple[Optional[OHLCVBatch], str]:
+    """
+    Load OHLCV bars as a columnar batch, using the Parquet cache when fresh.
+    
+    A cache covering the requested range up to the current candle skips the
+    exchange call. Otherwise bars are fetched and written to the cache in
+    the background; if the exchange is unreachable the most recent
+    persisted bars are returned and labelled as stale.
+    
+    Args:
+        symbol: Trading pair symbol
+        interval: Chart interval (mapped to the exchange format)
+        limit: Number of bars to fetch
+        
+    Returns:
+        (OHLCVBatch or None if no bars are available, data source label)
+    """
+    batch = _read_persisted_ohlcv(symbol, interval, limit, fresh_only=True)
+    if batch is not None:
+        return batch, f"Bitget cache ({len(batch)} bars)"
+    
+    try:
+        from exchange_tools import get_ohlcv_data
+        
+        exchange_interval = _INTERVAL_MAP.get(interval, "1h")
+        result = fast_json.loads(get_ohlcv_data(symbol, exchange_interval, limit=limit))
+        
+        # Handle both "data" and "candles" keys in response
+        bars = result.get("data") or result.get("candles")
+        if bars:
+            batch = OHLCVBatch.from_bars(bars)
+            _persist_ohlcv(batch, symbol, interval)
+            return batch, f"Bitget ({len(batch)} bars)"
+    except Exception:
+        pass
+    
+    batch = _read_persisted_ohlcv(symbol, interval, limit)
+    if batch is not None:
+        last_bar = datetime.fromtimestamp(int(batch.time[-1])).strftime("%Y-%m-%d %H:%M")
+        return batch, f"Bitget cache, stale ({len(batch)} bars, last {last_bar})"
+    return None, "placeholder"
+
+
 def generate_tradingview_chart(
     symbol: Annotated[str, "Trading pair symbol (e.g., 'BTCUSDT', 'ETHUSDT')"],
     interval: Annotated[str, "Chart interval: '1m', '5m', '15m', '1H', '4H', '1D', '1W'"] = "1H",
@@ -98,56 +227,21 @@ def generate_tradingview_chart(
         chart_title = title or f"{symbol} {interval} Chart"
         filename = f"{symbol}_{interval}_{timestamp}.html"
         filepath = CHART_OUTPUT_DIR / filename
-        data_source = "placeholder"  # Will be updated if real data is fetched
         
-        # Try to fetch real OHLCV data from exchange
+        # Try to fetch real OHLCV data (cache or exchange); "placeholder" otherwise
         real_data = None
-        try:
-            from exchange_tools import get_ohlcv_data
-            
-            # Map interval to exchange format
-            interval_map = {
-                "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
-                "1H": "1h", "1h": "1h", "4H": "4h", "4h": "4h",
-                "1D": "1d", "1d": "1d", "1W": "1w", "1w": "1w",
+        batch, data_source = _load_ohlcv(symbol, interval)
+        if batch is not None:
+            real_data = {
+                "candles": batch.candles(),
+                "volumes": batch.volume_bars(),
             }
-            exchange_interval = interval_map.get(interval, "1h")
-            
-            result = json.loads(get_ohlcv_data(symbol, exchange_interval, limit=200))
-            
-            # Handle both "data" and "candles" keys in response
-            bars = result.get("data") or result.get("candles")
-            if bars:
-                real_data = {
-                    "candles": [
-                        {
-                            "time": int(datetime.fromisoformat(b["timestamp"].replace("Z", "+00:00")).timestamp()) if isinstance(b["timestamp"], str) else int(b["timestamp"]) // 1000,
-                            "open": float(b["open"]),
-                            "high": float(b["high"]),
-                            "low": float(b["low"]),
-                            "close": float(b["close"]),
-                        }
-                        for b in bars
-                    ],
-                    "volumes": [
-                        {
-                            "time": int(datetime.fromisoformat(b["timestamp"].replace("Z", "+00:00")).timestamp()) if isinstance(b["timestamp"], str) else int(b["timestamp"]) // 1000,
-                            "value": float(b["volume"]),
-                            "color": "#26a69a" if float(b["close"]) >= float(b["open"]) else "#ef5350",
-                        }
-                        for b in bars
-                    ],
-                }
-                data_source = f"Bitget ({len(bars)} bars)"
-        except Exception as e:
-            # Fall back to placeholder data if exchange fetch fails
-            pass
         
         # Parse annotations if provided
         chart_annotations = []
         if annotations:
             try:
-                chart_annotations = json.loads(annotations)
+                chart_annotations = fast_json.loads(annotations)
             except json.JSONDecodeError:
                 pass
         
@@ -537,7 +631,7 @@ def generate_tradingview_chart(
         }}
 
         // Load data and set chart series
-        const realData = {json.dumps(real_data) if real_data else 'null'};
+        const realData = {fast_json.dumps(real_data) if real_data else 'null'};
         const chartData = realData || generatePlaceholderData();
         candlestickSeries.setData(chartData.candles);
         {'volumeSeries.setData(chartData.volumes);' if 'volume' in indicator_list else ''}
@@ -555,7 +649,7 @@ def generate_tradingview_chart(
         {'const sarData = calculateSAR(chartData.candles); const sarSeries = chart.addLineSeries({ lineWidth: 0, lastValueVisible: false, priceLineVisible: false, crosshairMarkerVisible: false }); sarSeries.setData(sarData.map(s => ({ time: s.time, value: s.value }))); sarSeries.setMarkers(sarData.map(s => ({ time: s.time, position: s.color === "#26a69a" ? "belowBar" : "aboveBar", color: s.color, shape: "circle", size: 0.5 })));' if 'sar' in indicator_list else ''}
 
         // Add markers/annotations if provided
-        const annotations = {json.dumps(chart_annotations)};
+        const annotations = {fast_json.dumps(chart_annotations)};
         if (annotations.length > 0) {{
             candlestickSeries.setMarkers(annotations.map(a => ({{
                 time: a.time,
@@ -626,7 +720,7 @@ def create_ai_annotated_chart(
     """
     try:
         # Parse signals
-        signals = json.loads(analysis_signals)
+        signals = fast_json.loads(analysis_signals)
         
         # Convert to chart annotations
         annotations = []
@@ -646,7 +740,7 @@ def create_ai_annotated_chart(
             indicators="volume,sma,bollinger",
             theme="dark",
             title=f"{symbol} AI Analysis",
-            annotations=json.dumps(annotations),
+            annotations=fast_json.dumps(annotations),
         )
         
     except Exception as e:
@@ -722,42 +816,13 @@ def generate_entry_analysis_chart(
         _ensure_output_dir()
         
         # Parse entry points
-        entries = json.loads(entry_points) if isinstance(entry_points, str) else entry_points
-        supports = json.loads(support_levels) if support_levels else []
-        resistances = json.loads(resistance_levels) if resistance_levels else []
+        entries = fast_json.loads(entry_points) if isinstance(entry_points, str) else entry_points
+        supports = fast_json.loads(support_levels) if support_levels else []
+        resistances = fast_json.loads(resistance_levels) if resistance_levels else []
         
-        # Fetch real OHLCV data
-        real_data = None
-        candle_data = []
-        try:
-            from exchange_tools import get_ohlcv_data
-            
-            interval_map = {
-                "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
-                "1H": "1h", "1h": "1h", "4H": "4h", "4h": "4h",
-                "1D": "1d", "1d": "1d", "1W": "1w", "1w": "1w",
-            }
-            exchange_interval = interval_map.get(interval, "1h")
-            
-            result = json.loads(get_ohlcv_data(symbol, exchange_interval, limit=200))
-            bars = result.get("data") or result.get("candles")
-            if bars:
-                for b in bars:
-                    ts = b["timestamp"]
-                    if isinstance(ts, str):
-                        ts = int(datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp())
-                    else:
-                        ts = int(ts) // 1000
-                    candle_data.append({
-                        "time": ts,
-                        "open": float(b["open"]),
-                        "high": float(b["high"]),
-                        "low": float(b["low"]),
-                        "close": float(b["close"]),
-                        "volume": float(b.get("volume", 0)),
-                    })
-        except Exception as e:
-            pass  # Will use placeholder data
+        # Fetch real OHLCV data (placeholder data is used if this fails)
+        batch, _ = _load_ohlcv(symbol, interval)
+        candle_data = batch.candles(include_volume=True) if batch is not None else []
         
         # Build annotations for markers
         markers = []
@@ -881,7 +946,7 @@ def generate_entry_analysis_chart(
         custom_ind_list = []
         if custom_indicators:
             try:
-                custom_ind_list = json.loads(custom_indicators) if isinstance(custom_indicators, str) else custom_indicators
+                custom_ind_list = fast_json.loads(custom_indicators) if isinstance(custom_indicators, str) else custom_indicators
             except json.JSONDecodeError:
                 pass
         
@@ -1031,8 +1096,8 @@ def _generate_entry_analysis_html(
     
     # Generate chart data JS
     if candle_data:
-        candles_js = json.dumps(candle_data)
-        volumes_js = json.dumps([
+        candles_js = fast_json.dumps(candle_data)
+        volumes_js = fast_json.dumps([
             {"time": c["time"], "value": c.get("volume", 0), "color": up_color if c["close"] >= c["open"] else down_color}
             for c in candle_data
         ])
@@ -1040,8 +1105,8 @@ def _generate_entry_analysis_html(
         candles_js = "[]"
         volumes_js = "[]"
     
-    markers_js = json.dumps(markers)
-    price_lines_js = json.dumps(price_lines)
+    markers_js = fast_json.dumps(markers)
+    price_lines_js = fast_json.dumps(price_lines)
     
     html_content = f'''<!DOCTYPE html>
 <html lang="en">
@@ -1291,7 +1356,7 @@ def _generate_entry_analysis_html(
         chart.priceScale("volume").applyOptions({{ scaleMargins: {{ top: 0.8, bottom: 0 }} }});
 
         // Entry point configurations from backend
-        const entryPoints = {json.dumps(entry_summary)};
+        const entryPoints = {fast_json.dumps(entry_summary)};
         
         // Load data
         let candleData = {candles_js};
@@ -1407,7 +1472,7 @@ def _generate_entry_analysis_html(
         }}
 
         // Add indicator overlays based on configuration
-        const indicatorConfig = {json.dumps(indicators)};
+        const indicatorConfig = {fast_json.dumps(indicators)};
         
         // SMA - Simple Moving Average (blue line)
         if (indicatorConfig.includes('sma')) {{
@@ -1455,7 +1520,7 @@ def _generate_entry_analysis_html(
         }}
 
         // Render custom indicators (agent-created indicators with pre-calculated data)
-        const customIndicators = {json.dumps(custom_indicators)};
+        const customIndicators = {fast_json.dumps(custom_indicators)};
         customIndicators.forEach((indicator, index) => {{
             const indName = indicator.name || `Custom ${{index + 1}}`;
             const indColor = indicator.color || '#00BCD4';
@@ -1490,7 +1555,7 @@ def _generate_entry_analysis_html(
 
         // Price lines configuration with entry index association
         const allPriceLines = {price_lines_js};
-        const entryData = {json.dumps(entry_summary)};
+        const entryData = {fast_json.dumps(entry_summary)};
         
         // Track which entries are selected (all visible by default)
         let selectedEntries = new Set();
@@ -1738,7 +1803,7 @@ def generate_multi_timeframe_dashboard(
 
     <script>
         const symbol = '{symbol}';
-        const timeframes = {json.dumps(tf_list)};
+        const timeframes = {fast_json.dumps(tf_list)};
         
         // Create a chart for each timeframe
         timeframes.forEach((tf, index) => {{
@@ -1853,9 +1918,9 @@ def generate_strategy_backtest_chart(
         _ensure_output_dir()
         
         # Parse inputs
-        trade_list = json.loads(trades)
-        equity_data = json.loads(equity_curve) if equity_curve else []
-        strategy_metrics = json.loads(metrics) if metrics else {}
+        trade_list = fast_json.loads(trades)
+        equity_data = fast_json.loads(equity_curve) if equity_curve else []
+        strategy_metrics = fast_json.loads(metrics) if metrics else {}
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{symbol}_{strategy_name}_backtest_{timestamp}.html"
@@ -2011,8 +2076,8 @@ def generate_strategy_backtest_chart(
     </div>
 
     <script>
-        const trades = {json.dumps(trade_list)};
-        const equityData = {json.dumps(equity_data)};
+        const trades = {fast_json.dumps(trade_list)};
+        const equityData = {fast_json.dumps(equity_data)};
         
         // Price chart
         const priceContainer = document.getElementById('price-chart');
@@ -2239,47 +2304,20 @@ def generate_strategy_visualization(
         _ensure_output_dir()
         
         # Parse all JSON inputs
-        strategy = json.loads(strategy_summary) if isinstance(strategy_summary, str) else strategy_summary
-        entries = json.loads(entry_setups) if isinstance(entry_setups, str) else entry_setups
-        levels = json.loads(technical_levels) if isinstance(technical_levels, str) else technical_levels
-        signals = json.loads(indicator_signals) if indicator_signals else {}
-        context = json.loads(market_context) if market_context else {}
+        strategy = fast_json.loads(strategy_summary) if isinstance(strategy_summary, str) else strategy_summary
+        entries = fast_json.loads(entry_setups) if isinstance(entry_setups, str) else entry_setups
+        levels = fast_json.loads(technical_levels) if isinstance(technical_levels, str) else technical_levels
+        signals = fast_json.loads(indicator_signals) if indicator_signals else {}
+        context = fast_json.loads(market_context) if market_context else {}
         indicator_list = [i.strip().lower() for i in indicators_used.split(",")] if indicators_used else []
         
         # Fetch real OHLCV data
         candle_data = []
         current_price = 0
-        try:
-            from exchange_tools import get_ohlcv_data
-            
-            interval_map = {
-                "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
-                "1H": "1h", "1h": "1h", "4H": "4h", "4h": "4h",
-                "1D": "1d", "1d": "1d", "1W": "1w", "1w": "1w",
-            }
-            exchange_interval = interval_map.get(interval, "1h")
-            
-            result = json.loads(get_ohlcv_data(symbol, exchange_interval, limit=200))
-            bars = result.get("data") or result.get("candles")
-            if bars:
-                for b in bars:
-                    ts = b["timestamp"]
-                    if isinstance(ts, str):
-                        ts = int(datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp())
-                    else:
-                        ts = int(ts) // 1000
-                    candle_data.append({
-                        "time": ts,
-                        "open": float(b["open"]),
-                        "high": float(b["high"]),
-                        "low": float(b["low"]),
-                        "close": float(b["close"]),
-                        "volume": float(b.get("volume", 0)),
-                    })
-                if candle_data:
-                    current_price = candle_data[-1]["close"]
-        except Exception as e:
-            pass
+        batch, _ = _load_ohlcv(symbol, interval)
+        if batch is not None:
+            candle_data = batch.candles(include_volume=True)
+            current_price = candle_data[-1]["close"]
         
         # Build price lines from entry setups
         price_lines = []
@@ -2576,13 +2614,13 @@ def _generate_strategy_visualization_html(
         context_html = " ".join(context_items)
     
     # JSON data for JavaScript
-    candles_js = json.dumps(candle_data) if candle_data else "[]"
-    volumes_js = json.dumps([
+    candles_js = fast_json.dumps(candle_data) if candle_data else "[]"
+    volumes_js = fast_json.dumps([
         {"time": c["time"], "value": c.get("volume", 0), "color": up_color if c["close"] >= c["open"] else down_color}
         for c in candle_data
     ]) if candle_data else "[]"
-    markers_js = json.dumps(markers)
-    price_lines_js = json.dumps(price_lines)
+    markers_js = fast_json.dumps(markers)
+    price_lines_js = fast_json.dumps(price_lines)
     
     # Determine price color based on last two candles
     price_color = up_color
@@ -20,7 +20,10 @@ import threading
 import time
 from datetime import datetime
 
+from cache import cached
 from chart_assets import LIGHTWEIGHT_CHARTS_SCRIPT
+from ohlcv_batch import OHLCVBatch
+import fast_json
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from typing import Annotated, Optional, Dict, Any, List
@@ -29,6 +32,26 @@ from pathlib import Path
 # Default port for UDF server
 DEFAULT_PORT = 8765
 
+# History requests for the same symbol/resolution inside this window share
+# one exchange fetch, so several live charts polling a market cost one call
+HISTORY_COALESCE_SECONDS = 2
+HISTORY_FETCH_BARS = 500
+
+
+@cached(ttl_seconds=HISTORY_COALESCE_SECONDS, cache_key_prefix="udf_history")
+def _fetch_history(symbol: str, interval: str) -> Optional[OHLCVBatch]:
+    """Latest HISTORY_FETCH_BARS bars from the exchange, or None on failure."""
+    try:
+        from exchange_tools import get_ohlcv_data
+        
+        result = fast_json.loads(get_ohlcv_data(symbol, interval, limit=HISTORY_FETCH_BARS))
+        bars = result.get("data") or result.get("candles")
+        if bars:
+            return OHLCVBatch.from_bars(bars)
+    except Exception:
+        pass
+    return None
+
 
 class UDFRequestHandler(BaseHTTPRequestHandler):
     """HTTP request handler implementing TradingView UDF protocol."""
@@ -60,7 +83,7 @@ class UDFRequestHandler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(fast_json.dumps_bytes(data))
     
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
@@ -171,38 +194,31 @@ class UDFRequestHandler(BaseHTTPRequestHandler):
         # Get interval in seconds
         interval_seconds = self.RESOLUTION_MAP.get(resolution, 3600)
         
-        # Try to fetch real data from Bitget
-        try:
-            from src.exchange_tools import get_ohlcv_data
-            
-            # Map resolution to exchange format
-            interval_map = {
-                "1": "1m", "5": "5m", "15": "15m", "30": "30m",
-                "60": "1h", "120": "2h", "240": "4h",
-                "D": "1d", "1D": "1d", "W": "1w", "1W": "1w",
-            }
-            interval = interval_map.get(resolution, "1h")
-            
-            # Calculate number of bars needed
-            num_bars = min((to_ts - from_ts) // interval_seconds, 500)
-            
-            result = json.loads(get_ohlcv_data(symbol, interval, limit=num_bars))
-            
-            if result.get("status") == "success" and result.get("data"):
-                bars = result["data"]
-                response = {
-                    "s": "ok",
-                    "t": [int(b["timestamp"]) // 1000 for b in bars],
-                    "o": [float(b["open"]) for b in bars],
-                    "h": [float(b["high"]) for b in bars],
-                    "l": [float(b["low"]) for b in bars],
-                    "c": [float(b["close"]) for b in bars],
-                    "v": [float(b["volume"]) for b in bars],
-                }
-                self._send_json_response(response)
+        # Map resolution to exchange format
+        interval_map = {
+            "1": "1m", "5": "5m", "15": "15m", "30": "30m",
+            "60": "1h", "120": "2h", "240": "4h",
+            "D": "1d", "1D": "1d", "W": "1w", "1W": "1w",
+        }
+        interval = interval_map.get(resolution, "1h")
+        
+        # Full loads and incremental refreshes slice the same coalesced fetch
+        batch = _fetch_history(symbol, interval)
+        if batch is not None:
+            in_range = (batch.time >= from_ts) & (batch.time <= to_ts)
+            if not in_range.any():
+                self._send_json_response({"s": "no_data"})
                 return
-        except Exception as e:
-            pass
+            self._send_json_response({
+                "s": "ok",
+                "t": batch.time[in_range].tolist(),
+                "o": batch.open[in_range].tolist(),
+                "h": batch.high[in_range].tolist(),
+                "l": batch.low[in_range].tolist(),
+                "c": batch.close[in_range].tolist(),
+                "v": batch.volume[in_range].tolist(),
+            })
+            return
         
         # Fallback to generated data
         bars = self._generate_bars(symbol, from_ts, to_ts, interval_seconds)
@@ -544,61 +560,125 @@ def generate_live_chart_with_data(
             await loadData();
         }}
         
-        // Load data from UDF server
+        // Incremental update state
+        let lastBarTime = 0;
+        let firstOpen = null;
+        let pendingBars = [];
+        let frameRequested = false;
+        
+        async function fetchHistory(from, to) {{
+            const url = `${{UDF_URL}}/history?symbol=${{symbol}}&from=${{from}}&to=${{to}}&resolution=${{currentInterval}}`;
+            const response = await fetch(url);
+            return response.json();
+        }}
+        
+        function toBars(data) {{
+            const bars = [];
+            for (let i = 0; i < data.t.length; i++) {{
+                bars.push({{
+                    candle: {{
+                        time: data.t[i],
+                        open: data.o[i],
+                        high: data.h[i],
+                        low: data.l[i],
+                        close: data.c[i],
+                    }},
+                    volume: {{
+                        time: data.t[i],
+                        value: data.v[i],
+                        color: data.c[i] >= data.o[i] ? '#26a69a50' : '#ef535050',
+                    }},
+                }});
+            }}
+            return bars;
+        }}
+        
+        function updatePriceDisplay(close) {{
+            const priceChange = ((close - firstOpen) / firstOpen * 100);
+            
+            document.getElementById('current-price').textContent = 
+                '$' + close.toLocaleString(undefined, {{maximumFractionDigits: 2}});
+            
+            const changeEl = document.getElementById('price-change');
+            changeEl.textContent = (priceChange >= 0 ? '+' : '') + priceChange.toFixed(2) + '%';
+            changeEl.className = 'price-change ' + (priceChange >= 0 ? 'up' : 'down');
+        }}
+        
+        function setStatus(connected) {{
+            const statusEl = document.getElementById('status');
+            statusEl.className = 'status ' + (connected ? 'connected' : 'disconnected');
+            statusEl.textContent = connected ? '🟢 Connected to UDF Server' : '🔴 Disconnected - Start UDF Server';
+        }}
+        
+        // Full load: initial render and interval switches only
         async function loadData() {{
             try {{
                 const to = Math.floor(Date.now() / 1000);
                 const from = to - (86400 * 30); // 30 days
-                
-                const url = `${{UDF_URL}}/history?symbol=${{symbol}}&from=${{from}}&to=${{to}}&resolution=${{currentInterval}}`;
-                const response = await fetch(url);
-                const data = await response.json();
+                const data = await fetchHistory(from, to);
                 
                 if (data.s === 'ok') {{
-                    const candles = [];
-                    const volumes = [];
+                    const bars = toBars(data);
+                    candleSeries.setData(bars.map(b => b.candle));
+                    volumeSeries.setData(bars.map(b => b.volume));
+                    pendingBars = [];
                     
-                    for (let i = 0; i < data.t.length; i++) {{
-                        candles.push({{
-                            time: data.t[i],
-                            open: data.o[i],
-                            high: data.h[i],
-                            low: data.l[i],
-                            close: data.c[i],
-                        }});
-                        volumes.push({{
-                            time: data.t[i],
-                            value: data.v[i],
-                            color: data.c[i] >= data.o[i] ? '#26a69a50' : '#ef535050',
-                        }});
-                    }}
-                    
-                    candleSeries.setData(candles);
-                    volumeSeries.setData(volumes);
-                    
-                    // Update price display
-                    if (candles.length > 0) {{
-                        const lastCandle = candles[candles.length - 1];
-                        const firstCandle = candles[0];
-                        const priceChange = ((lastCandle.close - firstCandle.open) / firstCandle.open * 100);
-                        
-                        document.getElementById('current-price').textContent = 
-                            '$' + lastCandle.close.toLocaleString(undefined, {{maximumFractionDigits: 2}});
-                        
-                        const changeEl = document.getElementById('price-change');
-                        changeEl.textContent = (priceChange >= 0 ? '+' : '') + priceChange.toFixed(2) + '%';
-                        changeEl.className = 'price-change ' + (priceChange >= 0 ? 'up' : 'down');
+                    if (bars.length > 0) {{
+                        const lastCandle = bars[bars.length - 1].candle;
+                        firstOpen = bars[0].candle.open;
+                        lastBarTime = lastCandle.time;
+                        updatePriceDisplay(lastCandle.close);
                     }}
                     
                     chart.timeScale().fitContent();
-                    document.getElementById('status').className = 'status connected';
-                    document.getElementById('status').textContent = '🟢 Connected to UDF Server';
+                    setStatus(true);
                 }}
             }} catch (error) {{
                 console.error('Failed to load data:', error);
-                document.getElementById('status').className = 'status disconnected';
-                document.getElementById('status').textContent = '🔴 Disconnected - Start UDF Server';
+                setStatus(false);
+            }}
+        }}
+        
+        // Refresh: fetch only bars since the last one drawn and append them
+        async function refreshData() {{
+            if (!lastBarTime) {{
+                await loadData();
+                return;
+            }}
+            const interval = currentInterval;
+            try {{
+                const data = await fetchHistory(lastBarTime, Math.floor(Date.now() / 1000));
+                if (data.s === 'ok' && interval === currentInterval) {{
+                    pendingBars.push(...toBars(data));
+                    scheduleFlush();
+                    setStatus(true);
+                }}
+            }} catch (error) {{
+                console.error('Failed to refresh data:', error);
+                setStatus(false);
+            }}
+        }}
+        
+        // Coalesce updates into one paint; series.update() replaces the
+        // last bar or appends a new one without re-indexing the series
+        function scheduleFlush() {{
+            if (frameRequested) return;
+            frameRequested = true;
+            requestAnimationFrame(flushBars);
+        }}
+        
+        function flushBars() {{
+            frameRequested = false;
+            let lastClose = null;
+            for (const bar of pendingBars) {{
+                if (bar.candle.time < lastBarTime) continue;
+                candleSeries.update(bar.candle);
+                volumeSeries.update(bar.volume);
+                lastBarTime = bar.candle.time;
+                lastClose = bar.candle.close;
             }}
+            pendingBars = [];
+            if (lastClose !== null) updatePriceDisplay(lastClose);
         }}
         
         // Interval buttons
@@ -623,7 +703,7 @@ def generate_live_chart_with_data(
         initChart();
         
         // Refresh every 30 seconds
-        setInterval(loadData, 30000);
+        setInterval(refreshData, 30000);
     </script>
 </body>
 </html>
@@ -0,0 +1,55 @@
+"""
+Tests for cache.py
+"""
+import json
+
+import pytest
+from autogen_core.tools import FunctionTool
+
+from cache import clear_request_cache, request_cached
+from exchange_tools import get_ohlcv_data
+
+
+@pytest.fixture(autouse=True)
+def fresh_request_cache():
+    clear_request_cache()
+    yield
+    clear_request_cache()
+
+
+class TestRequestCached:
+    """Tests for per-task tool call deduplication."""
+
+    def test_identical_calls_hit_cache(self):
+        calls = []
+
+        @request_cached()
+        def lookup(symbol: str, limit: int = 100) -> str:
+            calls.append((symbol, limit))
+            return json.dumps({"symbol": symbol, "limit": limit})
+
+        assert lookup("BTCUSDT", limit=200) == lookup("BTCUSDT", limit=200)
+        lookup("ETHUSDT", limit=200)
+        assert calls == [("BTCUSDT", 200), ("ETHUSDT", 200)]
+
+        clear_request_cache()
+        lookup("BTCUSDT", limit=200)
+        assert len(calls) == 3
+
+    @pytest.mark.parametrize("error", ['{"error": "timeout"}', "Error fetching price data: timeout"])
+    def test_errors_are_not_cached(self, error):
+        calls = []
+
+        @request_cached()
+        def lookup(symbol: str) -> str:
+            calls.append(symbol)
+            return error
+
+        lookup("BTCUSDT")
+        lookup("BTCUSDT")
+        assert len(calls) == 2
+
+    def test_wrapped_tool_keeps_schema(self):
+        tool = FunctionTool(request_cached()(get_ohlcv_data), description="OHLCV")
+        assert tool.name == "get_ohlcv_data"
+        assert "symbol" in tool.schema["parameters"]["properties"]
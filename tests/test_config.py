@@ -0,0 +1,40 @@
+"""
+Tests for config.py
+"""
+import pytest
+
+import config
+from config import get_config, reload_config
+
+
+@pytest.fixture
+def azure_env(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "key")
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+    monkeypatch.setenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
+    monkeypatch.setattr(config, "_config", None)
+
+
+class TestGetConfig:
+    """Tests for the cached process-wide configuration."""
+
+    def test_environment_read_once(self, azure_env, monkeypatch):
+        first = get_config()
+        monkeypatch.setenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini")
+        assert get_config() is first
+        assert first.azure_openai.deployment == "gpt-4o"
+
+    def test_reload_picks_up_changes(self, azure_env, monkeypatch):
+        first = get_config()
+        monkeypatch.setenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini")
+        reloaded = reload_config()
+        assert reloaded is not first
+        assert get_config() is reloaded
+        assert reloaded.azure_openai.deployment == "gpt-4o-mini"
+
+    def test_failed_read_is_not_cached(self, azure_env, monkeypatch):
+        monkeypatch.delenv("AZURE_OPENAI_API_KEY")
+        with pytest.raises(ValueError):
+            get_config()
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "key")
+        assert get_config().azure_openai.api_key == "key"
@@ -0,0 +1,45 @@
+"""
+Tests for fast_json.py
+"""
+import json
+
+import numpy as np
+import pytest
+
+import fast_json
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with and without orjson."""
+    if request.param and not fast_json.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(fast_json, "ORJSON_AVAILABLE", request.param)
+    return request.param
+
+
+def test_round_trip(backend):
+    payload = {"entries": [{"type": "long", "price": 98500.5, "reason": "Breakout ✅"}]}
+    text = fast_json.dumps(payload)
+    assert "✅" in text
+    assert fast_json.loads(text) == payload
+    assert fast_json.loads(fast_json.dumps_bytes(payload)) == payload
+
+
+def test_numpy_values(backend):
+    text = fast_json.dumps({"close": np.array([1.5, 2.0]), "count": np.int64(3)})
+    assert json.loads(text) == {"close": [1.5, 2.0], "count": 3}
+
+
+def test_indent_matches_stdlib_layout(backend):
+    payload = {"status": "success", "alerts": [{"symbol": "BTCUSDT", "signals": ["RSI ✅"]}], "empty": []}
+    assert fast_json.dumps_indent(payload) == json.dumps(payload, indent=2, ensure_ascii=False)
+
+
+def test_nan_literal_is_accepted(backend):
+    assert np.isnan(fast_json.loads('[{"time": 1, "value": NaN}]')[0]["value"])
+
+
+def test_decode_error_type(backend):
+    with pytest.raises(json.JSONDecodeError):
+        fast_json.loads("[1, 2")
@@ -0,0 +1,61 @@
+"""
+Tests for history_utils.py
+"""
+from collections import deque
+
+from history_utils import estimate_tokens, semantic_truncate, summarize_answer
+
+
+def make_turn(i, answer=None):
+    return {"task": f"question {i}", "answer": answer or f"Answer {i}. More detail follows here."}
+
+
+class TestSummarizeAnswer:
+    """Tests for the extractive turn summary."""
+
+    def test_skips_headings_and_markup(self):
+        answer = "# BTC Analyse\n\n**Bitcoin** steht bei 95.000 USD. RSI ist neutral.\n"
+        assert summarize_answer(answer) == "Bitcoin steht bei 95.000 USD."
+
+    def test_skips_code_blocks(self):
+        answer = "```python\nprint('x')\n```\nErgebnis: Signal bestätigt."
+        assert summarize_answer(answer) == "Ergebnis: Signal bestätigt."
+
+    def test_long_sentence_is_capped(self):
+        assert len(summarize_answer("x" * 1000)) == 200
+
+    def test_empty(self):
+        assert summarize_answer("") == "(no answer)"
+
+
+class TestSemanticTruncate:
+    """Tests for fitting history into a token budget."""
+
+    def test_recent_turns_verbatim_older_summarised(self):
+        history = [make_turn(i) for i in range(5)]
+        result = semantic_truncate(history, max_tokens=4000, keep_recent=2)
+        assert [t["task"] for t in result] == [f"question {i}" for i in range(5)]
+        assert result[-1]["answer"] == history[-1]["answer"]
+        assert result[-2]["answer"] == history[-2]["answer"]
+        assert result[0]["answer"] == "Answer 0."
+
+    def test_budget_drops_oldest_turns(self):
+        history = [make_turn(i, "y" * 400) for i in range(20)]
+        result = semantic_truncate(history, max_tokens=300, keep_recent=2)
+        total = sum(estimate_tokens(t["task"]) + estimate_tokens(t["answer"]) for t in result)
+        assert total <= 300
+        assert result[-1]["task"] == "question 19"
+        assert len(result) < 20
+
+    def test_oversized_recent_answer_is_cut(self):
+        result = semantic_truncate([make_turn(0, "z" * 100_000)], max_tokens=500)
+        assert result[0]["answer"].endswith("[truncated]")
+        assert estimate_tokens(result[0]["answer"]) <= 500
+
+    def test_accepts_bounded_deque(self):
+        history = deque((make_turn(i) for i in range(5)), maxlen=3)
+        result = semantic_truncate(history, max_tokens=4000, keep_recent=2)
+        assert [t["task"] for t in result] == ["question 2", "question 3", "question 4"]
+
+    def test_empty_history(self):
+        assert semantic_truncate([]) == []
@@ -0,0 +1,105 @@
+"""
+Tests for indicators_numba.py
+
+The kernels must produce the same values as the list-based
+TechnicalIndicators implementation, with or without numba installed.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import indicators_numba
+from indicators_numba import sma, ema, rsi, macd, bollinger, rolling_gain_loss, zscore, align
+
+
+@pytest.fixture
+def close():
+    """Deterministic noisy price series."""
+    rng = np.random.default_rng(42)
+    return np.ascontiguousarray(100 + np.cumsum(rng.normal(0, 1, 300)), dtype=np.float64)
+
+
+class TestKernels:
+    """Tests for the individual kernels."""
+
+    def test_sma_matches_rolling_mean(self, close):
+        expected = pd.Series(close).rolling(20).mean().to_numpy()[19:]
+        np.testing.assert_allclose(sma(close, 20), expected, rtol=1e-10)
+
+    def test_sma_insufficient_data(self):
+        assert sma(np.array([1.0, 2.0]), 5).shape == (0,)
+
+    def test_ema_is_sma_seeded(self, close):
+        result = ema(close, 10)
+        assert len(result) == len(close) - 9
+        assert result[0] == pytest.approx(close[:10].mean())
+        # Remaining values follow the standard recurrence
+        expected = pd.Series(np.concatenate(([close[:10].mean()], close[10:]))).ewm(
+            span=10, adjust=False
+        ).mean().to_numpy()
+        np.testing.assert_allclose(result, expected, rtol=1e-10)
+
+    def test_rsi_bounds_and_length(self, close):
+        result = rsi(close, 14)
+        assert len(result) == len(close) - 1 - 14
+        assert np.all((result >= 0) & (result <= 100))
+
+    def test_rsi_all_gains(self):
+        result = rsi(np.arange(1.0, 20.0), 14)
+        assert result[-1] == 100.0
+
+    def test_macd_alignment(self, close):
+        macd_line, signal_line, histogram = macd(close, 12, 26, 9)
+        assert len(macd_line) == len(close) - 25
+        assert len(signal_line) == len(histogram) == len(macd_line) - 8
+        np.testing.assert_allclose(histogram, macd_line[8:] - signal_line)
+
+    def test_bollinger_uses_population_std(self, close):
+        upper, middle, lower = bollinger(close, 20, 2.0)
+        std = pd.Series(close).rolling(20).std(ddof=0).to_numpy()[19:]
+        np.testing.assert_allclose(upper - middle, 2.0 * std, rtol=1e-8)
+        np.testing.assert_allclose(middle - lower, 2.0 * std, rtol=1e-8)
+
+    def test_rolling_gain_loss_matches_pandas(self, close):
+        delta = pd.Series(close).diff()
+        gain = delta.where(delta > 0, 0).rolling(14).mean().to_numpy()[14:]
+        loss = (-delta.where(delta < 0, 0)).rolling(14).mean().to_numpy()[14:]
+        avg_gain, avg_loss = rolling_gain_loss(close, 14)
+        np.testing.assert_allclose(avg_gain, gain, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(avg_loss, loss, rtol=1e-9, atol=1e-12)
+
+    def test_zscore_matches_pandas(self, close):
+        series = pd.Series(close)
+        rolling = series.rolling(20)
+        expected = ((series - rolling.mean()) / rolling.std(ddof=0)).to_numpy()[19:]
+        np.testing.assert_allclose(zscore(close, 20), expected, rtol=1e-6)
+
+    def test_zscore_flat_window(self):
+        assert np.all(zscore(np.full(30, 5.0), 10) == 0.0)
+
+    def test_align_pads_front(self):
+        result = align(np.array([1.0, 2.0]), 4)
+        assert np.isnan(result[:2]).all()
+        assert result[2:].tolist() == [1.0, 2.0]
+
+    def test_warmup_runs(self):
+        indicators_numba.warmup()
+
+
+class TestTechnicalIndicatorsParity:
+    """TechnicalIndicators must agree with the kernels."""
+
+    def test_parity(self, close):
+        from crypto_tools import TechnicalIndicators
+
+        prices = close.tolist()
+        np.testing.assert_allclose(TechnicalIndicators.calculate_sma(prices, 20), sma(close, 20))
+        np.testing.assert_allclose(TechnicalIndicators.calculate_ema(prices, 20), ema(close, 20))
+        np.testing.assert_allclose(TechnicalIndicators.calculate_rsi(prices, 14), rsi(close, 14))
+        for got, want in zip(TechnicalIndicators.calculate_macd(prices), macd(close, 12, 26, 9)):
+            np.testing.assert_allclose(got, want)
+        for got, want in zip(
+            TechnicalIndicators.calculate_bollinger_bands(prices, 20, 2.0),
+            bollinger(close, 20, 2.0),
+        ):
+            np.testing.assert_allclose(got, want)
@@ -223,6 +223,22 @@ class TestLLMClassification:
         intent = await router.classify_async("What is the current situation of BTC?")
         assert intent.type == IntentType.ANALYSIS
         assert intent.entities.get("symbols") == ["BTCUSDT"]
+    
+    @pytest.mark.asyncio
+    async def test_llm_reply_is_cached_per_message(self):
+        """Test that a repeated message reuses the previous LLM classification."""
+        from unittest.mock import AsyncMock, MagicMock
+        
+        client = MagicMock()
+        client.create = AsyncMock(return_value=MagicMock(
+            content='{"intent": "analysis", "symbols": ["BTC"], "asset_type": "crypto"}'
+        ))
+        router = IntentRouter(model_client=client, use_llm=True)
+        
+        first = await router._classify_with_llm("Analyze BTC")
+        second = await router._classify_with_llm("  analyze   btc ")
+        assert first.type == second.type == IntentType.ANALYSIS
+        assert client.create.await_count == 1
 
 
 class TestCompoundIntents:
@@ -487,3 +503,31 @@ class TestToolRegistration:
         
         assert result["success"] is False
         assert result["fallback_to_agents"] is True
+    
+    async def test_execute_simple_fetches_symbols_concurrently(self, router):
+        """Sync tools run in parallel threads; order and errors are preserved."""
+        import threading
+        
+        # Only releases if all three lookups are in flight at the same time
+        barrier = threading.Barrier(3, timeout=5)
+    
+        def mock_price(symbol: str) -> str:
+            barrier.wait()
+            if symbol == "ETHUSDT":
+                raise RuntimeError("rate limited")
+            return f'{{"symbol": "{symbol}"}}'
+        
+        router.register_tool("get_realtime_price", mock_price)
+        
+        intent = Intent(
+            type=IntentType.SIMPLE_LOOKUP,
+            confidence=0.9,
+            entities={"symbols": ["BTCUSDT", "ETHUSDT", "SOLUSDT"]},
+            tool_hint="get_realtime_price",
+        )
+        
+        result = await router.execute_simple("BTC ETH SOL prices", intent)
+        
+        assert result["success"] is True
+        assert [r["symbol"] for r in result["results"]] == ["BTCUSDT", "SOLUSDT"]
+        assert result["errors"] == [{"symbol": "ETHUSDT", "error": "rate limited"}]
@@ -396,3 +396,24 @@ class TestKeyLevelAnalyzerIntegration:
         parsed = json.loads(json_output)
         
         assert isinstance(parsed, dict)
+
+
+class TestAnalysisMemoization:
+    """Tests for the bar-keyed analysis cache."""
+    
+    def test_repeat_call_reuses_result(self, ranging_market_data):
+        """Same bars and params should return the cached analysis."""
+        from keylevel_analyzer import _analyze_cached
+        
+        first = _analyze_cached(ranging_market_data, left=10, right=5)
+        second = _analyze_cached(ranging_market_data.copy(), left=10, right=5)
+        assert second is first
+    
+    def test_changed_last_bar_recomputes(self, ranging_market_data):
+        """A tick on the forming bar must produce a fresh analysis."""
+        from keylevel_analyzer import _analyze_cached
+        
+        first = _analyze_cached(ranging_market_data, left=10, right=5)
+        ticked = ranging_market_data.copy()
+        ticked.iloc[-1, ticked.columns.get_loc('close')] *= 1.001
+        assert _analyze_cached(ticked, left=10, right=5) is not first
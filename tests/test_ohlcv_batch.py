@@ -0,0 +1,157 @@
+"""
+Tests for ohlcv_batch.py
+"""
+import json
+import time
+
+import numpy as np
+import pytest
+
+from ohlcv_batch import OHLCVBatch, PYARROW_AVAILABLE, parse_bar_time
+
+
+@pytest.fixture
+def bars():
+    """Exchange-style bar dicts as returned by get_ohlcv_data."""
+    return [
+        {"timestamp": "2025-01-01T00:00:00+00:00", "open": 100, "high": 105, "low": 99, "close": 104, "volume": 10},
+        {"timestamp": "2025-01-01T01:00:00+00:00", "open": 104, "high": 106, "low": 101, "close": 102, "volume": 12},
+        {"timestamp": "2025-01-01T02:00:00Z", "open": 102, "high": 103, "low": 98, "close": 99},
+    ]
+
+
+class TestOHLCVBatch:
+    """Tests for the columnar container."""
+
+    def test_from_bars_parses_columns(self, bars):
+        batch = OHLCVBatch.from_bars(bars)
+        assert len(batch) == 3
+        assert batch.time.tolist() == [1735689600, 1735693200, 1735696800]
+        assert batch.close.dtype == np.float64
+        assert batch.volume.tolist() == [10.0, 12.0, 0.0]
+
+    def test_millisecond_timestamps(self):
+        assert parse_bar_time(1735689600000) == 1735689600
+
+    def test_columns_are_read_only(self, bars):
+        batch = OHLCVBatch.from_bars(bars)
+        with pytest.raises(ValueError):
+            batch.close_view()[0] = 1.0
+
+    def test_candles_payload(self, bars):
+        candles = OHLCVBatch.from_bars(bars).candles(include_volume=True)
+        assert candles[0] == {
+            "time": 1735689600, "open": 100.0, "high": 105.0,
+            "low": 99.0, "close": 104.0, "volume": 10.0,
+        }
+
+    def test_volume_bars_colour_by_direction(self, bars):
+        volumes = OHLCVBatch.from_bars(bars).volume_bars()
+        assert [v["color"] for v in volumes] == ["#26a69a", "#ef5350", "#ef5350"]
+
+    @pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+    def test_arrow_ipc_round_trip(self, bars, tmp_path):
+        batch = OHLCVBatch.from_bars(bars)
+        path = tmp_path / "ohlcv.arrow"
+        batch.write_ipc(path)
+
+        loaded = OHLCVBatch.read_ipc(path)
+        for name in ("time", "open", "high", "low", "close", "volume"):
+            np.testing.assert_array_equal(getattr(loaded, name), getattr(batch, name))
+
+    def test_merge_prefers_newer_bars(self, bars):
+        old = OHLCVBatch.from_bars(bars[:2])
+        updated = dict(bars[1], close=103)
+        new = OHLCVBatch.from_bars([updated, bars[2]])
+
+        merged = old.merge(new)
+        assert merged.time.tolist() == [1735689600, 1735693200, 1735696800]
+        assert merged.close.tolist() == [104.0, 103.0, 99.0]
+
+    @pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+    def test_parquet_time_filter(self, bars, tmp_path):
+        path = tmp_path / "BTCUSDT_1h.parquet"
+        OHLCVBatch.from_bars(bars).write_parquet(path)
+
+        loaded = OHLCVBatch.read_parquet(path, start=1735693200)
+        assert loaded.time.tolist() == [1735693200, 1735696800]
+        assert not path.with_suffix(".parquet.tmp").exists()
+
+
+def _recent_bars(n, step=3600):
+    """Hourly bars ending in the current (still-forming) candle."""
+    current_open = int(time.time()) // step * step
+    return [
+        {"timestamp": (current_open - (n - 1 - i) * step) * 1000,
+         "open": 100, "high": 101, "low": 99, "close": 100 + i, "volume": 1}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+class TestPersistedOHLCV:
+    """Tests for the chart loader's Parquet cache."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        import tradingview_tools
+        monkeypatch.setattr(tradingview_tools, "OHLCV_CACHE_DIR", tmp_path)
+        return tmp_path
+
+    def _prime(self, monkeypatch, bars):
+        import tradingview_tools
+        monkeypatch.setattr("exchange_tools.get_ohlcv_data", lambda *a, **k: json.dumps({"candles": bars}))
+        batch, source = tradingview_tools._load_ohlcv("BTCUSDT", "1H", limit=len(bars))
+        tradingview_tools._ohlcv_writer.submit(lambda: None).result()
+        return batch, source
+
+    def _offline(self, monkeypatch):
+        calls = []
+
+        def fetch(*args, **kwargs):
+            calls.append(args)
+            return json.dumps({"error": "offline"})
+        monkeypatch.setattr("exchange_tools.get_ohlcv_data", fetch)
+        return calls
+
+    def test_fresh_cache_skips_fetch(self, monkeypatch):
+        import tradingview_tools
+
+        batch, source = self._prime(monkeypatch, _recent_bars(3))
+        assert source == "Bitget (3 bars)"
+
+        calls = self._offline(monkeypatch)
+        cached, source = tradingview_tools._load_ohlcv("BTCUSDT", "1H", limit=2)
+        assert calls == []
+        assert source == "Bitget cache (2 bars)"
+        assert cached.time.tolist() == batch.time.tolist()[-2:]
+
+        # Asking for more history than is cached goes to the exchange
+        _, source = tradingview_tools._load_ohlcv("BTCUSDT", "1H", limit=5)
+        assert len(calls) == 1
+        assert source.startswith("Bitget cache, stale (3 bars")
+
+    def test_stale_fallback_is_labelled(self, bars, monkeypatch):
+        import tradingview_tools
+
+        self._prime(monkeypatch, bars)
+        calls = self._offline(monkeypatch)
+        cached, source = tradingview_tools._load_ohlcv("BTCUSDT", "1H", limit=2)
+        assert len(calls) == 1
+        assert cached.time.tolist() == [1735693200, 1735696800]
+        assert source.startswith("Bitget cache, stale (2 bars, last 2025-01-01")
+
+    def test_no_data_is_placeholder(self, monkeypatch):
+        import tradingview_tools
+
+        self._offline(monkeypatch)
+        assert tradingview_tools._load_ohlcv("BTCUSDT", "1H") == (None, "placeholder")
+
+    def test_cache_is_capped(self, cache_dir, monkeypatch):
+        import tradingview_tools
+
+        monkeypatch.setattr(tradingview_tools, "OHLCV_CACHE_MAX_BARS", 4)
+        self._prime(monkeypatch, _recent_bars(6))
+        stored = OHLCVBatch.read_parquet(cache_dir / "BTCUSDT_1h.parquet")
+        assert len(stored) == 4
+        assert stored.time[-1] == int(time.time()) // 3600 * 3600
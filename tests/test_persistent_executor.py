@@ -0,0 +1,148 @@
+"""
+Tests for persistent_executor.py / exec_worker.py
+"""
+import warnings
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.code_executor import CodeBlock
+
+from exec_worker import run_block
+from persistent_executor import PersistentLocalCodeExecutor
+
+
+@pytest.fixture
+async def executor(tmp_path):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        code_executor = PersistentLocalCodeExecutor(work_dir=tmp_path, timeout=5)
+    await code_executor.start()
+    yield code_executor
+    await code_executor.stop()
+
+
+async def run(executor, code, language="python"):
+    return await executor.execute_code_blocks([CodeBlock(code=code, language=language)], CancellationToken())
+
+
+class TestRunBlock:
+    """In-process tests for the worker's block runner."""
+
+    def test_captures_stdout_and_stderr(self):
+        result = run_block("import sys\nprint('out')\nprint('err', file=sys.stderr)")
+        assert result == {"exit_code": 0, "output": "out\nerr\n"}
+
+    def test_runs_as_main(self):
+        assert run_block("if __name__ == '__main__':\n    print('main')")["output"] == "main\n"
+
+    def test_exception_traceback_shows_user_line(self):
+        result = run_block("x = 1\nraise ValueError('boom')")
+        assert result["exit_code"] == 1
+        assert "raise ValueError('boom')" in result["output"]
+        assert "exec_worker" not in result["output"]
+
+    def test_stdin_is_empty(self):
+        result = run_block("import sys\nprint(repr(sys.stdin.read()))\ninput()")
+        assert result["exit_code"] == 1
+        assert result["output"].startswith("''\n")
+        assert "EOFError" in result["output"]
+
+    @pytest.mark.parametrize("code,expected", [
+        ("import sys; sys.exit()", 0),
+        ("import sys; sys.exit(3)", 3),
+        ("import sys; sys.exit('fatal')", 1),
+    ])
+    def test_sys_exit(self, code, expected):
+        assert run_block(code)["exit_code"] == expected
+
+
+class TestPersistentLocalCodeExecutor:
+    """End-to-end tests against a real worker process."""
+
+    async def test_reuses_worker_without_sharing_globals(self, executor):
+        first = await run(executor, "import os\nvalue = 42\nprint(os.getpid())")
+        second = await run(executor, "import os\nprint(os.getpid())\nprint('value' in globals())")
+        assert first.exit_code == 0
+        pid, leaked = second.output.split()
+        assert pid == first.output.strip()
+        assert leaked == "False"
+
+    async def test_file_is_a_script_in_work_dir(self, executor, tmp_path):
+        result = await run(executor, "from pathlib import Path\nprint(Path(__file__).parent)\nprint(Path(__file__).exists())")
+        assert result.output.split() == [str(tmp_path), "True"]
+        assert not list(tmp_path.glob("tmp_code_*.py"))
+
+    async def test_stdin_does_not_read_protocol_stream(self, executor):
+        code = "import subprocess\nprint(subprocess.run(['cat'], capture_output=True).stdout)\ninput()"
+        result = await run(executor, code)
+        assert result.exit_code == 1
+        assert result.output.startswith("b''\n")
+        assert "EOFError" in result.output
+        assert (await run(executor, "print('alive')")).output == "alive\n"
+
+    async def test_worker_spawns_on_first_python_block(self, tmp_path):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            code_executor = PersistentLocalCodeExecutor(work_dir=tmp_path, timeout=5)
+        try:
+            await code_executor.restart()
+            await run(code_executor, "echo shell", language="bash")
+            assert code_executor._proc is None
+            assert (await run(code_executor, "print('lazy')")).output == "lazy\n"
+            assert code_executor._proc is not None
+        finally:
+            await code_executor.stop()
+
+    async def test_restart_replaces_used_worker_only(self, executor):
+        clean = executor._proc
+        await executor.restart()
+        assert executor._proc is clean
+
+        first = await run(executor, "import os, numpy\nnumpy.set_printoptions(precision=2)\nprint(os.getpid())")
+        await executor.restart()
+        second = await run(executor, "import os, numpy\nprint(os.getpid(), numpy.get_printoptions()['precision'])")
+        pid, precision = second.output.split()
+        assert pid != first.output.strip()
+        assert precision == "8"
+
+    async def test_non_ascii_output_round_trips(self, executor):
+        result = await run(executor, "print('Kurs: 95.000 € ✅')\nprint('\\udc80')")
+        assert result.exit_code == 0
+        assert result.output == "Kurs: 95.000 € ✅\n\udc80\n"
+
+    async def test_working_directory_is_restored(self, executor, tmp_path):
+        await run(executor, "import os\nos.chdir('/')")
+        result = await run(executor, "import os\nprint(os.getcwd())")
+        assert result.output.strip() == str(tmp_path)
+
+    async def test_timeout_restarts_worker(self, executor):
+        executor._timeout = 1
+        result = await run(executor, "import time\ntime.sleep(30)")
+        assert result.exit_code == 124
+        assert (await run(executor, "print('alive')")).output == "alive\n"
+
+    async def test_worker_crash_is_reported(self, executor):
+        result = await run(executor, "import os\nos._exit(7)")
+        assert result.exit_code == 7
+        assert (await run(executor, "print('respawned')")).output == "respawned\n"
+
+    async def test_stops_at_first_failing_block(self, executor):
+        blocks = [
+            CodeBlock(code="print('one')", language="python"),
+            CodeBlock(code="raise SystemExit(2)", language="python"),
+            CodeBlock(code="print('three')", language="python"),
+        ]
+        result = await executor.execute_code_blocks(blocks, CancellationToken())
+        assert result.exit_code == 2
+        assert result.output == "one\n"
+
+    async def test_shell_blocks_use_command_line_executor(self, executor):
+        result = await run(executor, "echo shell", language="bash")
+        assert result.exit_code == 0
+        assert "shell" in result.output
+
+    async def test_saved_scripts_can_import_project_modules(self, executor):
+        code = "# filename: uses_kernels.py\nimport indicators_numba\nprint('ok')"
+        result = await run(executor, code)
+        assert result.exit_code == 0, result.output
+        assert "ok" in result.output
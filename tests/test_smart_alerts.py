@@ -0,0 +1,110 @@
+"""
+Tests for smart_alerts.py
+"""
+import gzip
+import json
+import os
+
+import pytest
+
+import smart_alerts
+
+
+@pytest.fixture(autouse=True)
+def output_dirs(tmp_path, monkeypatch):
+    """Write generated HTML into a temporary directory."""
+    monkeypatch.setattr(smart_alerts, "ALERTS_DIR", tmp_path / "alerts")
+    monkeypatch.setattr(smart_alerts, "DASHBOARDS_DIR", tmp_path / "dashboards")
+    return tmp_path
+
+
+class TestSmartAlertsDashboard:
+    """Tests for the dashboard HTML assembled from static and dynamic parts."""
+
+    def test_alerts_embedded_in_script(self):
+        result = json.loads(smart_alerts.generate_smart_alerts_dashboard("SOLUSDT,ADAUSDT", min_score=8))
+        html = open(result["dashboard_file"], encoding="utf-8").read()
+        assert result["active_alerts"] == 1
+        assert "__ALERTS_JSON__" not in html
+        assert '"symbol":"SOLUSDT"' in html
+        assert '"symbol":"ADAUSDT"' not in html
+
+    def test_static_parts_unescaped(self):
+        result = json.loads(smart_alerts.generate_smart_alerts_dashboard("BTCUSDT", min_score=1))
+        html = open(result["dashboard_file"], encoding="utf-8").read()
+        assert "{{" not in html and "}}" not in html
+        assert html.startswith("<!DOCTYPE html>")
+        assert html.rstrip().endswith("</html>")
+        assert html.count('<template id="alert-card-tmpl">') == 1
+        assert 'class="alert-card"' in html
+        assert "BTCUSDT | 1H, 4H, 1D" in html
+
+    def test_symbols_cannot_break_out_of_markup(self):
+        result = json.loads(smart_alerts.generate_smart_alerts_dashboard("<b>X</b>,</script>", min_score=1))
+        html = open(result["dashboard_file"], encoding="utf-8").read()
+        assert "&lt;b&gt;X&lt;/b&gt;" in html
+        assert '"symbol":"<\\/script>"' in html
+        assert html.count("</script>") == html.count("<script")
+
+    def test_compressed_output(self):
+        plain = json.loads(smart_alerts.generate_smart_alerts_dashboard("BTCUSDT"))
+        packed = json.loads(smart_alerts.generate_smart_alerts_dashboard("BTCUSDT", compress=True))
+        assert packed["dashboard_file"].endswith(".html.gz")
+        assert "gunzip -k" in packed["open_command"]
+        html = gzip.decompress(open(packed["dashboard_file"], "rb").read()).decode("utf-8")
+        assert html.startswith("<!DOCTYPE html>")
+        assert os.path.getsize(packed["dashboard_file"]) < os.path.getsize(plain["dashboard_file"]) / 3
+
+    def test_demo_candles_end_at_one(self):
+        rows = json.loads(smart_alerts._demo_candles_json())
+        assert len(rows) == 101
+        assert rows[-1][3] == 1.0
+        assert all(high >= max(op, close) and low <= min(op, close) for op, high, low, close in rows)
+        assert smart_alerts._demo_candles_json() == smart_alerts._demo_candles_json()
+
+
+class TestTradeIdeaAlerts:
+    """Tests for single and batched trade idea pages."""
+
+    def test_single_alert(self):
+        result = json.loads(smart_alerts.create_trade_idea_alert(
+            "BTCUSDT", "bullish", 65000, 63000, 69000, '["RSI bounce"]', notes="Watch funding",
+        ))
+        html = open(result["alert_file"], encoding="utf-8").read()
+        assert result["trade_idea"]["risk_reward"] == "1:2.0"
+        assert "<li>✓ RSI bounce</li>" in html
+        assert "Watch funding" in html
+
+    def test_signals_are_escaped(self):
+        result = json.loads(smart_alerts.create_trade_idea_alert(
+            "BTCUSDT", "bullish", 65000, 63000, 69000, '["<script>alert(1)</script>"]',
+        ))
+        html = open(result["alert_file"], encoding="utf-8").read()
+        assert "<li>✓ &lt;script&gt;alert(1)&lt;/script&gt;</li>" in html
+        assert result["trade_idea"]["signals"] == ["<script>alert(1)</script>"]
+
+    def test_direction_is_json_encoded_in_script(self):
+        result = json.loads(smart_alerts.create_trade_idea_alert(
+            "BTCUSDT", 'x"; alert(1); "</script>', 65000, 63000, 69000, "[]",
+        ))
+        html = open(result["alert_file"], encoding="utf-8").read()
+        assert 'const bullish = "x\\"; alert(1); \\"<\\/script>" === "bullish";' in html
+        assert html.count("</script>") == html.count("<script")
+
+    def test_batch_writes_one_file_per_idea(self):
+        ideas = [
+            {"symbol": "BTCUSDT", "direction": "bullish", "entry_price": 65000,
+             "stop_loss": 63000, "take_profit": 69000, "signals": ["RSI bounce"]},
+            {"symbol": "BTCUSDT", "direction": "bearish", "entry_price": 70000,
+             "stop_loss": 71000, "take_profit": 67000, "signals": '["Bearish divergence"]',
+             "confidence": "HIGH"},
+        ]
+        result = json.loads(smart_alerts.create_trade_idea_alerts_batch(json.dumps(ideas)))
+        alerts = result["alerts"]
+        assert len(alerts) == 2
+        assert len({a["alert_file"] for a in alerts}) == 2
+        assert alerts[1]["trade_idea"]["signals"] == ["Bearish divergence"]
+        assert alerts[1]["trade_idea"]["confidence"] == "HIGH"
+        assert alerts[1]["trade_idea"]["risk_reward"] == "1:3.0"
+        for alert in alerts:
+            assert open(alert["alert_file"], encoding="utf-8").read().startswith("<!DOCTYPE html>")
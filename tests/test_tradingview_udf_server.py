@@ -0,0 +1,54 @@
+"""
+Tests for tradingview_udf_server.py
+"""
+import json
+
+import pytest
+
+from cache import api_cache
+from tradingview_udf_server import UDFRequestHandler
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """Request handler with responses captured instead of written to a socket."""
+    api_cache.clear()
+    handler = UDFRequestHandler.__new__(UDFRequestHandler)
+    handler.responses = []
+    monkeypatch.setattr(handler, "_send_json_response", lambda data, status=200: handler.responses.append(data))
+    yield handler
+    api_cache.clear()
+
+
+@pytest.fixture
+def exchange_calls(monkeypatch):
+    """Stub exchange returning three hourly bars; records each call."""
+    calls = []
+    bars = [
+        {"timestamp": ts, "open": 100 + i, "high": 101 + i, "low": 99 + i, "close": 100.5 + i, "volume": 10}
+        for i, ts in enumerate([1735689600000, 1735693200000, 1735696800000])
+    ]
+
+    def get_ohlcv_data(symbol, interval, limit=100):
+        calls.append((symbol, interval, limit))
+        return json.dumps({"candles": bars})
+
+    monkeypatch.setattr("exchange_tools.get_ohlcv_data", get_ohlcv_data)
+    return calls
+
+
+def test_history_requests_share_one_fetch(handler, exchange_calls):
+    handler._handle_history({"symbol": "BTCUSDT", "resolution": "60", "from": "0", "to": "1735700000"})
+    handler._handle_history({"symbol": "BTCUSDT", "resolution": "60", "from": "1735693200", "to": "1735700000"})
+
+    assert len(exchange_calls) == 1
+    full, refresh = handler.responses
+    assert full["t"] == [1735689600, 1735693200, 1735696800]
+    assert refresh["s"] == "ok"
+    assert refresh["t"] == [1735693200, 1735696800]
+    assert refresh["c"] == [101.5, 102.5]
+
+
+def test_history_outside_fetched_range(handler, exchange_calls):
+    handler._handle_history({"symbol": "BTCUSDT", "resolution": "60", "from": "1800000000", "to": "1800003600"})
+    assert handler.responses == [{"s": "no_data"}]